@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark - keeps every dhua invocation instant (Termux included)
+Fails with exit code 1 if importing dhua exceeds the import-time budget,
+or if the no-network commands pull in heavy dependencies.
+
+    python bench_startup.py
+"""
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+IMPORT_BUDGET_MS = 50        # Cumulative `python -X importtime` cost of `import dhua`
+HELP_RUNS = 5                # Wall-clock samples for `dhua.py --help`
+HEAVY_MODULES = ("requests", "bs4", "urllib3", "yt_dlp", "concurrent.futures")
+FAST_COMMANDS = (["--help"], ["--features"])
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_importtime(args, env):
+    """Run python -X importtime and return {module: cumulative_us}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args,
+        cwd=HERE, env=env, capture_output=True, text=True
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)', line)
+        if match:
+            cumulative[match.group(3)] = int(match.group(2))
+    return cumulative
+
+
+def main():
+    failures = []
+
+    with tempfile.TemporaryDirectory() as home:
+        # Keep caches and download dirs out of the real home directory
+        env = {**os.environ, "HOME": home, "USERPROFILE": home}
+
+        modules = run_importtime(["-c", "import dhua"], env)
+        import_ms = modules.get("dhua", 0) / 1000
+        status = "ok" if import_ms <= IMPORT_BUDGET_MS else "OVER BUDGET"
+        print(f"import dhua: {import_ms:.1f} ms (budget {IMPORT_BUDGET_MS} ms) {status}")
+        if import_ms > IMPORT_BUDGET_MS:
+            failures.append("import budget")
+
+        for command in FAST_COMMANDS:
+            loaded = run_importtime(["dhua.py"] + command, env)
+            heavy = [m for m in HEAVY_MODULES if m in loaded]
+            print(f"dhua.py {' '.join(command)}: heavy imports {heavy or 'none'}")
+            if heavy:
+                failures.append(f"{' '.join(command)} imports {', '.join(heavy)}")
+
+        samples = []
+        for _ in range(HELP_RUNS):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "dhua.py", "--help"], cwd=HERE, env=env,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            samples.append((time.perf_counter() - start) * 1000)
+        print(f"dhua.py --help wall time: best {min(samples):.0f} ms, median {sorted(samples)[len(samples) // 2]:.0f} ms")
+
+    if failures:
+        print(f"FAILED: {'; '.join(failures)}")
+        return 1
+    print("Startup budget met")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,18 +4,51 @@ Donghua CLI - Wuxia-inspired terminal player for Chinese animation
 Jade borders, gold text, martial arts theme - OPTIMIZED FOR SPEED
 """
 
+from __future__ import annotations
+
 import argparse
+import contextvars
+import heapq
+import importlib
 import os
+import random
 import re
 import sys
 import time
 import subprocess
 import threading
 import json
+import queue
 from collections import OrderedDict
 from typing import List, Tuple, Optional, Dict, Any
-import requests
-from bs4 import BeautifulSoup
+
+# ============================================================================
+# LAZY DEPENDENCIES
+# ============================================================================
+# requests/bs4 cost ~150ms to import - far more than the rest of the CLI.
+# They load on first network use so --help, --features and --clear-cache
+# start instantly (see bench_startup.py for the enforced budget).
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access"""
+    
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+    
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+requests = LazyModule("requests")
+
+def BeautifulSoup(markup, features: str = "html.parser"):
+    """bs4.BeautifulSoup, imported the first time a page is parsed"""
+    from bs4 import BeautifulSoup as _BeautifulSoup
+    return _BeautifulSoup(markup, features)
 
 # ============================================================================
 # WUXIA THEME CONFIGURATION
@@ -75,16 +108,29 @@ class WuxiaTheme:
         "Moonlight Cut", "Star Fall", "Lotus Palm"
     ]
     
+    _frames: Dict[Any, str] = {}  # Static frames (banners, boxes) built once per process
+    
+    @classmethod
+    def cached(cls, key, build) -> str:
+        """Return a static frame, building it on first use"""
+        frame = cls._frames.get(key)
+        if frame is None:
+            frame = cls._frames[key] = build()
+        return frame
+    
     @classmethod
     def random_technique(cls):
         """Get a random martial arts technique name"""
-        import random
         return random.choice(cls.TECHNIQUES)
     
     @classmethod
     def banner(cls) -> str:
         """Generate wuxia banner"""
         technique = cls.random_technique()
+        return cls.cached(("banner", technique), lambda: cls._banner(technique))
+    
+    @classmethod
+    def _banner(cls, technique: str) -> str:
         lines = [
             f"{cls.JADE}{cls.BORDER_CORNER_TL}{cls.BORDER_HORIZ*58}{cls.BORDER_CORNER_TR}{cls.RESET}",
             f"{cls.JADE}{cls.BORDER_VERT}{cls.RESET}  {cls.SYMBOL_SWORD}  {cls.GOLD}武 侠 动 画 终 端{cls.RESET}  {cls.SYMBOL_SWORD}  {cls.JADE}{cls.BORDER_VERT}{cls.RESET}",
@@ -100,7 +146,6 @@ class WuxiaTheme:
     def header(cls, text: str) -> str:
         """Create a martial arts section header"""
         symbols = [cls.SYMBOL_MOUNTAIN, cls.SYMBOL_WAVE, cls.SYMBOL_STAR]
-        import random
         left_sym = random.choice(symbols)
         right_sym = random.choice(symbols)
         
@@ -145,7 +190,6 @@ class WuxiaTheme:
     def now_playing(cls, title: str, episode: int, total: int) -> str:
         """Create now playing display with martial arts theme"""
         cultivation_levels = ["Qi Refining", "Foundation", "Golden Core", "Nascent Soul", "Divine Realm"]
-        import random
         level = random.choice(cultivation_levels)
         
         lines = [
@@ -264,6 +308,10 @@ class WuxiaTheme:
     def enhanced_banner(cls) -> str:
         """Generate enhanced wuxia banner with badges"""
         technique = cls.random_technique()
+        return cls.cached(("enhanced_banner", technique), lambda: cls._enhanced_banner(technique))
+
+    @classmethod
+    def _enhanced_banner(cls, technique: str) -> str:
         import platform
         os_name = platform.system()
 
@@ -304,7 +352,8 @@ class Config:
     }
     
     # Defaults
-    DEFAULT_QUALITY = "720"
+    DEFAULT_QUALITY = "auto"          # Measured per network, see NetworkMonitor
+    AUTO_FALLBACK_QUALITY = "720"     # Used by "auto" until a network has been measured
     DOWNLOAD_DIR = os.path.normpath(os.path.expanduser("~/Videos/Donghua"))
     
     # Cache files
@@ -314,7 +363,22 @@ class Config:
         CACHE_DIR = os.path.expanduser("~/.cache/donghua")
     
     STREAM_CACHE_FILE = os.path.join(CACHE_DIR, "stream_cache.json")
+    STREAM_CACHE_TTL = 6 * 3600   # Cached streams without an expiry parameter
     EPISODE_CACHE_FILE = os.path.join(CACHE_DIR, "episode_cache.json")
+    NETWORK_PROFILE_FILE = os.path.join(CACHE_DIR, "network_profile.json")
+    SOURCE_HEALTH_FILE = os.path.join(CACHE_DIR, "source_health.json")
+    DAEMON_SOCKET = os.path.join(CACHE_DIR, "dhua.sock")
+    WATCH_HISTORY_FILE = os.path.join(CACHE_DIR, "watch_history.json")
+    CATALOG_FILE = os.path.join(CACHE_DIR, "catalog.json")
+    CATALOG_MAX_AGE = 7 * 24 * 3600   # Older catalogs fall back to live site search
+    HTTP_CACHE_DIR = os.path.join(CACHE_DIR, "http")
+    HTTP_CACHE_MAX_ENTRIES = 500
+    # Minimum freshness (seconds) for pages the sites mark uncacheable
+    HTTP_CACHE_FLOORS = [
+        (r'[?&]s=', 600),                          # Search results
+        (r'/anime/(?:list-mode/|\?page=)', 3600),  # Catalog pages
+        (r'/anime/[^/?]+/?$', 300),                # Series pages (episode lists)
+    ]
     
     # Network
     HEADERS = {
@@ -324,6 +388,631 @@ class Config:
         "Referer": "https://google.com",
         "Upgrade-Insecure-Requests": "1",
     }
+    
+    # Hosts whose connections are opened at startup, besides every source
+    PREWARM_URLS = ["https://www.dailymotion.com"]
+    DNS_TTL = 300  # Seconds a resolved address is reused in-process
+    
+    # Per-host pacing: (requests per second, burst) - see RateLimiter
+    RATE_LIMITS = {
+        "luciferdonghua.in": (2.0, 6),
+        "animexin.dev": (2.0, 6),
+    }
+    
+    # Prefetch policy (see PrefetchPolicy) - detected via termux-api on Android
+    METERED = None                  # True/False to override network detection
+    DAILY_DATA_BUDGET_MB = 150      # Background traffic allowed per day on metered links
+    LOW_BATTERY = 30                # Percent below which prefetch turns frugal...
+    CRITICAL_BATTERY = 15           # ...and below which it stops (unless charging)
+    DATA_USAGE_FILE = os.path.join(CACHE_DIR, "data_usage.json")
+    
+    # Background extraction (see ExtractionScheduler)
+    EXTRACTION_WORKERS = 3   # Threads serving preload and bulk lanes
+    HOST_CONCURRENCY = 2     # Background extractions per host at once
+
+# ============================================================================
+# NETWORK LAYER
+# ============================================================================
+class DnsCache:
+    """Address cache for the pooled session - repeat connections skip the system resolver
+
+    Scoped to HttpClient's adapter: socket.getaddrinfo is left alone, so
+    yt-dlp and any other library in the process keep the system resolver.
+    """
+    
+    _entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+    _lock = threading.Lock()
+    _adapter_class = None
+    
+    @classmethod
+    def resolve(cls, host: str, port: int) -> List[str]:
+        """Addresses to try in order (system resolver on a miss; failures are never cached)"""
+        import socket
+        with cls._lock:
+            cached = cls._entries.get((host, port))
+            if cached and time.monotonic() - cached[0] < Config.DNS_TTL:
+                return list(cached[1])
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with cls._lock:
+            cls._entries[(host, port)] = (time.monotonic(), addresses)
+        return list(addresses)
+    
+    @classmethod
+    def failed(cls, host: str, port: int, address: str):
+        """Move an address that refused to connect behind the host's other addresses"""
+        with cls._lock:
+            cached = cls._entries.get((host, port))
+            if cached and address in cached[1]:
+                cached[1].remove(address)
+                cached[1].append(address)
+    
+    @classmethod
+    def adapter(cls, **kwargs):
+        """requests HTTPAdapter whose connections resolve through the cache"""
+        with cls._lock:
+            if cls._adapter_class is None:
+                cls._adapter_class = cls._build_adapter()
+        return cls._adapter_class(**kwargs)
+    
+    @staticmethod
+    def _build_adapter():
+        from urllib3.connection import HTTPConnection, HTTPSConnection
+        from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+        
+        def cached(base):
+            class Connection(base):
+                def _new_conn(self):
+                    # urllib3 dials _dns_host; it is put back before TLS reads the name for SNI
+                    name = self._dns_host
+                    try:
+                        addresses = DnsCache.resolve(name, self.port)
+                    except OSError:
+                        return super()._new_conn()  # Let urllib3 report the lookup failure
+                    # Every address gets a try (e.g. IPv4 after a dead IPv6 route), like create_connection
+                    for address in addresses:
+                        self._dns_host = address
+                        try:
+                            return super()._new_conn()
+                        except Exception:
+                            DnsCache.failed(name, self.port, address)
+                            if address == addresses[-1]:
+                                raise
+                        finally:
+                            self._dns_host = name
+            return Connection
+        
+        class CachedHTTPPool(HTTPConnectionPool):
+            ConnectionCls = cached(HTTPConnection)
+        
+        class CachedHTTPSPool(HTTPSConnectionPool):
+            ConnectionCls = cached(HTTPSConnection)
+        
+        class CachedDnsAdapter(requests.adapters.HTTPAdapter):
+            def init_poolmanager(self, *args, **kwargs):
+                super().init_poolmanager(*args, **kwargs)
+                self.poolmanager.pool_classes_by_scheme = {"http": CachedHTTPPool, "https": CachedHTTPSPool}
+        
+        return CachedDnsAdapter
+
+class HttpClient:
+    """Shared pooled HTTP session - every fetch also feeds the throughput meter"""
+    
+    HEDGE_DEFAULT_DELAY = 3.0   # Hedge delay until a host has enough latency samples
+    HEDGE_BUDGET = 0.1          # At most ~10% of requests may send a hedge
+    
+    # Second identity for the fallback path (mobile browser, no fake Referer)
+    FALLBACK_HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Mobile Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.5",
+        "Referer": None,
+        "Upgrade-Insecure-Requests": None,
+    }
+    
+    _session = None
+    _http2 = None
+    _lock = threading.Lock()
+    _hedge_pool = None
+    _requests_sent = 0
+    _hedges_sent = 0
+    
+    @classmethod
+    def session(cls) -> requests.Session:
+        """Get the process-wide session (keeps TCP/TLS connections alive)"""
+        if cls._session is None:
+            with cls._lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    session.headers.update(Config.HEADERS)
+                    adapter = DnsCache.adapter(pool_connections=8, pool_maxsize=16)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    cls._session = session
+        return cls._session
+    
+    @classmethod
+    def prewarm(cls):
+        """Resolve and open pooled TLS connections to every source while the user types"""
+        def warm(url):
+            host = SourceHealth.host(url)
+            if not SourceHealth.allow(host):
+                return
+            try:
+                RateLimiter.acquire(host)
+                cls.session().head(url, timeout=5, allow_redirects=False).close()
+            except:
+                pass
+        
+        def warm_all():
+            urls = [source["base_url"] for source in Config.SOURCES.values()] + Config.PREWARM_URLS
+            for url in urls:
+                threading.Thread(target=warm, args=(url,), daemon=True, name="prewarm").start()
+        
+        # Importing requests happens off the main thread too
+        threading.Thread(target=warm_all, daemon=True, name="prewarm").start()
+    
+    @classmethod
+    def http2_client(cls):
+        """Pooled HTTP/2 client when httpx (with h2) is installed, else None"""
+        if cls._http2 is None:
+            with cls._lock:
+                if cls._http2 is None:
+                    try:
+                        import httpx
+                        import h2  # noqa: F401 - httpx needs it for http2=True
+                        cls._http2 = httpx.Client(http2=True, headers=Config.HEADERS,
+                                                  follow_redirects=True)
+                    except ImportError:
+                        cls._http2 = False
+        return cls._http2 or None
+    
+    @classmethod
+    def get(cls, url: str, headers: Optional[Dict[str, str]] = None,
+            timeout: float = 8, stream: bool = False) -> requests.Response:
+        """GET over the pooled session, recording host health and background data use"""
+        host = SourceHealth.host(url)
+        if not SourceHealth.allow(host):
+            raise SourceUnavailable.for_host(host)
+        
+        # Background extractions step aside while the user is waiting
+        ExtractionScheduler.checkpoint()
+        RateLimiter.acquire(host)
+        
+        start = time.monotonic()
+        try:
+            resp = cls.session().get(url, headers=headers, timeout=SourceHealth.timeout_for(host, timeout),
+                                     stream=stream)
+        except requests.exceptions.RequestException:
+            SourceHealth.record(host, False)
+            raise
+        
+        elapsed = time.monotonic() - start
+        SourceHealth.record(host, resp.status_code not in SourceHealth.FAILURE_STATUSES
+                            and resp.status_code < 500, elapsed)
+        if not stream and ExtractionScheduler.current() is not None:
+            PrefetchPolicy.record_background(len(resp.content))
+        return resp
+    
+    @staticmethod
+    def iter_body(resp: requests.Response, chunk_size: int, decode_unicode: bool = False):
+        """iter_content for streamed responses - background jobs charge each chunk to the data budget"""
+        background = ExtractionScheduler.current() is not None
+        for chunk in resp.iter_content(chunk_size=chunk_size, decode_unicode=decode_unicode):
+            if background:
+                PrefetchPolicy.record_background(len(chunk.encode() if isinstance(chunk, str) else chunk))
+            yield chunk
+    
+    @classmethod
+    def get_hedged(cls, url: str, headers: Optional[Dict[str, str]] = None,
+                   timeout: float = 8) -> requests.Response:
+        """GET that fires a second identical request if the first is slower than the host's p90
+        
+        Both are streamed, so the loser is closed after its headers instead of downloading the body.
+        """
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        
+        with cls._lock:
+            if cls._hedge_pool is None:
+                cls._hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+            cls._requests_sent += 1
+        
+        delay = SourceHealth.p90_latency(SourceHealth.host(url)) or cls.HEDGE_DEFAULT_DELAY
+        fetch = ExtractionScheduler.bind(cls.get)
+        first = cls._hedge_pool.submit(fetch, url, headers, timeout, True)
+        done, _ = wait([first], timeout=delay)
+        if done or cls._hedges_sent >= cls._requests_sent * cls.HEDGE_BUDGET:
+            return cls._read_body(first.result())
+        
+        with cls._lock:
+            cls._hedges_sent += 1
+        pending = {first, cls._hedge_pool.submit(fetch, url, headers, timeout, True)}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # Close the loser as soon as its headers land - its body is never read
+                    for loser in pending:
+                        if not loser.cancel():
+                            loser.add_done_callback(cls._discard)
+                    for other in done - {future}:
+                        cls._discard(other)
+                    return cls._read_body(future.result())
+                error = future.exception()
+        raise error
+    
+    @staticmethod
+    def _read_body(resp: requests.Response) -> requests.Response:
+        """Download a streamed response's body (charged to the data budget for background jobs)"""
+        size = len(resp.content)  # Reads the whole body now, while the caller is waiting for it
+        if ExtractionScheduler.current() is not None:
+            PrefetchPolicy.record_background(size)
+        return resp
+    
+    @staticmethod
+    def _discard(future):
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+    
+    @classmethod
+    def fetch_fallback(cls, url: str, failure, timeout: float = 8) -> Optional[bytes]:
+        """In-process retry pipeline - each profile is one round trip on a pooled connection"""
+        if isinstance(failure, requests.exceptions.SSLError):
+            # Certificate errors are never retried unverified - only another transport or fingerprint
+            profiles = ["http2", "alt_headers"]
+        elif isinstance(failure, requests.Response):
+            # Challenge/throttle statuses usually mean bot filtering
+            profiles = ["alt_headers", "http2"]
+        else:
+            # Timeouts and connection resets
+            profiles = ["http2", "retry"]
+        
+        host = SourceHealth.host(url)
+        deadline = time.monotonic() + timeout
+        for profile in profiles:
+            remaining = deadline - time.monotonic()
+            if remaining < 1 or not SourceHealth.allow(host):
+                break
+            try:
+                body = cls._fetch_profile(profile, url, remaining)
+            except SourceUnavailable:
+                break
+            except Exception:
+                continue
+            if body is not None:
+                return body
+        return None
+    
+    @classmethod
+    def _fetch_profile(cls, profile: str, url: str, timeout: float) -> Optional[bytes]:
+        if profile == "http2":
+            client = cls.http2_client()
+            if client is None:
+                return None
+            host = SourceHealth.host(url)
+            RateLimiter.acquire(host)
+            start = time.monotonic()
+            try:
+                resp = client.get(url, timeout=timeout)
+            except Exception:
+                SourceHealth.record(host, False)
+                raise
+            SourceHealth.record(host, resp.status_code == 200, time.monotonic() - start)
+        elif profile == "alt_headers":
+            resp = cls.get(url, headers=cls.FALLBACK_HEADERS, timeout=timeout)
+        else:
+            resp = cls.get(url, timeout=timeout)
+        return resp.content if resp.status_code == 200 else None
+
+class SourceUnavailable(ConnectionError):
+    """Raised instantly for hosts whose circuit breaker is open
+    
+    Instances come from for_host() and are also requests ConnectionErrors,
+    so RequestException handlers treat them as failed connections. The class
+    itself stays a builtin subclass to keep startup free of the requests import.
+    """
+    
+    _raised_class = None
+    
+    @classmethod
+    def for_host(cls, host: str) -> "SourceUnavailable":
+        if cls._raised_class is None:
+            cls._raised_class = type(cls.__name__, (cls, requests.exceptions.ConnectionError),
+                                     {"__module__": __name__})
+        return cls._raised_class(f"{host} is cooling down after repeated failures")
+
+class SourceHealth:
+    """Per-host error rate and latency EWMA with a circuit breaker, kept across runs"""
+    
+    WINDOW = 10                 # Outcomes kept for the rolling error rate
+    TRIP_ERROR_RATE = 0.5       # Open the circuit above this error rate...
+    TRIP_MIN_SAMPLES = 4        # ...once there are enough outcomes to judge
+    TRIP_CONSECUTIVE = 3        # Or after this many failures in a row
+    COOLDOWN = 300              # Seconds a tripped host is skipped
+    SLOW_LATENCY = 3.0          # EWMA seconds above which a host is deprioritized
+    EWMA_ALPHA = 0.3
+    FAILURE_STATUSES = {403, 429}  # Cloudflare challenges and throttling
+    SAVE_INTERVAL = 5
+    
+    _lock = threading.Lock()
+    _hosts = None
+    _last_save = 0.0
+    
+    @staticmethod
+    def host(url: str) -> str:
+        from urllib.parse import urlparse
+        return (urlparse(url).hostname or "").lower()
+    
+    @classmethod
+    def _load(cls) -> Dict[str, Dict[str, Any]]:
+        if cls._hosts is None:
+            try:
+                with open(Config.SOURCE_HEALTH_FILE, 'r') as f:
+                    cls._hosts = json.load(f)
+            except:
+                cls._hosts = {}
+        return cls._hosts
+    
+    @classmethod
+    def _state(cls, host: str) -> Dict[str, Any]:
+        return cls._load().setdefault(host, {
+            "outcomes": [], "latency": None, "latencies": [],
+            "consecutive_failures": 0, "open_until": 0.0,
+        })
+    
+    @classmethod
+    def record(cls, host: str, ok: bool, latency: Optional[float] = None):
+        """Record one request outcome and trip the breaker if needed"""
+        with cls._lock:
+            state = cls._state(host)
+            state["outcomes"] = (state["outcomes"] + [1 if ok else 0])[-cls.WINDOW:]
+            if ok:
+                state["consecutive_failures"] = 0
+                state["open_until"] = 0.0
+                if latency is not None:
+                    previous = state["latency"]
+                    state["latency"] = latency if previous is None else \
+                        cls.EWMA_ALPHA * latency + (1 - cls.EWMA_ALPHA) * previous
+                    state["latencies"] = (state["latencies"] + [round(latency, 3)])[-20:]
+            else:
+                state["consecutive_failures"] += 1
+                if (state["consecutive_failures"] >= cls.TRIP_CONSECUTIVE or
+                        (len(state["outcomes"]) >= cls.TRIP_MIN_SAMPLES and
+                         cls.error_rate(host) >= cls.TRIP_ERROR_RATE)):
+                    state["open_until"] = time.time() + cls.COOLDOWN
+            cls._save_throttled()
+    
+    @classmethod
+    def error_rate(cls, host: str) -> float:
+        outcomes = cls._state(host)["outcomes"]
+        return 1 - sum(outcomes) / len(outcomes) if outcomes else 0.0
+    
+    @classmethod
+    def allow(cls, host: str) -> bool:
+        """False while the host's circuit is open (half-opens after the cooldown)"""
+        state = cls._load().get(host)
+        return not state or state["open_until"] <= time.time()
+    
+    @classmethod
+    def p90_latency(cls, host: str) -> Optional[float]:
+        """90th percentile of recent latencies (needs a handful of samples)"""
+        state = cls._load().get(host)
+        if not state or len(state["latencies"]) < 5:
+            return None
+        latencies = sorted(state["latencies"])
+        return latencies[int(0.9 * (len(latencies) - 1))]
+    
+    @classmethod
+    def timeout_for(cls, host: str, default: float) -> float:
+        """Shrink timeouts for hosts that normally answer fast, so failures fail fast"""
+        state = cls._load().get(host)
+        if not state or state["latency"] is None:
+            return default
+        return min(default, max(4.0, state["latency"] * 5))
+    
+    @classmethod
+    def score(cls, host: str) -> float:
+        """Lower is healthier - used to order sources for search and extraction"""
+        state = cls._load().get(host)
+        if not state:
+            return 0.0
+        if not cls.allow(host):
+            return float("inf")
+        latency = state["latency"] or 0.0
+        penalty = 10.0 if latency > cls.SLOW_LATENCY else 0.0
+        return cls.error_rate(host) * 10 + latency + penalty
+    
+    @classmethod
+    def _save_throttled(cls):
+        if time.monotonic() - cls._last_save >= cls.SAVE_INTERVAL:
+            cls.save()
+    
+    @classmethod
+    def save(cls):
+        """Persist health state so the next run knows which hosts are down"""
+        cls._last_save = time.monotonic()
+        try:
+            Utils.atomic_write_json(Config.SOURCE_HEALTH_FILE, cls._load())
+        except:
+            pass
+
+class RateLimiter:
+    """Per-host token buckets shared by every thread (scraper, extractor, downloader)"""
+    
+    _lock = threading.Lock()
+    _buckets: Dict[str, List[float]] = {}  # host -> [tokens, last refill]
+    
+    @staticmethod
+    def limit_for(host: str) -> Optional[Tuple[float, int]]:
+        """(rate, burst) configured for a host or any parent domain"""
+        for domain, limit in Config.RATE_LIMITS.items():
+            if host == domain or host.endswith("." + domain):
+                return limit
+        return None
+    
+    @classmethod
+    def acquire(cls, host: str) -> float:
+        """Take one token, sleeping until it is available; returns seconds waited"""
+        limit = cls.limit_for(host)
+        if not limit:
+            return 0.0
+        rate, burst = limit
+        waited = 0.0
+        while True:
+            with cls._lock:
+                now = time.monotonic()
+                bucket = cls._buckets.setdefault(host, [float(burst), now])
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+                if bucket[0] >= 1:
+                    bucket[0] -= 1
+                    return waited
+                delay = (1 - bucket[0]) / rate
+            time.sleep(delay)
+            waited += delay
+
+class NetworkMonitor:
+    """Measures link throughput and remembers it per network"""
+    
+    HEADROOM = 1.5                 # Variant bitrate must fit 1.5x into the link
+    MIN_SAMPLE_BYTES = 32 * 1024   # Smaller transfers measure latency, not bandwidth
+    PROBE_BYTES = 512 * 1024       # How much of a media segment a probe reads
+    EWMA_ALPHA = 0.3
+    SAVE_INTERVAL = 5
+    
+    # Typical bitrates (bits/sec) for variants that don't advertise BANDWIDTH
+    HEIGHT_BITRATES = OrderedDict([
+        (240, 400_000), (360, 800_000), (480, 1_400_000),
+        (720, 2_800_000), (1080, 5_000_000),
+    ])
+    
+    _lock = threading.Lock()
+    _profiles = None
+    _network = None
+    _last_save = 0.0
+    
+    @classmethod
+    def network_id(cls) -> str:
+        """Identify the current network by the local /24 (no packets are sent)"""
+        if cls._network is None:
+            import socket
+            try:
+                with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                    sock.connect(("8.8.8.8", 80))
+                    local_ip = sock.getsockname()[0]
+                cls._network = local_ip.rsplit(".", 1)[0] + ".0/24"
+            except OSError:
+                cls._network = "unknown"
+        return cls._network
+    
+    @classmethod
+    def _load(cls) -> Dict[str, Dict[str, float]]:
+        if cls._profiles is None:
+            try:
+                with open(Config.NETWORK_PROFILE_FILE, 'r') as f:
+                    cls._profiles = json.load(f)
+            except:
+                cls._profiles = {}
+        return cls._profiles
+    
+    @classmethod
+    def record(cls, nbytes: int, seconds: float):
+        """Feed one media transfer, timed from its first body byte, into the current network's EWMA"""
+        if nbytes < cls.MIN_SAMPLE_BYTES or seconds <= 0:
+            return
+        sample = nbytes / seconds
+        with cls._lock:
+            profiles = cls._load()
+            profile = profiles.get(cls.network_id())
+            if profile:
+                profile["bps"] = cls.EWMA_ALPHA * sample + (1 - cls.EWMA_ALPHA) * profile["bps"]
+            else:
+                profile = {"bps": sample}
+            profile["updated"] = time.time()
+            profiles[cls.network_id()] = profile
+        if time.monotonic() - cls._last_save >= cls.SAVE_INTERVAL:
+            cls.save()
+    
+    @classmethod
+    def save(cls):
+        """Persist the per-network throughput profiles"""
+        cls._last_save = time.monotonic()
+        with cls._lock:
+            if cls._profiles is None:
+                return
+            try:
+                Utils.atomic_write_json(Config.NETWORK_PROFILE_FILE, cls._profiles)
+            except:
+                pass
+    
+    @classmethod
+    def throughput(cls) -> Optional[float]:
+        """Measured bytes/sec on the current network, if known"""
+        profile = cls._load().get(cls.network_id())
+        return profile["bps"] if profile else None
+    
+    @classmethod
+    def variant_bitrate(cls, variant: Dict[str, Any]) -> int:
+        """Advertised bitrate, or a typical one for its height"""
+        if variant.get("bandwidth"):
+            return variant["bandwidth"]
+        for height, bitrate in cls.HEIGHT_BITRATES.items():
+            if variant.get("height", 0) <= height:
+                return bitrate
+        return next(reversed(cls.HEIGHT_BITRATES.values()))
+    
+    @classmethod
+    def sustainable(cls, bitrate: int) -> bool:
+        """Can the measured link carry this bitrate with headroom?"""
+        bps = cls.throughput()
+        return bps is not None and bitrate * cls.HEADROOM <= bps * 8
+    
+    @classmethod
+    def estimate_height(cls, fallback: str = Config.AUTO_FALLBACK_QUALITY) -> str:
+        """Highest typical height the link sustains (for yt-dlp format caps)"""
+        if cls.throughput() is None:
+            return fallback
+        fitting = [h for h, bitrate in cls.HEIGHT_BITRATES.items() if cls.sustainable(bitrate)]
+        return str(fitting[-1] if fitting else min(cls.HEIGHT_BITRATES))
+    
+    @classmethod
+    def resolve_quality(cls, quality: str, fallback: str = Config.AUTO_FALLBACK_QUALITY) -> str:
+        """Turn "auto" into a concrete height, pass explicit heights through"""
+        return cls.estimate_height(fallback) if str(quality).lower() == "auto" else quality
+    
+    @classmethod
+    def probe_stream(cls, stream_url: str, referer: Optional[str] = None):
+        """Read the start of a media segment to measure real streaming speed"""
+        from urllib.parse import urljoin
+        
+        headers = {**Config.HEADERS, "Referer": referer} if referer else None
+        try:
+            segment_url = stream_url
+            if ".m3u8" in stream_url:
+                playlist = HttpClient.get(stream_url, headers=headers, timeout=5)
+                segments = [l for l in playlist.text.splitlines() if l.strip() and not l.startswith("#")]
+                if not segments:
+                    return
+                segment_url = urljoin(playlist.url, segments[0].strip())
+            
+            # The clock starts at the first body byte - DNS, TLS and TTFB aren't link speed
+            start = None
+            received = 0
+            with HttpClient.get(segment_url, headers=headers, timeout=5, stream=True) as resp:
+                if resp.status_code >= 400 or "text/" in resp.headers.get("Content-Type", ""):
+                    return  # An error page isn't a media transfer
+                for chunk in HttpClient.iter_body(resp, 64 * 1024):
+                    if start is None:
+                        start = time.monotonic()
+                        continue
+                    received += len(chunk)
+                    if received >= cls.PROBE_BYTES:
+                        break
+            if start is not None:
+                cls.record(received, time.monotonic() - start)
+        except:
+            pass
 
 # ============================================================================
 # FAST CACHE SYSTEM
@@ -338,29 +1027,75 @@ class FastStreamCache:
     
     def get(self, episode_url: str) -> Optional[str]:
         """Get cached stream URL (O(1) time)"""
+        entry = self.get_entry(episode_url)
+        return entry["url"] if entry else None
+    
+    EXPIRY_PARAMS = ("expires", "expire", "exp", "e", "validto", "valid_to", "deadline")
+    EXPIRY_MARGIN = 120  # Seconds a link must still be valid to be worth handing out
+    
+    def get_entry(self, episode_url: str) -> Optional[Dict[str, Any]]:
+        """Get cached stream entry with all known variants (O(1) time)"""
         if episode_url in self.cache:
+            entry = self.cache[episode_url]
+            # Entries written by older versions are plain URL strings
+            if isinstance(entry, str):
+                entry = {"url": entry, "variants": []}
+            if self.expired(entry):
+                self.remove(episode_url)
+                return None
             # Move to end (most recently used)
             self.cache.move_to_end(episode_url)
-            return self.cache[episode_url]
+            return entry
         return None
     
-    def put(self, episode_url: str, stream_url: str):
-        """Cache stream URL"""
+    @classmethod
+    def expires_at(cls, entry: Dict[str, Any]) -> float:
+        """When to stop handing the entry out: its signed expiry (less a margin), else STREAM_CACHE_TTL"""
+        from urllib.parse import urlparse, parse_qs
+        
+        media_url = entry["variants"][0]["url"] if entry.get("variants") else entry["url"]
+        if urlparse(media_url).path.endswith((".m3u8", ".mp4", ".mkv", ".ts")):
+            params = {k.lower(): v[0] for k, v in parse_qs(urlparse(media_url).query).items()}
+            for name in cls.EXPIRY_PARAMS:
+                if params.get(name, "").isdigit():
+                    expires = int(params[name])
+                    if expires > 1e12:  # Milliseconds
+                        expires /= 1000
+                    if expires > 1e9:
+                        return expires - cls.EXPIRY_MARGIN
+        return entry.get("stored", 0) + Config.STREAM_CACHE_TTL
+    
+    @classmethod
+    def expired(cls, entry: Dict[str, Any]) -> bool:
+        """Is the entry past the expiry stored with it? (computed for entries saved without one)"""
+        expires = entry.get("expires")
+        if expires is None:
+            expires = cls.expires_at(entry)
+        return expires <= time.time()
+    
+    def put(self, episode_url: str, stream_url: str, variants: Optional[List[Dict[str, Any]]] = None,
+            fallbacks: Optional[List[Dict[str, Any]]] = None):
+        """Cache stream URL together with its quality variants and fallback mirrors"""
         if episode_url in self.cache:
             self.cache.move_to_end(episode_url)
-        else:
-            if len(self.cache) >= self.max_size:
-                # Remove least recently used
-                self.cache.popitem(last=False)
-            self.cache[episode_url] = stream_url
+        elif len(self.cache) >= self.max_size:
+            # Remove least recently used
+            self.cache.popitem(last=False)
+        entry = {"url": stream_url, "variants": variants or [], "fallbacks": fallbacks or [],
+                 "stored": time.time()}
+        entry["expires"] = self.expires_at(entry)
+        self.cache[episode_url] = entry
         self.save()
     
+    def remove(self, episode_url: str):
+        """Forget an entry that no longer plays"""
+        if self.cache.pop(episode_url, None) is not None:
+            self.save()
+    
     def save(self):
         """Save cache to disk"""
         try:
-            os.makedirs(Config.CACHE_DIR, exist_ok=True)
-            with open(Config.STREAM_CACHE_FILE, 'w') as f:
-                json.dump(list(self.cache.items()), f)
+            Utils.atomic_write_json(Config.STREAM_CACHE_FILE, list(self.cache.items()))
         except:
             pass
     
@@ -374,154 +1109,1001 @@ class FastStreamCache:
         except:
             self.cache = OrderedDict()
 
-# ============================================================================
-# INSTANT PRELOADER
-# ============================================================================
-class InstantPreloader:
-    """Preloads next episodes WHILE you're watching - makes navigation INSTANT"""
+class WatchHistory:
+    """Last episode watched per series - drives "continue where you left off" prefetch"""
     
-    def __init__(self):
-        self.cache = FastStreamCache()
-        self.preload_thread = None
-        self.stop_flag = threading.Event()
-        self.current_preloads = []
+    _history = None
     
-    def preload_episodes(self, episodes: List[Tuple[str, str]], start_idx: int):
-        """Preload next 2 episodes in background"""
-        if self.preload_thread and self.preload_thread.is_alive():
-            self.stop_flag.set()
-            self.preload_thread.join(timeout=1)
-        
-        self.stop_flag.clear()
-        self.current_preloads = []
-        
-        # Get next 2 episode URLs
-        next_urls = []
-        for i in range(start_idx + 1, min(start_idx + 3, len(episodes))):
-            next_urls.append(episodes[i][1])
-        
-        if not next_urls:
-            return
-        
-        def preload_worker(urls):
-            for url in urls:
-                if self.stop_flag.is_set():
-                    break
-                try:
-                    # Skip if already cached
-                    if self.cache.get(url):
-                        continue
-                    
-                    stream_url = StreamExtractor.extract_stream_url_fast(url)
-                    if stream_url and stream_url != url:
-                        self.cache.put(url, stream_url)
-                        self.current_preloads.append(stream_url)
-                except:
-                    pass
-        
-        self.preload_thread = threading.Thread(
-            target=preload_worker, 
-            args=(next_urls,),
-            daemon=True
-        )
-        self.preload_thread.start()
+    @classmethod
+    def _load(cls) -> Dict[str, Dict[str, Any]]:
+        if cls._history is None:
+            try:
+                with open(Config.WATCH_HISTORY_FILE, 'r') as f:
+                    cls._history = json.load(f)
+            except:
+                cls._history = {}
+        return cls._history
     
-    def get_stream(self, episode_url: str) -> str:
-        """Get stream URL - uses cache if available, otherwise extracts fresh"""
-        # Check cache first (INSTANT if cached)
-        cached = self.cache.get(episode_url)
-        if cached:
-            return cached
-        
-        # Extract fresh
-        stream_url = StreamExtractor.extract_stream_url_fast(episode_url)
-        self.cache.put(episode_url, stream_url)
-        return stream_url
+    @classmethod
+    def record(cls, series_title: str, episode_url: str):
+        """Remember the episode just started"""
+        cls._load()[series_title.strip().lower()] = {"episode": episode_url, "time": time.time()}
+        try:
+            Utils.atomic_write_json(Config.WATCH_HISTORY_FILE, cls._history)
+        except:
+            pass
     
-    def stop(self):
-        """Stop preloading"""
-        self.stop_flag.set()
-        if self.preload_thread and self.preload_thread.is_alive():
-            self.preload_thread.join(timeout=1)
+    @classmethod
+    def last(cls, series_title: str) -> Optional[str]:
+        """URL of the last episode watched in a series, if any"""
+        entry = cls._load().get(series_title.strip().lower())
+        return entry["episode"] if entry else None
 
-# ============================================================================
-# CORE UTILITIES (OPTIMIZED)
-# ============================================================================
-class Utils:
-    """Utility functions"""
+class HttpCache:
+    """On-disk page cache (zlib bodies) honoring Cache-Control, ETag and Last-Modified"""
     
-    @staticmethod
-    def clear_screen():
-        """Clear terminal screen (Windows/Linux compatible)"""
-        if os.name == 'nt':
-            os.system('cls')
-        else:
-            os.system('clear')
+    HEURISTIC_FRACTION = 0.1   # Of the Last-Modified age, when no explicit lifetime is given
+    HEURISTIC_MAX = 24 * 3600
     
     @staticmethod
-    def sanitize_filename(name: str) -> str:
-        """Sanitize filename for cross-platform compatibility"""
-        invalid_chars = r'[\\/:*?"<>|]'
-        sanitized = re.sub(invalid_chars, '_', name)
-        sanitized = sanitized.strip(' .')
-        sanitized = re.sub(r'_+', '_', sanitized)
-        return sanitized if sanitized else "untitled"
+    def path(url: str) -> str:
+        import hashlib
+        return os.path.join(Config.HTTP_CACHE_DIR, hashlib.sha1(url.encode()).hexdigest())
     
     @staticmethod
-    def extract_episode_number(title: str, url: str) -> int:
-        """Extract episode number from title or URL"""
-        patterns = [
-            r'episode\s*[-]?\s*(\d+)',
-            r'ep\s*[-]?\s*(\d+)',
-            r'第\s*(\d+)\s*[集话]',
-            r'(\d{2,})\s*$',
-            r'\b(\d{2,})\b'
-        ]
+    def floor(url: str) -> int:
+        for pattern, seconds in Config.HTTP_CACHE_FLOORS:
+            if re.search(pattern, url):
+                return seconds
+        return 0
+    
+    @classmethod
+    def lifetime(cls, url: str, headers) -> Tuple[float, bool]:
+        """(fresh seconds, storable) for a response, after the policy floor"""
+        from email.utils import parsedate_to_datetime
         
-        for pattern in patterns:
-            match = re.search(pattern, title, re.IGNORECASE)
-            if match:
-                return int(match.group(1))
+        directives = {}
+        for part in headers.get("Cache-Control", "").lower().split(","):
+            name, _, value = part.strip().partition("=")
+            if name:
+                directives[name] = value.strip('"')
         
-        # Try URL as fallback
-        for pattern in patterns:
-            match = re.search(pattern, url, re.IGNORECASE)
-            if match:
+        fresh = 0.0
+        try:
+            if "s-maxage" in directives or "max-age" in directives:
+                fresh = float(directives.get("s-maxage") or directives.get("max-age"))
+            elif headers.get("Expires") and headers.get("Date"):
+                fresh = (parsedate_to_datetime(headers["Expires"]) -
+                         parsedate_to_datetime(headers["Date"])).total_seconds()
+            elif headers.get("Last-Modified") and headers.get("Date"):
+                age = (parsedate_to_datetime(headers["Date"]) -
+                       parsedate_to_datetime(headers["Last-Modified"])).total_seconds()
+                fresh = min(cls.HEURISTIC_MAX, age * cls.HEURISTIC_FRACTION)
+        except (TypeError, ValueError):
+            fresh = 0.0
+        if "no-cache" in directives or "no-store" in directives:
+            fresh = 0.0
+        
+        floor = cls.floor(url)
+        return max(fresh, floor), floor > 0 or "no-store" not in directives
+    
+    @classmethod
+    def lookup(cls, url: str) -> Optional[Dict[str, Any]]:
+        """Cached entry (meta + body), fresh or not"""
+        import zlib
+        try:
+            with open(cls.path(url), 'rb') as f:
+                meta, _, body = f.read().partition(b"\n")
+            entry = json.loads(meta)
+            entry["body"] = zlib.decompress(body)
+            return entry if entry.get("url") == url else None
+        except:
+            return None
+    
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["stored"] < entry["fresh_for"]
+    
+    @staticmethod
+    def validators(entry: Optional[Dict[str, Any]]) -> Optional[Dict[str, str]]:
+        """Conditional request headers for revalidating an entry"""
+        if not entry:
+            return None
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers or None
+    
+    @classmethod
+    def store(cls, url: str, resp, body: bytes, previous: Optional[Dict[str, Any]] = None):
+        """Save a 200 (or refresh an entry after a 304)"""
+        import zlib
+        fresh_for, storable = cls.lifetime(url, resp.headers)
+        if not storable:
+            return
+        meta = {
+            "url": url,
+            "stored": time.time(),
+            "fresh_for": fresh_for,
+            "etag": resp.headers.get("ETag") or (previous or {}).get("etag"),
+            "last_modified": resp.headers.get("Last-Modified") or (previous or {}).get("last_modified"),
+        }
+        try:
+            os.makedirs(Config.HTTP_CACHE_DIR, exist_ok=True)
+            path = cls.path(url)
+            tmp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(json.dumps(meta).encode() + b"\n" + zlib.compress(body))
+            os.replace(tmp_file, path)
+            if previous is None:
+                cls.prune()
+        except:
+            pass
+    
+    @staticmethod
+    def prune():
+        """Drop the oldest entries beyond HTTP_CACHE_MAX_ENTRIES"""
+        files = sorted(os.scandir(Config.HTTP_CACHE_DIR), key=lambda e: e.stat().st_mtime)
+        for entry in files[:max(0, len(files) - Config.HTTP_CACHE_MAX_ENTRIES)]:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+# ============================================================================
+# REQUEST COALESCING
+# ============================================================================
+class SingleFlight:
+    """Concurrent calls with the same key share one execution and its result"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls: Dict[Any, Dict[str, Any]] = {}
+    
+    def do(self, key: Any, fn):
+        """Run fn() once per key at a time; late callers wait for the leader's result"""
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = {"done": threading.Event(), "result": None, "error": None}
+        
+        if not leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
+        
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except BaseException as e:
+            call["error"] = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call["done"].set()
+
+# ============================================================================
+# EXTRACTION SCHEDULER
+# ============================================================================
+class ExtractionScheduler:
+    """Priority lanes for extraction - foreground work never waits behind background"""
+    
+    FOREGROUND, NEXT, SPECULATIVE, BULK = range(4)
+    PREEMPT_WAIT = 15  # Longest a paused background request yields to the foreground
+    
+    _cond = threading.Condition()
+    _queue: List[Tuple[int, int, Dict[str, Any]]] = []  # Heap of (lane, seq, job)
+    _seq = 0
+    _workers = 0
+    _foreground = 0
+    _host_active: Dict[str, int] = {}
+    _running: Dict[str, Dict[str, Any]] = {}  # Job key -> running job
+    # The job a thread works for - carried into pools and racer threads via bind()
+    _job: contextvars.ContextVar = contextvars.ContextVar("extraction_job", default=None)
+    
+    @classmethod
+    def run_foreground(cls, fn, key: Optional[str] = None):
+        """Run fn on the calling thread now; background work pauses until it returns"""
+        with cls._cond:
+            cls._foreground += 1
+            # A background job already doing this work is now what the user waits on
+            job = cls._running.get(key)
+            if job:
+                job["lane"] = cls.FOREGROUND
+            cls._cond.notify_all()
+        try:
+            return fn()
+        finally:
+            with cls._cond:
+                cls._foreground -= 1
+                cls._cond.notify_all()
+    
+    @classmethod
+    def submit(cls, lane: int, fn, host: str, key: Optional[str] = None):
+        """Queue background work; returns a Future (cancel() drops it if not started)"""
+        from concurrent.futures import Future
+        
+        future = Future()
+        with cls._cond:
+            heapq.heappush(cls._queue, (lane, cls._seq, {"fn": fn, "host": host, "key": key,
+                                                         "lane": lane, "future": future}))
+            cls._seq += 1
+            if cls._workers < Config.EXTRACTION_WORKERS:
+                cls._workers += 1
+                threading.Thread(target=cls._worker, daemon=True, name="extract").start()
+            cls._cond.notify_all()
+        return future
+    
+    @classmethod
+    def current(cls) -> Optional[Dict[str, Any]]:
+        """Background job the calling thread works for (None on foreground threads)"""
+        return cls._job.get()
+    
+    @classmethod
+    def bind(cls, fn):
+        """Wrap fn so another thread (hedge pool, mirror pool, racer) runs it as part of the calling job"""
+        job = cls._job.get()
+        if job is None:
+            return fn
+        
+        def run(*args, **kwargs):
+            token = cls._job.set(job)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                cls._job.reset(token)
+        return run
+    
+    @classmethod
+    def checkpoint(cls):
+        """Called before each network request - a background job yields to the foreground here"""
+        job = cls._job.get()
+        if job is None:
+            return
+        deadline = time.monotonic() + cls.PREEMPT_WAIT
+        with cls._cond:
+            while cls._foreground and job["lane"] != cls.FOREGROUND:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                cls._cond.wait(remaining)
+    
+    @classmethod
+    def _next_job(cls) -> Optional[Dict[str, Any]]:
+        """Highest-priority runnable job (caller holds the lock)"""
+        if cls._foreground:
+            return None
+        for item in sorted(cls._queue):
+            job = item[2]
+            if job["future"].cancelled():
+                cls._queue.remove(item)
+                heapq.heapify(cls._queue)
+            elif cls._host_active.get(job["host"], 0) < Config.HOST_CONCURRENCY:
+                cls._queue.remove(item)
+                heapq.heapify(cls._queue)
+                return job
+        return None
+    
+    @classmethod
+    def _worker(cls):
+        """Background worker - takes jobs lane by lane, respecting per-host caps"""
+        while True:
+            with cls._cond:
+                job = cls._next_job()
+                while job is None:
+                    cls._cond.wait()
+                    job = cls._next_job()
+                cls._host_active[job["host"]] = cls._host_active.get(job["host"], 0) + 1
+                if job["key"]:
+                    cls._running[job["key"]] = job
+            
+            future = job["future"]
+            if future.set_running_or_notify_cancel():
+                token = cls._job.set(job)
+                try:
+                    future.set_result(job["fn"]())
+                except BaseException as e:
+                    future.set_exception(e)
+                finally:
+                    cls._job.reset(token)
+            
+            with cls._cond:
+                cls._host_active[job["host"]] -= 1
+                if cls._running.get(job["key"]) is job:
+                    del cls._running[job["key"]]
+                cls._cond.notify_all()
+
+# ============================================================================
+# PREFETCH POLICY
+# ============================================================================
+class PrefetchPolicy:
+    """Scales speculative work to the device: eager on Wi-Fi, frugal on cellular or low battery"""
+    
+    FULL, FRUGAL, OFF = "full", "frugal", "off"
+    REFRESH_INTERVAL = 60  # Seconds between termux-api readings
+    SAVE_INTERVAL = 5
+    
+    _mode = None
+    _metered = False
+    _checked = 0.0
+    _refreshing = False
+    _usage = None
+    _last_save = 0.0
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def _termux_json(command: str) -> Optional[Dict[str, Any]]:
+        import shutil
+        if not shutil.which(command):
+            return None
+        try:
+            return json.loads(subprocess.run([command], capture_output=True, text=True, timeout=5).stdout)
+        except:
+            return None
+    
+    @classmethod
+    def detect(cls) -> str:
+        """Read network type and battery state (blocking - termux-api can take a second)"""
+        metered = Config.METERED
+        battery = None
+        if PlayerBackend.platform() == "android":
+            if metered is None:
+                wifi = cls._termux_json("termux-wifi-connectioninfo")
+                if wifi is not None:
+                    metered = wifi.get("supplicant_state") != "COMPLETED" or wifi.get("ip") in (None, "0.0.0.0")
+            battery = cls._termux_json("termux-battery-status")
+        
+        mode = cls.FRUGAL if metered else cls.FULL
+        if battery and battery.get("status") not in ("CHARGING", "FULL"):
+            percentage = battery.get("percentage", 100)
+            if percentage < Config.CRITICAL_BATTERY:
+                mode = cls.OFF
+            elif percentage < Config.LOW_BATTERY:
+                mode = cls.FRUGAL
+        if metered and cls.budget_left() <= 0:
+            mode = cls.OFF
+        cls._metered = bool(metered)
+        return mode
+    
+    @classmethod
+    def mode(cls) -> str:
+        """Current mode - never blocks; readings refresh in the background"""
+        if cls._mode is None:
+            # Until the first reading, assume a phone is on mobile data
+            cls._mode = cls.FRUGAL if PlayerBackend.platform() == "android" and Config.METERED is not False else cls.FULL
+            cls._metered = cls._mode == cls.FRUGAL
+        if time.monotonic() - cls._checked > cls.REFRESH_INTERVAL and not cls._refreshing:
+            cls._refreshing = True
+            cls._checked = time.monotonic()
+            
+            def refresh():
+                try:
+                    cls._mode = cls.detect()
+                finally:
+                    cls._refreshing = False
+            threading.Thread(target=refresh, daemon=True, name="policy").start()
+        return cls._mode
+    
+    @classmethod
+    def preload_depth(cls) -> int:
+        """Episodes to resolve ahead of the one playing"""
+        return {cls.FULL: 2, cls.FRUGAL: 1, cls.OFF: 0}[cls.mode()]
+    
+    @classmethod
+    def allows_speculation(cls) -> bool:
+        """Segment probes, likely-pick resolution and catalog refreshes"""
+        return cls.mode() == cls.FULL
+    
+    @classmethod
+    def _load_usage(cls) -> Dict[str, Any]:
+        today = time.strftime("%Y-%m-%d")
+        if cls._usage is None:
+            try:
+                with open(Config.DATA_USAGE_FILE, 'r') as f:
+                    cls._usage = json.load(f)
+            except:
+                cls._usage = {}
+        if cls._usage.get("date") != today:
+            cls._usage = {"date": today, "bytes": 0}
+        return cls._usage
+    
+    @classmethod
+    def budget_left(cls) -> int:
+        """Bytes of background traffic still allowed today"""
+        with cls._lock:
+            return Config.DAILY_DATA_BUDGET_MB * 1024 * 1024 - cls._load_usage()["bytes"]
+    
+    @classmethod
+    def record_background(cls, size: int):
+        """Count bytes fetched by background work on a metered link"""
+        if not cls._metered or not size:
+            return
+        with cls._lock:
+            usage = cls._load_usage()
+            usage["bytes"] += size
+            exhausted = usage["bytes"] >= Config.DAILY_DATA_BUDGET_MB * 1024 * 1024
+        if exhausted:
+            cls._mode = cls.OFF
+        if time.monotonic() - cls._last_save >= cls.SAVE_INTERVAL:
+            cls.save()
+    
+    @classmethod
+    def save(cls):
+        """Persist today's background byte count"""
+        cls._last_save = time.monotonic()
+        with cls._lock:
+            if cls._usage is None:
+                return
+            try:
+                Utils.atomic_write_json(Config.DATA_USAGE_FILE, cls._usage)
+            except:
+                pass
+
+# ============================================================================
+# INSTANT PRELOADER
+# ============================================================================
+class InstantPreloader:
+    """Preloads next episodes WHILE you're watching - makes navigation INSTANT"""
+    
+    def __init__(self):
+        self.cache = FastStreamCache()
+        self.pending: Dict[Any, List[Any]] = {}  # Owner (daemon client) -> futures of its queued jobs
+        self.current_preloads = []
+        self.flight = SingleFlight()  # Foreground and preload share in-flight extractions
+    
+    def preload_episodes(self, episodes: List[Tuple[str, str]], start_idx: int, owner: Any = None):
+        """Preload next 2 episodes in background (replaces only this owner's earlier preloads)"""
+        self.stop(owner)
+        self.current_preloads = []
+        
+        # A running daemon preloads into its own warm cache instead
+        batch = episodes[start_idx:start_idx + 3]
+        mirrors = {url: MirrorRacer.mirrors[url] for _, url in batch if url in MirrorRacer.mirrors}
+        if DaemonClient.call("preload", episodes=[list(ep) for ep in batch],
+                             mirrors=mirrors, client=os.getpid()) is not None:
+            return
+        
+        # Next episode first, the one after speculatively (fewer on cellular/low battery)
+        depth = PrefetchPolicy.preload_depth()
+        for i in range(start_idx + 1, min(start_idx + 1 + depth, len(episodes))):
+            url = episodes[i][1]
+            if self.cache.get(url):
+                continue
+            lane = ExtractionScheduler.NEXT if i == start_idx + 1 else ExtractionScheduler.SPECULATIVE
+            self.pending.setdefault(owner, []).append(
+                self.schedule(url, lane, probe=PrefetchPolicy.allows_speculation()))
+    
+    def schedule(self, episode_url: str, lane: int, probe: bool = False):
+        """Queue a background extraction on the scheduler; returns a Future of the entry"""
+        def job():
+            entry = self.flight.do(episode_url, lambda: self.fetch_entry(episode_url))
+            if probe and entry["url"] and entry["url"] != episode_url:
+                self.current_preloads.append(entry["url"])
+                # Sample real segment speed once per batch for "auto" quality
+                if len(self.current_preloads) == 1:
+                    try:
+                        variant = VariantSelector.pick(entry["variants"], "auto")
+                        NetworkMonitor.probe_stream(variant["url"] if variant else entry["url"], episode_url)
+                    except:
+                        pass
+            return entry
+        
+        return ExtractionScheduler.submit(lane, job, SourceHealth.host(episode_url), key=episode_url)
+    
+    def get_stream(self, episode_url: str) -> str:
+        """Get stream URL - uses cache if available, otherwise extracts fresh"""
+        return self.get_entry(episode_url)["url"]
+    
+    def get_entry(self, episode_url: str) -> Dict[str, Any]:
+        """Get stream entry with variants - cached, otherwise extracted once"""
+        # Check cache first (INSTANT if cached)
+        cached = self.cache.get_entry(episode_url)
+        if cached:
+            return cached
+        
+        # Joins a preload of the same episode instead of extracting twice
+        return ExtractionScheduler.run_foreground(
+            lambda: self.flight.do(episode_url, lambda: self.fetch_entry(episode_url)),
+            key=episode_url)
+    
+    def fetch_entry(self, episode_url: str) -> Dict[str, Any]:
+        """Extract a stream entry (called once per episode at a time via single-flight)"""
+        # A flight that finished just before we joined has filled the cache
+        cached = self.cache.get_entry(episode_url)
+        if cached:
+            return cached
+        
+        # A running daemon may already hold it (or a preload in flight)
+        remote = DaemonClient.call("resolve", url=episode_url, mirror=MirrorRacer.mirrors.get(episode_url))
+        if remote is not None:
+            if remote["url"] != episode_url:
+                self.cache.put(episode_url, remote["url"], remote["variants"], remote.get("fallbacks"))
+            return remote
+        
+        # Extract fresh (races both realms when a mirror is known)
+        return MirrorRacer.resolve(episode_url, self.cache)
+    
+    def stop(self, owner: Any = None):
+        """Stop preloading (drops queued jobs; running ones finish into the cache)
+        
+        With an owner only that daemon client's jobs are dropped; otherwise all of them.
+        """
+        for key in ([owner] if owner is not None else list(self.pending)):
+            for future in self.pending.pop(key, []):
+                future.cancel()
+
+# ============================================================================
+# TERMINAL RENDERER
+# ============================================================================
+# Screens used to be redrawn by forking `clear`/`cls` and reprinting every
+# line - tens of milliseconds per transition on Termux/iSH. Screen writes the
+# ANSI sequences itself and keeps the last frame pinned at the top of the
+# terminal (prompts scroll in the region below it), so a redraw only rewrites
+# the rows that changed.
+class Screen:
+    """ANSI screen renderer with differential frame updates"""
+
+    CLEAR = "\033[r\033[H\033[2J\033[3J"  # Drop scroll region, home, erase screen and scrollback
+    MIN_COLUMNS = 80   # Frames are ~72 cells wide - narrower terminals wrap and break row math
+    PROMPT_ROWS = 8    # Rows that must stay free below a pinned frame for prompts
+
+    frame: List[str] = []          # Rows currently pinned at the top of the terminal
+    _ansi: Optional[bool] = None
+    _atexit = False
+
+    @classmethod
+    def ansi(cls) -> bool:
+        """Whether stdout is a terminal that understands ANSI (enables VT mode on Windows)"""
+        if cls._ansi is None:
+            cls._ansi = sys.stdout.isatty()
+            if cls._ansi and os.name == 'nt':
+                try:
+                    import ctypes
+                    kernel32 = ctypes.windll.kernel32
+                    handle = kernel32.GetStdHandle(-11)
+                    mode = ctypes.c_ulong()
+                    kernel32.GetConsoleMode(handle, ctypes.byref(mode))
+                    cls._ansi = bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+                except:
+                    cls._ansi = False
+        return cls._ansi
+
+    @staticmethod
+    def write(data: str):
+        sys.stdout.write(data)
+        sys.stdout.flush()
+
+    @classmethod
+    def clear(cls):
+        """Blank the terminal and forget the pinned frame"""
+        cls.frame = []
+        if cls.ansi():
+            cls.write(cls.CLEAR)
+        elif os.name == 'nt' and sys.stdout.isatty():
+            os.system('cls')  # Legacy console without VT support
+
+    @classmethod
+    def release(cls):
+        """Give the whole terminal back (keeps the cursor where it is)"""
+        if cls.frame:
+            cls.frame = []
+            cls.write("\0337\033[r\0338")
+
+    @classmethod
+    def render(cls, lines: List[str], width: int = MIN_COLUMNS):
+        """Show a frame, rewriting only the rows that differ from the pinned one
+
+        width is the widest line in cells - narrower frames (the Termux client's) pin on phones too.
+        """
+        try:
+            columns, rows = os.get_terminal_size()
+        except OSError:
+            columns, rows = 0, 0
+        if not cls.ansi() or columns < width or len(lines) + cls.PROMPT_ROWS > rows:
+            # Doesn't fit (or not a terminal) - plain full redraw, nothing pinned
+            cls.clear()
+            print("\n".join(lines))
+            return
+
+        old = cls.frame
+        out = [] if old else [cls.CLEAR]
+        for row, line in enumerate(lines, 1):
+            if row > len(old) or old[row - 1] != line:
+                out.append(f"\033[{row};1H\033[2K{line}")
+        # Setting the scroll region homes the cursor; park it below the frame and wipe old output
+        out.append(f"\033[{len(lines) + 1};{rows}r\033[{len(lines) + 1};1H\033[J")
+        cls.write("".join(out))
+        cls.frame = list(lines)
+
+        if not cls._atexit:
+            import atexit
+            atexit.register(cls.release)
+            cls._atexit = True
+
+# ============================================================================
+# CORE UTILITIES (OPTIMIZED)
+# ============================================================================
+class Utils:
+    """Utility functions"""
+    
+    @staticmethod
+    def clear_screen():
+        """Clear terminal screen (Windows/Linux compatible, no subprocess)"""
+        Screen.clear()
+    
+    @staticmethod
+    def atomic_write_json(path: str, obj: Any):
+        """Write JSON through a temp file and os.replace - the daemon and CLI may write the same state"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(obj, f)
+            os.replace(tmp_file, path)
+        except:
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            raise
+    
+    @staticmethod
+    def sanitize_filename(name: str) -> str:
+        """Sanitize filename for cross-platform compatibility"""
+        invalid_chars = r'[\\/:*?"<>|]'
+        sanitized = re.sub(invalid_chars, '_', name)
+        sanitized = sanitized.strip(' .')
+        sanitized = re.sub(r'_+', '_', sanitized)
+        return sanitized if sanitized else "untitled"
+    
+    @staticmethod
+    def extract_episode_number(title: str, url: str) -> int:
+        """Extract episode number from title or URL"""
+        patterns = [
+            r'episode\s*[-]?\s*(\d+)',
+            r'ep\s*[-]?\s*(\d+)',
+            r'第\s*(\d+)\s*[集话]',
+            r'(\d{2,})\s*$',
+            r'\b(\d{2,})\b'
+        ]
+        
+        for pattern in patterns:
+            match = re.search(pattern, title, re.IGNORECASE)
+            if match:
+                return int(match.group(1))
+        
+        # Try URL as fallback
+        for pattern in patterns:
+            match = re.search(pattern, url, re.IGNORECASE)
+            if match:
                 return int(match.group(1))
         
         return 999999
     
+    @staticmethod
+    def parse_episode_selection(choice: str, episodes: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Parse "1-5,8,10-12" into episodes (ValueError on bad input, IndexError out of range)"""
+        selected = []
+        for part in choice.split(","):
+            part = part.strip()
+            if "-" in part:
+                start, end = map(int, part.split("-"))
+                if start < 1 or end > len(episodes) or start > end:
+                    raise IndexError
+                selected.extend(episodes[start-1:end])
+            else:
+                num = int(part)
+                if num < 1 or num > len(episodes):
+                    raise IndexError
+                selected.append(episodes[num-1])
+        return selected
+    
     @staticmethod
     def get_soup_fast(url: str, timeout: int = 8) -> BeautifulSoup:
-        """Fast HTTP fetch with fallback"""
+        """Fast HTTP fetch - page cache, revalidation, in-process fallback"""
+        cached = HttpCache.lookup(url)
+        if cached and HttpCache.is_fresh(cached):
+            return BeautifulSoup(cached["body"], "html.parser")
+        
         try:
-            resp = requests.get(url, headers=Config.HEADERS, timeout=timeout)
+            resp = HttpClient.get_hedged(url, headers=HttpCache.validators(cached), timeout=timeout)
+            if resp.status_code == 304 and cached:
+                HttpCache.store(url, resp, cached["body"], previous=cached)
+                return BeautifulSoup(cached["body"], "html.parser")
             if resp.status_code == 200:
-                return BeautifulSoup(resp.text, "html.parser")
-        except requests.exceptions.Timeout:
-            print(f"{WuxiaTheme.GRAY}  ⏱️ Request timeout, trying curl...{WuxiaTheme.RESET}")
-        except:
-            pass
+                HttpCache.store(url, resp, resp.content)
+                return BeautifulSoup(resp.content, "html.parser")
+            if resp.status_code not in SourceHealth.FAILURE_STATUSES and resp.status_code < 500:
+                return BeautifulSoup("", "html.parser")
+            failure = resp
+        except SourceUnavailable:
+            # A stale copy beats nothing while the host cools down
+            return BeautifulSoup(cached["body"] if cached else "", "html.parser")
+        except requests.exceptions.Timeout as e:
+            print(f"{WuxiaTheme.GRAY}  ⏱️ Request timeout, retrying...{WuxiaTheme.RESET}")
+            failure = e
+        except Exception as e:
+            failure = e
+        
+        # A host that just tripped its breaker won't answer a retry either
+        if not SourceHealth.allow(SourceHealth.host(url)):
+            return BeautifulSoup(cached["body"] if cached else "", "html.parser")
         
-        # Fallback to curl (works on Windows with Git Bash/Cygwin/WSL)
+        body = HttpClient.fetch_fallback(url, failure, timeout) or (cached["body"] if cached else None)
+        return BeautifulSoup(body, "html.parser") if body else BeautifulSoup("", "html.parser")
+
+# ============================================================================
+# YT-DLP WORKER
+# ============================================================================
+class YtdlpWorker:
+    """Keeps yt-dlp loaded in-process - no interpreter startup per extraction"""
+    
+    EXTRACTION_BYTES = 400 * 1024  # Typical page + player JSON + manifests fetched by one extraction
+    
+    _module = None
+    _instances = {}
+    _instance_locks = {}
+    _lock = threading.Lock()
+    
+    class SilentLogger:
+        """yt-dlp prints errors to stderr even with quiet=True - keep the UI clean"""
+        def debug(self, msg): pass
+        def info(self, msg): pass
+        def warning(self, msg): pass
+        def error(self, msg): pass
+    
+    @classmethod
+    def module(cls):
+        """The yt_dlp module if importable, else None (subprocess fallback)"""
+        if cls._module is None:
+            try:
+                import yt_dlp
+                cls._module = yt_dlp
+            except ImportError:
+                cls._module = False
+        return cls._module or None
+    
+    @classmethod
+    def _instance(cls, fmt: Optional[str], timeout: float):
+        """One reusable YoutubeDL per format, each guarded by its own lock"""
+        key = (fmt, timeout)
+        with cls._lock:
+            if key not in cls._instances:
+                params = {
+                    "quiet": True,
+                    "no_warnings": True,
+                    "logger": cls.SilentLogger(),
+                    "nocheckcertificate": True,
+                    "noplaylist": True,
+                    "socket_timeout": timeout,
+                }
+                if fmt:
+                    params["format"] = fmt
+                cls._instances[key] = cls.module().YoutubeDL(params)
+                cls._instance_locks[key] = threading.Lock()
+            return cls._instances[key], cls._instance_locks[key]
+    
+    @staticmethod
+    def _urls_from_info(info: Optional[Dict[str, Any]]) -> List[str]:
+        """Same URLs `yt-dlp --get-url` would print"""
+        if not info:
+            return []
+        if info.get("entries"):
+            urls = []
+            for entry in info["entries"]:
+                urls.extend(YtdlpWorker._urls_from_info(entry))
+            return urls
+        if info.get("requested_formats"):
+            return [f["url"] for f in info["requested_formats"] if f.get("url")]
+        return [info["url"]] if info.get("url") else []
+    
+    @staticmethod
+    def _run(cmd: List[str], timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        if os.name == 'nt':
+            # Hide console window on Windows
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            return subprocess.run(cmd, capture_output=True, text=True,
+                                  timeout=timeout, startupinfo=startupinfo)
+        return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    
+    @classmethod
+    def get_urls(cls, url: str, referer: Optional[str] = None, fmt: Optional[str] = None,
+                 timeout: float = 15) -> List[str]:
+        """Resolve media URLs for a page - in-process when possible"""
+        ExtractionScheduler.checkpoint()
+        RateLimiter.acquire(SourceHealth.host(url))
+        if ExtractionScheduler.current() is not None:
+            # yt-dlp's own traffic is invisible to us - charge a typical extraction up front
+            PrefetchPolicy.record_background(cls.EXTRACTION_BYTES)
+        user_agent = Config.HEADERS["User-Agent"]
+        
+        if cls.module():
+            ydl, lock = cls._instance(fmt, timeout)
+            # A stuck extraction holds the lock - don't queue behind it
+            if lock.acquire(timeout=timeout):
+                try:
+                    ydl.params["http_headers"]["User-Agent"] = user_agent
+                    if referer:
+                        ydl.params["http_headers"]["Referer"] = referer
+                    else:
+                        ydl.params["http_headers"].pop("Referer", None)
+                    return cls._urls_from_info(ydl.extract_info(url, download=False))
+                except Exception:
+                    return []
+                finally:
+                    lock.release()
+        
+        cmd = ["yt-dlp", "--get-url", "--quiet",
+               "--no-check-certificates",
+               "--socket-timeout", str(int(timeout)),
+               "--user-agent", user_agent]
+        if referer:
+            cmd += ["--referer", referer]
+        if fmt:
+            cmd += ["-f", fmt]
+        cmd.append(url)
         try:
-            if os.name == 'nt':
-                # Windows - try curl if available
-                curl_cmd = ["curl", "-s", "-L", "-m", str(timeout),
-                          "-A", Config.HEADERS["User-Agent"], url]
-            else:
-                # Linux/Mac
-                curl_cmd = ["curl", "-s", "-L", "-m", str(timeout),
-                          "-H", f"User-Agent: {Config.HEADERS['User-Agent']}",
-                          "-H", "Accept: text/html", url]
-            
-            result = subprocess.run(curl_cmd, capture_output=True, text=True, timeout=timeout+2)
-            if result.returncode == 0:
-                return BeautifulSoup(result.stdout, "html.parser")
+            result = cls._run(cmd, timeout=timeout)
+        except Exception:
+            return []
+        if result.returncode != 0:
+            return []
+        return [line for line in result.stdout.strip().split("\n") if line]
+    
+    @classmethod
+    def download(cls, url: str, output_path: str, fmt: str) -> bool:
+        """Download to an output template - in-process when possible"""
+        RateLimiter.acquire(SourceHealth.host(url))
+        if cls.module():
+            params = {
+                "format": fmt,
+                "outtmpl": output_path,
+                "nocheckcertificate": True,
+                "nopart": True,
+                "concurrent_fragment_downloads": 4,  # Parallel downloads
+                "quiet": True,
+                "no_warnings": True,
+                "logger": cls.SilentLogger(),
+            }
+            try:
+                # Output template differs per episode, so downloads get a fresh
+                # YoutubeDL - the module and extractors stay loaded either way
+                with cls.module().YoutubeDL(params) as ydl:
+                    return ydl.download([url]) == 0
+            except Exception:
+                return False
+        
+        cmd = [
+            "yt-dlp",
+            "-f", fmt,
+            "-o", output_path,
+            "--no-check-certificates",
+            "--no-part",
+            "--concurrent-fragments", "4",  # Parallel downloads
+            url
+        ]
+        try:
+            return cls._run(cmd).returncode == 0
+        except (OSError, subprocess.SubprocessError):
+            return False
+
+# ============================================================================
+# VARIANT SELECTOR
+# ============================================================================
+class VariantSelector:
+    """Parses every quality variant once so mpv gets an exact stream URL"""
+    
+    DM_METADATA_URL = "https://www.dailymotion.com/player/metadata/video/{}"
+    DM_ID_PATTERN = r'dailymotion\.com/(?:video/|embed/video/|player/[^?]*\?(?:[^"\']*&)?video=)([a-zA-Z0-9]+)'
+    HLS_TYPE = "application/x-mpegURL"
+    DM_LABEL_HEIGHTS = {"380": 360}  # Dailymotion labels its 360p rendition "380"
+    
+    @staticmethod
+    def parse_hls_master(text: str, base_url: str) -> List[Dict[str, Any]]:
+        """Parse #EXT-X-STREAM-INF entries of an HLS master playlist"""
+        from urllib.parse import urljoin
+        
+        variants = []
+        seen = set()
+        attrs = None
+        for line in text.splitlines():
+            line = line.strip()
+            if line.startswith("#EXT-X-STREAM-INF:"):
+                attrs = line.split(":", 1)[1]
+            elif attrs is not None and line and not line.startswith("#"):
+                res = re.search(r'RESOLUTION=\d+x(\d+)', attrs)
+                name = re.search(r'NAME="(\d+)', attrs)
+                bw = re.search(r'(?<![-A-Z])BANDWIDTH=(\d+)', attrs)
+                height = int(res.group(1)) if res else int(name.group(1)) if name else 0
+                bandwidth = int(bw.group(1)) if bw else 0
+                # Dailymotion repeats each rendition per CDN - keep the first
+                if (height, bandwidth) not in seen:
+                    seen.add((height, bandwidth))
+                    variants.append({"url": urljoin(base_url, line), "height": height, "bandwidth": bandwidth})
+                attrs = None
+        return variants
+    
+    @staticmethod
+    def fetch_hls_variants(playlist_url: str, referer: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Download an HLS playlist and return its variants (empty for media playlists)"""
+        headers = {**Config.HEADERS, "Referer": referer} if referer else None
+        try:
+            resp = HttpClient.get(playlist_url, headers=headers, timeout=8)
+            if resp.status_code == 200 and "#EXT-X-STREAM-INF" in resp.text:
+                return VariantSelector.parse_hls_master(resp.text, resp.url)
         except:
             pass
+        return []
+    
+    @staticmethod
+    def resolve_dailymotion(video_id: str, referer: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Read Dailymotion metadata and expand its HLS master into variants"""
+        headers = {**Config.HEADERS, "Referer": referer} if referer else None
+        try:
+            meta = HttpClient.get(VariantSelector.DM_METADATA_URL.format(video_id),
+                                  headers=headers, timeout=10).json()
+        except:
+            return []
+        
+        variants = []
+        master_url = None
+        for key, items in meta.get("qualities", {}).items():
+            for item in items:
+                if item.get("type") != VariantSelector.HLS_TYPE or not item.get("url"):
+                    continue
+                if key == "auto":
+                    master_url = item["url"]
+                elif key.isdigit():
+                    height = VariantSelector.DM_LABEL_HEIGHTS.get(key, int(key))
+                    variants.append({"url": item["url"], "height": height, "bandwidth": 0})
+        
+        if master_url:
+            variants.extend(VariantSelector.fetch_hls_variants(master_url, referer))
+            # The adaptive master stays available as a last resort
+            variants.append({"url": master_url, "height": 0, "bandwidth": 0})
+        return variants
+    
+    @staticmethod
+    def resolve(stream_url: str, referer: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Expand an extracted stream URL into its quality variants"""
+        dm_match = re.search(VariantSelector.DM_ID_PATTERN, stream_url)
+        if dm_match:
+            return VariantSelector.resolve_dailymotion(dm_match.group(1), referer)
+        if ".m3u8" in stream_url:
+            return VariantSelector.fetch_hls_variants(stream_url, referer)
+        return []
+    
+    @staticmethod
+    def pick(variants: List[Dict[str, Any]], quality: str,
+             fallback: str = Config.AUTO_FALLBACK_QUALITY) -> Optional[Dict[str, Any]]:
+        """Pick the best variant not above the requested height ("auto" = link speed)"""
+        sized = [v for v in variants if v.get("height")]
+        if not sized:
+            return variants[0] if variants else None
+        
+        if str(quality).lower() == "auto":
+            if NetworkMonitor.throughput() is None:
+                return VariantSelector.pick(variants, fallback)
+            fitting = [v for v in sized if NetworkMonitor.sustainable(NetworkMonitor.variant_bitrate(v))]
+            if fitting:
+                return max(fitting, key=lambda v: (v["height"], v.get("bandwidth", 0)))
+            return min(sized, key=lambda v: (v["height"], v.get("bandwidth", 0)))
         
-        return BeautifulSoup("", "html.parser")
+        try:
+            limit = int(str(quality).rstrip("p"))
+        except ValueError:
+            limit = max(v["height"] for v in sized)
+        
+        fitting = [v for v in sized if v["height"] <= limit]
+        if fitting:
+            return max(fitting, key=lambda v: (v["height"], v.get("bandwidth", 0)))
+        return min(sized, key=lambda v: (v["height"], v.get("bandwidth", 0)))
 
 # ============================================================================
 # OPTIMIZED STREAM EXTRACTOR
@@ -529,50 +2111,172 @@ class Utils:
 class StreamExtractor:
     """Ultra-fast stream extractor with intelligent caching"""
     
-    preloader = InstantPreloader()
+    _preloader = None
+    
+    @classmethod
+    def get_preloader(cls) -> InstantPreloader:
+        """Shared preloader - created (and its cache loaded) on first use"""
+        if cls._preloader is None:
+            cls._preloader = InstantPreloader()
+        return cls._preloader
+    
+    @classmethod
+    def stop_preloading(cls):
+        """Stop background preloads if a preloader was ever created"""
+        if cls._preloader is not None:
+            cls._preloader.stop()
+    
+    EMBED_HOSTS = ("dailymotion", "ok.ru", "youtube", "youtu.be")
+    DECOY_HINTS = ("bitcoin", "crypto", "ads", "blogspot", "disqus", "facebook.com/plugins")
+    MIRROR_TIMEOUT = 10  # Seconds to resolve and probe every server option
+    
+    @staticmethod
+    def extract_stream(episode_url: str) -> Dict[str, Any]:
+        """Extract the fastest live mirror with its variants; the rest become fallbacks"""
+        soup = None
+        ranked = []
+        if not episode_url.endswith((".m3u8", ".mp4", ".mkv")) and SourceHealth.allow(SourceHealth.host(episode_url)):
+            soup = Utils.get_soup_fast(episode_url, timeout=8)
+            ExtractionScheduler.checkpoint()
+            ranked = StreamExtractor.rank_embeds(StreamExtractor.find_embeds(soup, episode_url), episode_url)
+            if ranked and "latency" in ranked[0]:
+                return {**ranked[0], "fallbacks": ranked[1:]}
+            ExtractionScheduler.checkpoint()
+        
+        # No embed resolved to verified media - fall back to the first recognisable player link
+        stream_url = StreamExtractor.extract_stream_url_fast(episode_url, soup)
+        if stream_url == episode_url:
+            return {"url": stream_url, "variants": []}
+        return {"url": stream_url, "variants": VariantSelector.resolve(stream_url, episode_url),
+                "fallbacks": [entry for entry in ranked if entry["url"] != stream_url]}
+    
+    @staticmethod
+    def find_embeds(soup, page_url: str) -> List[str]:
+        """Every player embed on an episode page, including base64 server-selector options"""
+        import base64
+        from urllib.parse import urljoin
+        
+        found = []
+        
+        def add(src: Optional[str], any_host: bool = False):
+            if not src:
+                return
+            src = urljoin(page_url, src.strip())
+            lowered = src.lower()
+            if not src.startswith("http") or any(hint in lowered for hint in StreamExtractor.DECOY_HINTS):
+                return
+            if any_host or any(host in lowered for host in StreamExtractor.EMBED_HOSTS):
+                found.append(src)
+        
+        for script in soup.select("script[data-video]"):
+            if "dailymotion" in script.get("src", "") and script.get("data-video"):
+                add(f"https://www.dailymotion.com/video/{script.get('data-video')}")
+        for meta in soup.select('meta[content*="dailymotion"], meta[content*="ok.ru"]'):
+            add(meta.get("content"))
+        for iframe in soup.select("iframe"):
+            add(iframe.get("src") or iframe.get("data-src"))
+        
+        # Server selector: each option value is a base64-encoded <iframe> snippet
+        for option in soup.select("select.mirror option[value], .mirror option[value]"):
+            value = option.get("value", "").strip()
+            if not value:
+                continue
+            try:
+                snippet = base64.b64decode(value + "=" * (-len(value) % 4)).decode("utf-8", "ignore")
+            except ValueError:
+                continue
+            for iframe in BeautifulSoup(snippet, "html.parser").select("iframe"):
+                add(iframe.get("src") or iframe.get("data-src"), any_host=True)
+        
+        return list(dict.fromkeys(found))
     
     @staticmethod
-    def extract_stream_url_fast(episode_url: str) -> str:
-        """Ultra-fast extraction - tries fastest methods first"""
+    def rank_embeds(embeds: List[str], referer: str) -> List[Dict[str, Any]]:
+        """Resolve every embed concurrently and order the ones serving real media by first-byte latency
+        
+        Embeds only yt-dlp can open (ok.ru, YouTube, unknown hosts) can't be probed - they follow the
+        verified mirrors in page order, without a "latency", so playback can still fail over to them.
+        """
+        if not embeds:
+            return []
+        from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+        
+        def probe(embed):
+            ExtractionScheduler.checkpoint()
+            entry = {"url": embed, "variants": VariantSelector.resolve(embed, referer)}
+            ExtractionScheduler.checkpoint()
+            return entry, MirrorRacer.probe_latency(entry, referer)
+        
+        ranked = []
+        unprobed = {embed: {"url": embed, "variants": []} for embed in embeds}
+        probe = ExtractionScheduler.bind(probe)
+        pool = ThreadPoolExecutor(max_workers=min(6, len(embeds)), thread_name_prefix="mirror")
+        try:
+            for future in as_completed([pool.submit(probe, e) for e in embeds],
+                                       timeout=StreamExtractor.MIRROR_TIMEOUT):
+                try:
+                    entry, latency = future.result()
+                except Exception:
+                    continue
+                if latency is not None:
+                    ranked.append({**entry, "latency": round(latency, 3)})
+                    del unprobed[entry["url"]]
+                elif MirrorRacer.media_target(entry):
+                    del unprobed[entry["url"]]  # Resolved to media that failed its probe - dead
+        except FuturesTimeout:
+            pass  # Mirrors still resolving are too slow to rank
+        finally:
+            pool.shutdown(wait=False)
+        
+        ranked.sort(key=lambda entry: entry["latency"])
+        return ranked + list(unprobed.values())
+    
+    @staticmethod
+    def extract_stream_url_fast(episode_url: str, soup=None) -> str:
+        """Ultra-fast extraction - tries fastest methods first (soup: episode page already fetched)"""
         
         # 1. Already direct URL? (Fastest - 0ms)
         if episode_url.endswith((".m3u8", ".mp4", ".mkv")):
             return episode_url
         
-        # 2. Try common patterns without full page load (Fast - ~200ms)
-        try:
-            # Quick partial fetch - only first 8KB of HTML
-            resp = requests.get(episode_url, headers=Config.HEADERS, 
-                              timeout=5, stream=True)
-            html_chunk = ""
-            for chunk in resp.iter_content(chunk_size=4096, decode_unicode=True):
-                html_chunk += chunk if isinstance(chunk, str) else chunk.decode('utf-8', 'ignore')
-                if len(html_chunk) > 8192:  # 8KB is enough
-                    break
-            
-            # Fast regex search for common patterns
-            import re
-            
-            # Dailymotion video ID
-            dm_match = re.search(r'data-video\s*=\s*["\']([^"\']+)["\']', html_chunk)
-            if dm_match:
-                return f"https://www.dailymotion.com/video/{dm_match.group(1)}"
-            
-            # Iframe src
-            iframe_match = re.search(r'src\s*=\s*["\'](https?://[^"\']*dailymotion[^"\']*)["\']', html_chunk)
-            if iframe_match:
-                return iframe_match.group(1)
-            
-            # OK.ru iframe
-            ok_match = re.search(r'src\s*=\s*["\'](https?://ok\.[^"\']+)["\']', html_chunk)
-            if ok_match:
-                return ok_match.group(1)
+        if soup is None:
+            # Known-down host: every stage below would just wait out its timeout
+            if not SourceHealth.allow(SourceHealth.host(episode_url)):
+                return episode_url
+                
+            # 2. Try common patterns without full page load (Fast - ~200ms)
+            try:
+                # Quick partial fetch - only first 8KB of HTML
+                resp = HttpClient.get(episode_url, timeout=5, stream=True)
+                html_chunk = ""
+                for chunk in HttpClient.iter_body(resp, 4096, decode_unicode=True):
+                    html_chunk += chunk if isinstance(chunk, str) else chunk.decode('utf-8', 'ignore')
+                    if len(html_chunk) > 8192:  # 8KB is enough
+                        break
+                
+                # Fast regex search for common patterns
+                import re
+                
+                # Dailymotion video ID
+                dm_match = re.search(r'data-video\s*=\s*["\']([^"\']+)["\']', html_chunk)
+                if dm_match:
+                    return f"https://www.dailymotion.com/video/{dm_match.group(1)}"
+                
+                # Iframe src
+                iframe_match = re.search(r'src\s*=\s*["\'](https?://[^"\']*dailymotion[^"\']*)["\']', html_chunk)
+                if iframe_match:
+                    return iframe_match.group(1)
+                
+                # OK.ru iframe
+                ok_match = re.search(r'src\s*=\s*["\'](https?://ok\.[^"\']+)["\']', html_chunk)
+                if ok_match:
+                    return ok_match.group(1)
+                
+            except:
+                pass
             
-        except:
-            pass
-        
-        # 3. Full BeautifulSoup parsing (Medium - ~500ms)
-        soup = Utils.get_soup_fast(episode_url, timeout=8)
+            # 3. Full BeautifulSoup parsing (Medium - ~500ms)
+            soup = Utils.get_soup_fast(episode_url, timeout=8)
         
         # Check for Dailymotion in scripts
         for script in soup.select("script[data-video]"):
@@ -593,30 +2297,10 @@ class StreamExtractor:
             if src and any(x in src for x in ["dailymotion", "ok.ru", "youtube"]):
                 return src
         
-        # 4. Fallback to yt-dlp (Slowest - ~1000ms+)
-        try:
-            cmd = ["yt-dlp", "--get-url", "--quiet",
-                  "--no-check-certificates",
-                  "--referer", episode_url,
-                  "--user-agent", Config.HEADERS["User-Agent"],
-                  episode_url]
-            
-            # Windows-specific adjustments
-            if os.name == 'nt':
-                # Hide console window on Windows
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                result = subprocess.run(cmd, capture_output=True, text=True, 
-                                      timeout=15, startupinfo=startupinfo)
-            else:
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
-            
-            if result.returncode == 0:
-                for line in result.stdout.strip().split("\n"):
-                    if line.startswith("http") and not line.endswith(".svg"):
-                        return line
-        except:
-            pass
+        # 4. Fallback to yt-dlp (Slowest - in-process after the first call)
+        for line in YtdlpWorker.get_urls(episode_url, referer=episode_url, timeout=15):
+            if line.startswith("http") and not line.endswith(".svg"):
+                return line
         
         return episode_url
 
@@ -626,13 +2310,55 @@ class StreamExtractor:
 class Scraper:
     """Fast scraper with intelligent caching"""
     
+    @staticmethod
+    def source_for_url(url: str) -> str:
+        """Which realm a series or episode URL belongs to"""
+        for key, source in Config.SOURCES.items():
+            if source["base_url"].split("://", 1)[-1] in url:
+                return key
+        return "ax"
+    
+    @staticmethod
+    def sources_by_health() -> List[str]:
+        """Realm keys ordered from healthiest to slowest/failing"""
+        return sorted(Config.SOURCES,
+                      key=lambda k: SourceHealth.score(SourceHealth.host(Config.SOURCES[k]["base_url"])))
+    
+    _shared: Dict[str, "Scraper"] = {}
+    
+    @classmethod
+    def shared(cls, source: str) -> "Scraper":
+        """Process-wide scraper per realm, so prefetched episode lists are reused"""
+        if source not in cls._shared:
+            cls._shared[source] = cls(source)
+        return cls._shared[source]
+    
     def __init__(self, source: str):
+        self.key = source
         self.source = Config.SOURCES[source]
         self.base_url = self.source["base_url"]
         self.episode_cache = {}
+        self.flight = SingleFlight()  # A prefetch and the user's pick share one fetch
     
     def search(self, query: str) -> List[Tuple[str, str]]:
         """Fast search with timeout"""
+        remote = DaemonClient.call("search", source=self.key, query=query)
+        if remote is not None:
+            return [tuple(item) for item in remote]
+        
+        # A fresh local catalog answers in milliseconds (and knows abbreviations) - but only
+        # an exact or prefix hit; fuzzy hits alone may be hiding a series added since the crawl
+        scored = Catalog.scored(query, self.key)
+        local = [(title, url) for _, title, url in scored]
+        if scored and scored[0][0] >= Catalog.PREFIX_SCORE and not Catalog.is_stale(self.key):
+            return local
+        
+        results = self.search_live(query)
+        found = {url for _, url in results}
+        return results + [item for item in local if item[1] not in found]
+    
+    def search_live(self, query: str) -> List[Tuple[str, str]]:
+        """Query the site's own search page"""
         url = f"{self.base_url}/?s={query.replace(' ', '+')}"
         soup = Utils.get_soup_fast(url, timeout=10)
         
@@ -656,9 +2382,20 @@ class Scraper:
     def get_episodes(self, series_url: str) -> List[Tuple[str, str]]:
         """Get ALL episodes with caching"""
         # Check memory cache first
+        if series_url in self.episode_cache:
+            return self.episode_cache[series_url]
+        return self.flight.do(series_url, lambda: self.fetch_episodes(series_url))
+    
+    def fetch_episodes(self, series_url: str) -> List[Tuple[str, str]]:
+        """Fetch and parse the episode list (once per series at a time)"""
         if series_url in self.episode_cache:
             return self.episode_cache[series_url]
         
+        remote = DaemonClient.call("episodes", source=self.key, url=series_url)
+        if remote:
+            self.episode_cache[series_url] = [tuple(item) for item in remote]
+            return self.episode_cache[series_url]
+        
         soup = Utils.get_soup_fast(series_url, timeout=12)
         episodes = []
         seen_urls = set()
@@ -674,7 +2411,7 @@ class Scraper:
                 if normalized in seen_urls:
                     continue
                 seen_urls.add(normalized)
-                title = a.get_text(strip=True)
+                title = self.episode_title(a)
 
                 # Fast episode detection
                 title_lower = title.lower()
@@ -700,6 +2437,337 @@ class Scraper:
         self.episode_cache[series_url] = episodes
         
         return episodes
+    
+    @staticmethod
+    def episode_title(a) -> str:
+        """"Episode 12 - Title" from the list's number/title spans, else the link text"""
+        item = a.find_parent("li") or a
+        num_el = item.find(class_="epl-num") or item.find("span", class_="num")
+        title_el = item.find(class_="epl-title") or item.find("span", class_="title")
+        num = num_el.get_text(strip=True) if num_el else ""
+        title = title_el.get_text(strip=True) if title_el else ""
+        if not num:
+            return title or a.get_text(strip=True)
+        return f"Episode {num} - {title}" if title else f"Episode {num}"
+
+# ============================================================================
+# LOCAL CATALOG (FUZZY SEARCH)
+# ============================================================================
+class Catalog:
+    """Every series of every realm on disk, searched with a trigram index"""
+    
+    MAX_PAGES = 100       # Paged crawl limit when list-mode is unavailable
+    MIN_SCORE = 0.45
+    PREFIX_SCORE = 0.9    # Exact (1.0) and prefix/word-prefix hits score at least this
+    MAX_RESULTS = 15
+    
+    _data = None
+    _index = None         # (entries, {trigram: {entry indexes}})
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def normalize(title: str) -> str:
+        """Lowercase words only"""
+        return re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', ' ', title.lower())).strip()
+    
+    @classmethod
+    def aliases(cls, title: str) -> List[str]:
+        """Searchable forms of a title: full, without brackets, and its acronym (btth)"""
+        full = cls.normalize(title)
+        bare = cls.normalize(re.sub(r'[\(\[].*?[\)\]]', ' ', title))
+        acronym = "".join(word[0] for word in bare.split())
+        return list(dict.fromkeys(a for a in (full, bare, acronym) if a))
+    
+    @staticmethod
+    def trigrams(text: str) -> set:
+        padded = f"  {text} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+    
+    @classmethod
+    def load(cls) -> Dict[str, Any]:
+        if cls._data is None:
+            try:
+                with open(Config.CATALOG_FILE, 'r') as f:
+                    cls._data = json.load(f)
+            except:
+                cls._data = {}
+        return cls._data
+    
+    @classmethod
+    def save(cls):
+        try:
+            Utils.atomic_write_json(Config.CATALOG_FILE, cls._data)
+        except:
+            pass
+    
+    @classmethod
+    def is_stale(cls, source: str) -> bool:
+        updated = cls.load().get(source, {}).get("updated", 0)
+        return time.time() - updated > Config.CATALOG_MAX_AGE
+    
+    @classmethod
+    def _parse_series(cls, soup, selector: str) -> List[Tuple[str, str, List[str]]]:
+        """(title, url, alt titles) for every series link on a page"""
+        found = []
+        for a in soup.select(selector):
+            href = a.get("href") if a.name == "a" else None
+            if not href:
+                a = a.select_one("a[href]")
+                href = a.get("href") if a else None
+            if not href or "/anime/" not in href or "?" in href:
+                continue
+            text = a.get_text(" ", strip=True)
+            title = a.get("title") or text
+            alts = [text] if text and text != title else []
+            found.append((title, href, alts))
+        return found
+    
+    @classmethod
+    def crawl(cls, source: str) -> int:
+        """Fetch the realm's full series list and merge it in; returns series added"""
+        base_url = Config.SOURCES[source]["base_url"]
+        series = cls._parse_series(Utils.get_soup_fast(f"{base_url}/anime/list-mode/", timeout=20),
+                                   ".soralist a.series, .soralist li a")
+        if not series:
+            # Theme without list-mode: walk the title-ordered archive
+            seen = set()
+            for page in range(1, cls.MAX_PAGES + 1):
+                soup = Utils.get_soup_fast(f"{base_url}/anime/?page={page}&order=title", timeout=12)
+                batch = [s for s in cls._parse_series(soup, Config.SOURCES[source]["search_selector"])
+                         if s[1] not in seen]
+                if not batch:
+                    break
+                seen.update(s[1] for s in batch)
+                series += batch
+        
+        with cls._lock:
+            realm = cls.load().setdefault(source, {"updated": 0, "series": []})
+            known = {entry[1]: entry for entry in realm["series"]}
+            added = 0
+            for title, url, alts in series:
+                if url in known:
+                    known[url][2] = list(dict.fromkeys(known[url][2] + alts))
+                else:
+                    known[url] = [title, url, alts]
+                    added += 1
+            realm["series"] = list(known.values())
+            if series:
+                realm["updated"] = time.time()
+            cls._index = None
+            cls.save()
+        return added
+    
+    @classmethod
+    def _build_index(cls):
+        entries, index = [], {}
+        for source, realm in cls.load().items():
+            for title, url, alts in realm.get("series", []):
+                keys = list(dict.fromkeys(a for t in [title] + alts for a in cls.aliases(t)))
+                entries.append((source, title, url, keys))
+                for key in keys:
+                    for gram in cls.trigrams(key):
+                        index.setdefault(gram, set()).add(len(entries) - 1)
+        cls._index = (entries, index)
+    
+    @classmethod
+    def search(cls, query: str, source: Optional[str] = None) -> List[Tuple[str, str]]:
+        """Typo-tolerant title search - prefix, acronym and trigram similarity"""
+        return [(title, url) for _, title, url in cls.scored(query, source)]
+    
+    @classmethod
+    def scored(cls, query: str, source: Optional[str] = None) -> List[Tuple[float, str, str]]:
+        """search() with each hit's score, best first"""
+        query = cls.normalize(query)
+        if not query:
+            return []
+        with cls._lock:
+            if cls._index is None:
+                cls._build_index()
+            entries, index = cls._index
+        
+        query_grams = cls.trigrams(query)
+        candidates = set()
+        for gram in query_grams:
+            candidates |= index.get(gram, set())
+        
+        scored = []
+        for i in candidates:
+            entry_source, title, url, keys = entries[i]
+            if source and entry_source != source:
+                continue
+            best = 0.0
+            for key in keys:
+                if key == query:
+                    score = 1.0
+                elif key.startswith(query) or f" {query}" in f" {key}":
+                    score = cls.PREFIX_SCORE
+                else:
+                    grams = cls.trigrams(key)
+                    shared = len(query_grams & grams)
+                    # Mostly "how much of the query matched", a little overall similarity
+                    score = 0.7 * shared / len(query_grams) + 0.3 * shared / len(query_grams | grams)
+                best = max(best, score)
+            if best >= cls.MIN_SCORE:
+                scored.append((best, title, url))
+        
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return scored[:cls.MAX_RESULTS]
+
+# ============================================================================
+# MIRROR RACING
+# ============================================================================
+class MirrorRacer:
+    """Resolves an episode on both realms at once - the loser stays as hot fallback"""
+    
+    mirrors: Dict[str, str] = {}   # episode URL -> same episode on the other realm
+    MATCH_THRESHOLD = 0.75
+    RACE_TIMEOUT = 45
+    
+    @staticmethod
+    def normalize_title(title: str) -> str:
+        """Reduce a series title to comparable words"""
+        title = title.lower()
+        title = re.sub(r'[\(\[].*?[\)\]]', ' ', title)
+        title = re.sub(r'\b(?:episode|ep)\s*\d+.*$', ' ', title)
+        title = re.sub(r'\b(?:sub(?:bed)?|indo|english|donghua)\b', ' ', title)
+        title = re.sub(r'[^\w\s]', ' ', title)
+        return re.sub(r'\s+', ' ', title).strip()
+    
+    @classmethod
+    def find_mirror_series(cls, title: str, series_url: str) -> Optional[str]:
+        """Find the same series on the other realm by title"""
+        from difflib import SequenceMatcher
+        
+        other = "ax" if Scraper.source_for_url(series_url) == "ld" else "ld"
+        wanted = cls.normalize_title(title)
+        if not wanted:
+            return None
+        
+        best_url, best_score = None, 0.0
+        for candidate_title, candidate_url in Scraper(other).search(wanted):
+            score = SequenceMatcher(None, wanted, cls.normalize_title(candidate_title)).ratio()
+            if score > best_score:
+                best_url, best_score = candidate_url, score
+        return best_url if best_score >= cls.MATCH_THRESHOLD else None
+    
+    @classmethod
+    def link_series(cls, title: str, series_url: str, episodes: List[Tuple[str, str]]) -> int:
+        """Pair every episode with its counterpart on the other realm by number"""
+        try:
+            mirror_url = cls.find_mirror_series(title, series_url)
+            if not mirror_url:
+                return 0
+            
+            mirror_source = Scraper.source_for_url(mirror_url)
+            by_number = {}
+            for ep_title, ep_url in Scraper(mirror_source).get_episodes(mirror_url):
+                by_number.setdefault(Utils.extract_episode_number(ep_title, ep_url), ep_url)
+        except:
+            return 0
+        
+        linked = 0
+        for ep_title, ep_url in episodes:
+            num = Utils.extract_episode_number(ep_title, ep_url)
+            if num != 999999 and num in by_number:
+                cls.mirrors[ep_url] = by_number[num]
+                linked += 1
+        return linked
+    
+    @staticmethod
+    def media_target(entry: Dict[str, Any]) -> Optional[str]:
+        """Manifest or file URL an entry resolved to (None for embed pages only yt-dlp can open)"""
+        variant = VariantSelector.pick(entry["variants"], "auto")
+        if variant:
+            return variant["url"]
+        if entry["url"].split("?")[0].endswith((".m3u8", ".mp4", ".mkv")):
+            return entry["url"]
+        return None
+    
+    @staticmethod
+    def probe_latency(entry: Dict[str, Any], referer: str) -> Optional[float]:
+        """Time to the first media byte, or None unless the entry serves verified media"""
+        target = MirrorRacer.media_target(entry)
+        if not target:
+            return None
+        start = time.monotonic()
+        try:
+            with HttpClient.get(target, headers={**Config.HEADERS, "Referer": referer},
+                                timeout=5, stream=True) as resp:
+                if resp.status_code >= 400:
+                    return None
+                head = next(HttpClient.iter_body(resp, 1024), b"") or b""
+                if not Player.is_media(head, resp.headers.get("Content-Type", "")):
+                    return None
+            return time.monotonic() - start
+        except:
+            return None
+    
+    @classmethod
+    def resolve(cls, episode_url: str, cache: FastStreamCache) -> Dict[str, Any]:
+        """Extract an episode (racing its mirror if one is known) and cache the result"""
+        mirror_url = cls.mirrors.get(episode_url)
+        if mirror_url:
+            # Don't race a realm whose circuit is open - go straight to the live one
+            if not SourceHealth.allow(SourceHealth.host(episode_url)):
+                entry = StreamExtractor.extract_stream(mirror_url)
+                if entry["url"] != mirror_url:
+                    cache.put(episode_url, entry["url"], entry["variants"], entry.get("fallbacks"))
+                return entry
+            if SourceHealth.allow(SourceHealth.host(mirror_url)):
+                return cls.race(episode_url, mirror_url, cache)
+        
+        entry = StreamExtractor.extract_stream(episode_url)
+        if entry["url"] != episode_url:
+            cache.put(episode_url, entry["url"], entry["variants"], entry.get("fallbacks"))
+        return entry
+    
+    @classmethod
+    def race(cls, episode_url: str, mirror_url: str, cache: FastStreamCache) -> Dict[str, Any]:
+        """Extract both mirrors concurrently and return whichever answers first"""
+        results = queue.Queue()
+        
+        def attempt(url):
+            try:
+                entry = StreamExtractor.extract_stream(url)
+                # Embed pages can't be probed - those still count, mpv hands them to yt-dlp
+                if entry["url"] != url and (not cls.media_target(entry)
+                                            or cls.probe_latency(entry, url) is not None):
+                    results.put(entry)
+                    return
+            except:
+                pass
+            results.put(None)
+        
+        for url in (episode_url, mirror_url):
+            threading.Thread(target=ExtractionScheduler.bind(attempt), args=(url,), daemon=True).start()
+        
+        pending = 2
+        winner = None
+        while winner is None and pending:
+            try:
+                winner = results.get(timeout=cls.RACE_TIMEOUT)
+            except queue.Empty:
+                break
+            pending -= 1
+        
+        if winner is None:
+            return {"url": episode_url, "variants": [], "fallbacks": []}
+        
+        fallbacks = winner.get("fallbacks", [])
+        cache.put(episode_url, winner["url"], winner["variants"], fallbacks)
+        
+        if pending:
+            def keep_loser():
+                try:
+                    loser = results.get(timeout=cls.RACE_TIMEOUT)
+                except queue.Empty:
+                    return
+                if loser:
+                    mirrors = [{k: v for k, v in loser.items() if k != "fallbacks"}] + loser.get("fallbacks", [])
+                    cache.put(episode_url, winner["url"], winner["variants"], fallbacks + mirrors)
+            threading.Thread(target=ExtractionScheduler.bind(keep_loser), daemon=True).start()
+        
+        return {**winner, "fallbacks": fallbacks}
 
 # ============================================================================
 # LIGHTNING-FAST PLAYER
@@ -707,25 +2775,63 @@ class Scraper:
 class Player:
     """Ultra-fast MPV playback with instant starts"""
     
+    FAILOVER_WINDOW = 8  # An mpv exit this soon after launch means the stream never played
+    
     def __init__(self, quality: str = Config.DEFAULT_QUALITY):
         self.quality = quality
         self.current_process = None
-        self.preloader = InstantPreloader()
+        self.preloader = StreamExtractor.get_preloader()
+        self.generation = 0
+        self.launched = 0.0           # When current_process was spawned
+        self.lock = threading.Lock()  # Guards generation/current_process across the watcher threads
+        self.failover_pending = threading.Event()
     
-    def play(self, url: str, episodes: List[Tuple[str, str]] = None, 
-             current_idx: int = 0, log_file: Optional[str] = None) -> bool:
-        """Start MPV INSTANTLY with preloaded streams"""
-        
-        # Get stream URL from preloader cache (INSTANT if cached)
-        stream_url = self.preloader.get_stream(url)
-        
-        # Preload next episodes in background
-        if episodes and current_idx < len(episodes) - 1:
-            self.preloader.preload_episodes(episodes, current_idx)
+    def direct_target(self, entry: Dict[str, Any]) -> Optional[str]:
+        """Media URL mpv will open directly, or None when it goes through yt-dlp"""
+        variant = VariantSelector.pick(entry["variants"], self.quality)
+        if variant:
+            return variant["url"]
+        if entry["url"].split("?")[0].endswith((".m3u8", ".mp4", ".mkv")):
+            return entry["url"]
+        return None
+    
+    @staticmethod
+    def probe_media(target: str, referer: str) -> Optional[bool]:
+        """Do the first bytes look like media? None when the probe itself failed"""
+        try:
+            with HttpClient.get(target, headers={**Config.HEADERS, "Referer": referer},
+                                timeout=4, stream=True) as resp:
+                if resp.status_code >= 400:
+                    return False
+                head = next(HttpClient.iter_body(resp, 1024), b"") or b""
+                return Player.is_media(head, resp.headers.get("Content-Type", ""))
+        except:
+            return None
+    
+    @staticmethod
+    def is_media(head: bytes, content_type: str) -> bool:
+        """Magic bytes or content type of a media response (HTML error pages fail)"""
+        content_type = content_type.lower()
+        if head.lstrip().startswith(b"#EXTM3U"):   # HLS playlist
+            return True
+        if head[4:8] == b"ftyp" or head[:1] == b"\x47" or head[:4] == b"\x1a\x45\xdf\xa3":
+            return True                             # MP4, MPEG-TS, Matroska/WebM
+        return content_type.startswith(("video/", "audio/")) or "mpegurl" in content_type
+    
+    def build_command(self, entry: Dict[str, Any], log_file: Optional[str] = None,
+                      referer: Optional[str] = None) -> List[str]:
+        """Build the mpv command line for one stream entry (referer: the episode page it came from)"""
+        target = self.direct_target(entry)
         
-        # Build MPV command
-        cmd = ["mpv", stream_url]
-        cmd.append(f"--ytdl-format=bestvideo[height<={self.quality}]+bestaudio/best[height<={self.quality}]/best")
+        # Exact variants skip mpv's yt-dlp hook entirely - so send the headers the hook would have
+        if target:
+            cmd = ["mpv", target, "--no-ytdl", f"--user-agent={Config.HEADERS['User-Agent']}"]
+            if referer:
+                cmd.append(f"--referrer={referer}")
+        else:
+            cmd = ["mpv", entry["url"]]
+            height = NetworkMonitor.resolve_quality(self.quality)
+            cmd.append(f"--ytdl-format=bestvideo[height<={height}]+bestaudio/best[height<={height}]/best")
         cmd.append("--cache=yes")
         cmd.append("--cache-secs=60")  # Larger cache for smoother playback
         cmd.append("--no-terminal")
@@ -737,31 +2843,48 @@ class Player:
         
         if log_file:
             cmd.append(f"--log-file={log_file}")
+        return cmd
+    
+    def launch(self, cmd: List[str]) -> subprocess.Popen:
+        """Spawn mpv detached from the terminal"""
+        if os.name == 'nt':
+            # Windows: hide console window
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            return subprocess.Popen(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+                startupinfo=startupinfo
+            )
+        # Linux/Mac
+        return subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    
+    def play(self, url: str, episodes: List[Tuple[str, str]] = None, 
+             current_idx: int = 0, log_file: Optional[str] = None) -> bool:
+        """Start MPV INSTANTLY with preloaded streams"""
+        
+        # Get stream entry from preloader cache (INSTANT if cached)
+        from_cache = self.preloader.cache.get_entry(url) is not None
+        entry = self.preloader.get_entry(url)
+        
+        # Preload next episodes in background
+        if episodes and current_idx < len(episodes) - 1:
+            self.preloader.preload_episodes(episodes, current_idx)
         
         try:
-            # Start MPV
-            if os.name == 'nt':
-                # Windows: hide console window
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                self.current_process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    start_new_session=True,
-                    startupinfo=startupinfo
-                )
-            else:
-                # Linux/Mac
-                self.current_process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    start_new_session=True
-                )
-            
+            process = self.launch(self.build_command(entry, log_file, referer=url))
+            with self.lock:
+                self.current_process = process
+                self.launched = time.monotonic()
+                generation = self.generation
             print(WuxiaTheme.status_indicator("success", "Player launched instantly!"))
-            return True
         except FileNotFoundError:
             print(WuxiaTheme.status_indicator("error", "MPV not found on your system"))
             print()
@@ -778,29 +2901,246 @@ class Player:
                     "gold"
                 ))
             return False
+        
+        # Watch for an early mpv failure and fail over to the mirror
+        self.failover_pending.set()
+        threading.Thread(
+            target=self.failover_watch,
+            args=(url, generation, log_file),
+            daemon=True
+        ).start()
+        
+        # Check the stream is real media while mpv starts up
+        threading.Thread(
+            target=self.preflight,
+            args=(url, entry, generation, log_file, from_cache),
+            daemon=True
+        ).start()
+        return True
+    
+    def preflight(self, url: str, entry: Dict[str, Any], generation: int,
+                  log_file: Optional[str], from_cache: bool):
+        """Swap to a live mirror (or a fresh extraction) if the launched stream isn't media"""
+        target = self.direct_target(entry)
+        if target is None or self.probe_media(target, url) is not False:
+            return
+        
+        # Probe every fallback at once and take the best-ranked one that answers with media
+        replacement = None
+        candidates = [f for f in entry.get("fallbacks", []) if self.direct_target(f)]
+        if candidates:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(4, len(candidates))) as pool:
+                verdicts = list(pool.map(lambda f: self.probe_media(self.direct_target(f), url), candidates))
+            replacement = next((f for f, ok in zip(candidates, verdicts) if ok), None)
+        
+        # A cached manifest may simply have expired - extract again
+        if replacement is None and from_cache and generation == self.generation:
+            self.preloader.cache.remove(url)
+            fresh = self.preloader.get_entry(url)
+            if fresh["url"] != url:
+                replacement = fresh
+        
+        if replacement is None:
+            return
+        with self.lock:
+            if generation != self.generation:
+                return
+            # A new generation retires the watcher of the mpv we are about to replace
+            self.generation += 1
+            generation = self.generation
+        print(f"\n{WuxiaTheme.status_indicator('warning', 'Stream is not playable - switching to a live mirror')}")
+        if not self.relaunch(generation, replacement, log_file, url):
+            return
+        self.failover_pending.set()
+        threading.Thread(
+            target=self.failover_watch,
+            args=(url, generation, log_file),
+            daemon=True
+        ).start()
+    
+    def relaunch(self, generation: int, entry: Dict[str, Any], log_file: Optional[str],
+                 referer: Optional[str] = None) -> bool:
+        """Swap mpv onto another stream - False (and nothing left running) if stop()/play() moved on"""
+        process = self.launch(self.build_command(entry, log_file, referer=referer))
+        with self.lock:
+            # Checked again after spawning: a stop() during launch must not leave this mpv orphaned
+            stale = generation != self.generation
+            retired = process if stale else self.current_process
+            if not stale:
+                self.current_process = process
+                self.launched = time.monotonic()
+        if retired:
+            self.terminate(retired)
+        return not stale
+    
+    def failover_watch(self, url: str, generation: int, log_file: Optional[str]):
+        """Relaunch mpv on the next fallback if the stream dies right away"""
+        tried = set()
+        try:
+            while True:
+                with self.lock:
+                    if generation != self.generation:
+                        return
+                    process, launched = self.current_process, self.launched
+                code = process.wait()
+                if code == 0 or generation != self.generation:
+                    return
+                if time.monotonic() - launched > self.FAILOVER_WINDOW:
+                    return
+                
+                # The losing mirror may have finished after playback started
+                entry = self.preloader.cache.get_entry(url) or {}
+                fallbacks = [f for f in entry.get("fallbacks", []) if f["url"] not in tried]
+                if not fallbacks:
+                    return
+                tried.add(fallbacks[0]["url"])
+                print(f"\n{WuxiaTheme.status_indicator('warning', 'Stream failed - switching to next mirror')}")
+                if not self.relaunch(generation, fallbacks[0], log_file, url):
+                    return
+        except:
+            pass
+        finally:
+            if generation == self.generation:
+                self.failover_pending.clear()
     
     def stop(self):
         """Stop playback and preloading"""
+        with self.lock:
+            self.generation += 1
+        self.failover_pending.clear()
         self.preloader.stop()
-        if self.current_process and self.current_process.poll() is None:
+        self.terminate()
+    
+    def terminate(self, process=None):
+        """Close the current mpv window (or the given process)"""
+        process = process or self.current_process
+        if process and process.poll() is None:
             try:
                 if os.name == 'nt':
-                    self.current_process.terminate()
+                    process.terminate()
                     time.sleep(0.3)
-                    if self.current_process.poll() is None:
-                        self.current_process.kill()
+                    if process.poll() is None:
+                        process.kill()
                 else:
-                    self.current_process.terminate()
+                    process.terminate()
                     time.sleep(0.3)
-                    if self.current_process.poll() is None:
-                        self.current_process.kill()
-                self.current_process.wait(timeout=2)
+                    if process.poll() is None:
+                        process.kill()
+                process.wait(timeout=2)
             except:
                 pass
     
     def is_playing(self) -> bool:
-        """Check if MPV is still running"""
-        return self.current_process and self.current_process.poll() is None
+        """Check if MPV is still running (or being relaunched on a mirror)"""
+        if self.current_process and self.current_process.poll() is None:
+            return True
+        return self.failover_pending.is_set()
+
+# ============================================================================
+# PLAYER BACKENDS (HAND A RESOLVED URL TO AN EXTERNAL PLAYER)
+# ============================================================================
+class PlayerBackend:
+    """Opens one resolved stream URL in the platform's player (Termux client, --serve users)"""
+    
+    name = "generic"
+    
+    @staticmethod
+    def platform() -> str:
+        """'android' (Termux), 'ish' (iOS iSH) or 'linux' (anything else, ani-cli style)"""
+        import platform
+        uname = platform.uname()
+        system_info = f"{uname.system} {uname.release}".lower()
+        if "android" in system_info or os.path.exists("/data/data/com.termux"):
+            return "android"
+        if "ish" in system_info or os.path.exists("/proc/ish"):
+            return "ish"
+        return "linux"
+    
+    @staticmethod
+    def for_platform(platform: Optional[str] = None) -> "PlayerBackend":
+        """Backend instance for a platform (detected when not given)"""
+        backends = {"android": AndroidIntentBackend, "ish": IshVlcBackend, "linux": MpvBackend}
+        return backends.get(platform or PlayerBackend.platform(), MpvBackend)()
+    
+    def launch(self, video_url: str, title: str = "Donghua", referer: Optional[str] = None) -> bool:
+        raise NotImplementedError
+
+class AndroidIntentBackend(PlayerBackend):
+    """Android intents: mpv, VLC, MX Player, then any video app"""
+    
+    name = "android"
+    
+    def launch(self, video_url: str, title: str = "Donghua", referer: Optional[str] = None) -> bool:
+        print(WuxiaTheme.status_indicator("loading", "Launching Android Player..."))
+        sanitized_url = video_url.replace(" ", "%20")
+        players = [
+            # MPV for Android (ani-cli default)
+            f"am start --user 0 -a android.intent.action.VIEW -d '{sanitized_url}' -n is.xyz.mpv/.MPVActivity",
+            # VLC for Android (with title extra)
+            f"am start --user 0 -a android.intent.action.VIEW -d '{sanitized_url}' -n org.videolan.vlc/org.videolan.vlc.gui.video.VideoPlayerActivity -e 'title' '{title}'",
+            # MX Player
+            f"am start --user 0 -a android.intent.action.VIEW -d '{sanitized_url}' -n com.mxtech.videoplayer.ad/com.mxtech.videoplayer.ActivityScreen -e 'title' '{title}'",
+            # MX Player Pro
+            f"am start --user 0 -a android.intent.action.VIEW -d '{sanitized_url}' -n com.mxtech.videoplayer.pro/com.mxtech.videoplayer.ActivityScreen -e 'title' '{title}'",
+            # Generic intent (fallback)
+            f"am start --user 0 -a android.intent.action.VIEW -d '{sanitized_url}' -t 'video/*'",
+        ]
+        for cmd in players:
+            result = subprocess.run(cmd, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if result.returncode == 0:
+                print(WuxiaTheme.status_indicator("success", "Player launched!"))
+                return True
+        
+        # Ultimate fallback: termux-open-url
+        print(WuxiaTheme.status_indicator("info", "Trying termux-open-url..."))
+        subprocess.run(f"termux-open-url '{sanitized_url}'", shell=True)
+        return True
+
+class IshVlcBackend(PlayerBackend):
+    """iOS iSH: a tappable vlc:// hyperlink"""
+    
+    name = "ish"
+    
+    def launch(self, video_url: str, title: str = "Donghua", referer: Optional[str] = None) -> bool:
+        sanitized_url = video_url.replace(" ", "%20")
+        print(WuxiaTheme.status_indicator("info", "iOS Detected - Tap the link below:"))
+        print(f"\033]8;;vlc://{sanitized_url}\a")
+        print(f"{WuxiaTheme.JADE}~~~~~~~~~~~~~~~~~~~~{WuxiaTheme.RESET}")
+        print(f"{WuxiaTheme.GOLD}~ Tap to open VLC ~{WuxiaTheme.RESET}")
+        print(f"{WuxiaTheme.JADE}~~~~~~~~~~~~~~~~~~~~{WuxiaTheme.RESET}")
+        print(f"\033]8;;\a")
+        time.sleep(3)
+        return True
+
+class MpvBackend(PlayerBackend):
+    """Desktop Linux: mpv, else VLC"""
+    
+    name = "mpv"
+    
+    def launch(self, video_url: str, title: str = "Donghua", referer: Optional[str] = None) -> bool:
+        print(WuxiaTheme.status_indicator("loading", "Launching Desktop Player..."))
+        try:
+            cmd = ["mpv", f"--force-media-title={title}", video_url]
+            if referer:
+                cmd += [f"--referrer={referer}", f"--user-agent={Config.HEADERS['User-Agent']}"]
+            subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            print(WuxiaTheme.status_indicator("success", "MPV launched!"))
+            return True
+        except FileNotFoundError:
+            pass
+        
+        try:
+            cmd = ["vlc", video_url, "--play-and-exit", f"--meta-title={title}"]
+            if referer:
+                cmd.append(f"--http-referrer={referer}")
+            subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            print(WuxiaTheme.status_indicator("success", "VLC launched!"))
+            return True
+        except FileNotFoundError:
+            print(WuxiaTheme.status_indicator("error", "No player found! Install mpv or vlc"))
+            print(f"{WuxiaTheme.SILVER}  Stream URL: {video_url}{WuxiaTheme.RESET}")
+            return False
 
 # ============================================================================
 # DOWNLOADER (OPTIMIZED)
@@ -812,47 +3152,434 @@ class Downloader:
     def download_episode(url: str, series_title: str, ep_title: str, quality: str) -> bool:
         """Download an episode using yt-dlp"""
         # Get pre-extracted stream for faster download
-        stream_url = StreamExtractor.preloader.get_stream(url)
+        stream_url = StreamExtractor.get_preloader().get_stream(url)
         
         # Create directory
         series_dir = os.path.join(Config.DOWNLOAD_DIR, Utils.sanitize_filename(series_title))
         os.makedirs(series_dir, exist_ok=True)
         
+        quality = NetworkMonitor.resolve_quality(quality)
+        
         # Build filename
         filename = f"{Utils.sanitize_filename(ep_title)}.%(ext)s"
         output_path = os.path.join(series_dir, filename)
         
         # Download with yt-dlp (optimized flags)
-        cmd = [
-            "yt-dlp",
-            "-f", f"bestvideo[height<={quality}]+bestaudio/best[height<={quality}]/best",
-            "-o", output_path,
-            "--no-check-certificates",
-            "--no-part",
-            "--concurrent-fragments", "4",  # Parallel downloads
-            stream_url
-        ]
+        fmt = f"bestvideo[height<={quality}]+bestaudio/best[height<={quality}]/best"
+        print(WuxiaTheme.status_indicator("loading", "Starting fast download..."))
         
-        try:
-            print(WuxiaTheme.status_indicator("loading", "Starting fast download..."))
-
-            if os.name == 'nt':
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                result = subprocess.run(cmd, check=True, capture_output=True,
-                                      text=True, startupinfo=startupinfo)
-            else:
-                result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-
+        if YtdlpWorker.download(stream_url, output_path, fmt):
             print(WuxiaTheme.status_indicator("success", "Download complete!"))
             return True
-        except subprocess.CalledProcessError as e:
-            print(WuxiaTheme.status_indicator("error", "Download failed"))
+        print(WuxiaTheme.status_indicator("error", "Download failed"))
+        return False
+
+# ============================================================================
+# DAEMON (SHARED WARM STATE)
+# ============================================================================
+class DaemonClient:
+    """Thin client - routes lookups to a running `dhua --daemon` when there is one"""
+    
+    TIMEOUT = 60       # Resolutions can race two mirrors
+    disabled = False   # Set inside the daemon itself and by --no-daemon
+    _available = None
+    
+    @classmethod
+    def available(cls) -> bool:
+        """Is a daemon listening? (checked once per process)"""
+        if cls.disabled or not hasattr(__import__("socket"), "AF_UNIX"):
             return False
+        if cls._available is None:
+            try:
+                cls._available = (os.path.exists(Config.DAEMON_SOCKET) and
+                                  cls.request({"op": "ping"}, timeout=1) == "pong")
+            except (OSError, ValueError, RuntimeError):
+                cls._available = False
+        return cls._available
+    
+    @staticmethod
+    def request(payload: Dict[str, Any], timeout: float) -> Any:
+        """Send one JSON line and read one JSON line back"""
+        import socket
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(Config.DAEMON_SOCKET)
+            sock.sendall((json.dumps(payload) + "\n").encode())
+            with sock.makefile("rb") as f:
+                line = f.readline()
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "daemon error"))
+        return response["result"]
+    
+    @classmethod
+    def call(cls, op: str, **params) -> Optional[Any]:
+        """Daemon's answer, or None when there is no daemon (caller works locally)"""
+        if not cls.available():
+            return None
+        try:
+            return cls.request({"op": op, **params}, cls.TIMEOUT)
+        except OSError:
+            cls._available = False  # Daemon went away - stop trying
+            return None
+        except (ValueError, RuntimeError):
+            return None
+
+class DaemonServer:
+    """Holds caches, connection pools and preload workers for every dhua invocation"""
+    
+    SEARCH_TTL = 600  # Seconds a search result is answered from memory
+    
+    def __init__(self):
+        self.scrapers = {key: Scraper(key) for key in Config.SOURCES}
+        self.preloader = StreamExtractor.get_preloader()
+        self.search_memo: Dict[Tuple[str, str], Tuple[float, List[Tuple[str, str]]]] = {}
+        self.flight = SingleFlight()
+    
+    def search(self, source: str, query: str) -> List[Tuple[str, str]]:
+        """Search one realm, answered from memory for SEARCH_TTL seconds"""
+        key = (source, query.strip().lower())
+        memo = self.search_memo.get(key)
+        if memo and time.time() - memo[0] < self.SEARCH_TTL:
+            return memo[1]
+        results = self.scrapers[source].search(query)
+        if results:
+            self.search_memo[key] = (time.time(), results)
+        return results
+    
+    def handle(self, request: Dict[str, Any]) -> Any:
+        """Answer one request (runs on a per-connection thread)"""
+        op = request.get("op")
+        if op == "ping":
+            return "pong"
+        # Identical requests from several clients share one fetch
+        if op == "search":
+            return self.flight.do(("search", request["source"], request["query"].strip().lower()),
+                                  lambda: self.search(request["source"], request["query"]))
+        if op == "episodes":
+            return self.flight.do(("episodes", request["url"]),
+                                  lambda: self.scrapers[request["source"]].get_episodes(request["url"]))
+        # Mirrors are linked in the client - adopt them so the daemon races both realms too
+        if request.get("mirror"):
+            MirrorRacer.mirrors[request["url"]] = request["mirror"]
+        MirrorRacer.mirrors.update(request.get("mirrors") or {})
+        if op == "resolve":
+            return self.flight.do(("resolve", request["url"]),
+                                  lambda: self.preloader.get_entry(request["url"]))
+        if op == "preload":
+            self.preloader.preload_episodes([tuple(ep) for ep in request["episodes"]], 0,
+                                            owner=request.get("client", "anonymous"))
+            return True
+        raise ValueError(f"Unknown op: {op}")
+    
+    def serve(self):
+        """Listen on the Unix socket until interrupted"""
+        import socketserver
+        
+        DaemonClient.disabled = True  # Never forward to ourselves
+        
+        # Refuse to start twice; clear a stale socket left by a crash
+        if os.path.exists(Config.DAEMON_SOCKET):
+            try:
+                DaemonClient.request({"op": "ping"}, timeout=1)
+                raise RuntimeError(f"A daemon is already listening on {Config.DAEMON_SOCKET}")
+            except (OSError, ValueError):
+                os.unlink(Config.DAEMON_SOCKET)
+        
+        daemon = self
+        
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    try:
+                        response = {"ok": True, "result": daemon.handle(json.loads(line))}
+                    except Exception as e:
+                        response = {"ok": False, "error": str(e)}
+                    self.wfile.write((json.dumps(response) + "\n").encode())
+        
+        os.makedirs(Config.CACHE_DIR, exist_ok=True)
+        server = socketserver.ThreadingUnixStreamServer(Config.DAEMON_SOCKET, Handler)
+        server.daemon_threads = True
+        os.chmod(Config.DAEMON_SOCKET, 0o600)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self.preloader.stop()
+            SourceHealth.save()
+            PrefetchPolicy.save()
+            NetworkMonitor.save()
+            try:
+                os.unlink(Config.DAEMON_SOCKET)
+            except OSError:
+                pass
+
+# ============================================================================
+# HTTP API (ONE EXTRACTOR FOR THE WHOLE HOUSEHOLD)
+# ============================================================================
+class ApiServer:
+    """Serves search, episode lists and resolved streams to Kodi/VLC/mpv over HTTP"""
+    
+    DEFAULT_HOST = "127.0.0.1"
+    DEFAULT_PORT = 8787
+    
+    def __init__(self, quality: str = Config.DEFAULT_QUALITY):
+        self.backend = DaemonServer()
+        self.quality = quality
+    
+    @staticmethod
+    def item_id(url: str) -> str:
+        """Stable id for a series or episode URL: '<realm>:<quoted URL below the realm's base>'"""
+        from urllib.parse import quote
+        source = Scraper.source_for_url(url)
+        base = Config.SOURCES[source]["base_url"] + "/"
+        # Query and trailing slash are kept, so url_for gives back the exact cached URL
+        rest = url[len(base):] if url.startswith(base) else url
+        return f"{source}:{quote(rest, safe='')}"
+    
+    @staticmethod
+    def url_for(item_id: str) -> Tuple[str, str]:
+        """(realm, URL) for an id produced by item_id - the stored URL as-is"""
+        from urllib.parse import unquote
+        source, _, rest = item_id.partition(":")
+        if source not in Config.SOURCES or not rest:
+            raise KeyError(item_id)
+        rest = unquote(rest)
+        return source, rest if rest.startswith(("http://", "https://")) else f"{Config.SOURCES[source]['base_url']}/{rest}"
+    
+    def search(self, query: str, source: str = "both") -> List[Dict[str, str]]:
+        """Search one realm or all of them (healthiest first, open circuits skipped)"""
+        sources = [source] if source in Config.SOURCES else Scraper.sources_by_health()
+        results = []
+        for key in sources:
+            try:
+                found = self.backend.handle({"op": "search", "source": key, "query": query})
+            except SourceUnavailable:
+                continue
+            for title, url in found:
+                item_id = self.item_id(url)
+                results.append({"id": item_id, "title": title, "source": key, "url": url,
+                                "episodes": f"/series/{item_id}/episodes"})
+        return results
+    
+    def episodes(self, series_id: str) -> List[Dict[str, str]]:
+        """Episode list of one series"""
+        source, url = self.url_for(series_id)
+        episodes = self.backend.handle({"op": "episodes", "source": source, "url": url})
+        results = []
+        for title, episode_url in episodes:
+            item_id = self.item_id(episode_url)
+            results.append({"id": item_id, "title": title, "url": episode_url,
+                            "stream": f"/episodes/{item_id}/stream"})
+        return results
+    
+    def stream(self, episode_id: str, quality: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Resolved stream of one episode (None when extraction failed)"""
+        _, url = self.url_for(episode_id)
+        entry = self.backend.handle({"op": "resolve", "url": url})
+        if not entry or entry["url"] == url:
+            return None
+        variant = VariantSelector.pick(entry["variants"], quality or self.quality)
+        return {"id": episode_id, "url": variant["url"] if variant else entry["url"],
+                "variants": entry["variants"], "fallbacks": entry.get("fallbacks", [])}
+    
+    def playlist(self, series_id: str, origin: str) -> str:
+        """M3U playlist whose entries resolve lazily through /stream?redirect=1"""
+        lines = ["#EXTM3U"]
+        for episode in self.episodes(series_id):
+            lines.append(f"#EXTINF:-1,{episode['title']}")
+            lines.append(f"{origin}{episode['stream']}?redirect=1")
+        return "\n".join(lines) + "\n"
+    
+    def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """Listen until interrupted"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import parse_qs, urlsplit
+        
+        DaemonClient.disabled = True  # The API is the warm process itself
+        api = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+            
+            def send_body(self, status: int, body: str, content_type: str):
+                data = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def send_json(self, status: int, payload: Any):
+                self.send_body(status, json.dumps(payload, ensure_ascii=False), "application/json; charset=utf-8")
+            
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                path = [p for p in parts.path.split("/") if p]
+                try:
+                    if path == ["search"]:
+                        if not params.get("q"):
+                            return self.send_json(400, {"error": "missing q"})
+                        return self.send_json(200, api.search(params["q"], params.get("source", "both")))
+                    if len(path) == 3 and path[0] == "series" and path[2] == "episodes":
+                        return self.send_json(200, api.episodes(path[1]))
+                    if len(path) == 3 and path[0] == "series" and path[2] == "playlist.m3u":
+                        origin = f"http://{self.headers.get('Host') or f'{host}:{port}'}"
+                        return self.send_body(200, api.playlist(path[1], origin), "audio/x-mpegurl; charset=utf-8")
+                    if len(path) == 3 and path[0] == "episodes" and path[2] == "stream":
+                        stream = api.stream(path[1], params.get("quality"))
+                        if not stream:
+                            return self.send_json(502, {"error": "stream extraction failed"})
+                        if params.get("redirect"):
+                            self.send_response(302)
+                            self.send_header("Location", stream["url"])
+                            self.send_header("Content-Length", "0")
+                            self.end_headers()
+                            return
+                        return self.send_json(200, stream)
+                    self.send_json(404, {"error": "not found"})
+                except KeyError:
+                    self.send_json(404, {"error": "unknown id"})
+                except SourceUnavailable as e:
+                    self.send_json(503, {"error": str(e)})
+                except Exception as e:
+                    self.send_json(500, {"error": str(e)})
+        
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self.backend.preloader.stop()
+            SourceHealth.save()
+            PrefetchPolicy.save()
+            NetworkMonitor.save()
 
 # ============================================================================
 # USER INTERFACE (UNCHANGED - KEEPING YOUR GREAT DESIGN)
 # ============================================================================
+class ListView:
+    """Windowed view over a long list - only the rows on screen are ever formatted
+
+    Filtering keeps matching indices (a plain range while unfiltered), so a
+    1000-episode series costs the same per keystroke as a 20-episode one.
+    """
+
+    BOX_ROWS = 5       # Box borders plus the three pagination rows
+    MIN_ROWS = 3       # Fewest list rows worth showing
+    DEFAULT_ROWS = 20  # Page size when stdout is not a terminal
+
+    def __init__(self, items: List[Tuple[str, str]], row, key=None, per_page: int = 0, chrome: int = 0):
+        self.items = items
+        self.row = row                      # row(index, item) -> formatted line
+        self.key = key or (lambda i, item: item[0].lower())  # Text the filter searches
+        self.matches = range(len(items))    # Indices passing the filter, in list order
+        self.query = ""
+        self.top = 0                        # Position in matches of the first visible row
+        self.per_page = per_page or max(self.MIN_ROWS, self.window_rows(chrome))
+
+    @classmethod
+    def window_rows(cls, chrome: int) -> int:
+        """List rows that fit below `chrome` other rows of the frame (one separator every 5 rows)"""
+        try:
+            rows = os.get_terminal_size().lines
+        except OSError:
+            return cls.DEFAULT_ROWS
+        free = rows - chrome - cls.BOX_ROWS - Screen.PROMPT_ROWS
+        return (free * 5 + 1) // 6
+
+    @classmethod
+    def fits(cls, chrome: int) -> bool:
+        """Does a useful window still fit next to this much chrome?"""
+        return cls.window_rows(chrome) >= cls.MIN_ROWS
+
+    @property
+    def pages(self) -> int:
+        return max(1, (len(self.matches) + self.per_page - 1) // self.per_page)
+
+    @property
+    def page(self) -> int:
+        return self.top // self.per_page + 1
+
+    def visible(self) -> List[int]:
+        """Indices of the rows on screen"""
+        return list(self.matches[self.top:self.top + self.per_page])
+
+    def scroll(self, pages: int) -> bool:
+        """Move the window by whole pages (False at either end)"""
+        top = self.top + pages * self.per_page
+        if top < 0 or top >= len(self.matches):
+            return False
+        self.top = top
+        return True
+
+    def jump(self, number: int) -> bool:
+        """Show the page holding item `number` (1-based), dropping a filter that hides it"""
+        import bisect
+        index = number - 1
+        if not 0 <= index < len(self.items):
+            return False
+        pos = bisect.bisect_left(self.matches, index)
+        if pos == len(self.matches) or self.matches[pos] != index:
+            self.filter("")
+            pos = index
+        self.top = pos - pos % self.per_page
+        return True
+
+    def filter(self, query: str):
+        """Keep items whose key contains query - typing more narrows the previous matches"""
+        query = query.strip().lower()
+        if not query:
+            self.matches = range(len(self.items))
+        else:
+            pool = self.matches if self.query and query.startswith(self.query) else range(len(self.items))
+            self.matches = [i for i in pool if query in self.key(i, self.items[i])]
+        self.query = query
+        self.top = 0
+
+    def lines(self) -> List[str]:
+        """Box with the visible rows, plus page and filter status"""
+        lines = [f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_CORNER_TL}{WuxiaTheme.BORDER_HORIZ*64}{WuxiaTheme.BORDER_CORNER_TR}{WuxiaTheme.RESET}"]
+        for n, i in enumerate(self.visible()):
+            # Add visual separator every 5 rows
+            if n and n % 5 == 0:
+                lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_L}{WuxiaTheme.BORDER_HORIZ*64}{WuxiaTheme.BORDER_R}{WuxiaTheme.RESET}")
+            lines.append(self.row(i, self.items[i]))
+        if not self.matches:
+            lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET} {WuxiaTheme.GRAY}{'Nothing matches - enter / to clear the filter':<63}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
+
+        # Show pagination info
+        if self.pages > 1:
+            lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_L}{WuxiaTheme.BORDER_HORIZ*64}{WuxiaTheme.BORDER_R}{WuxiaTheme.RESET}")
+            progress = WuxiaTheme.progress_bar(self.page, self.pages, 20)
+            lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET} {WuxiaTheme.GRAY}Page {self.page}/{self.pages}{WuxiaTheme.RESET}  {progress}  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
+            lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET} {WuxiaTheme.GRAY}Navigation: {WuxiaTheme.LIGHT_GOLD}[N]ext {WuxiaTheme.GRAY}| {WuxiaTheme.LIGHT_GOLD}[P]revious {WuxiaTheme.GRAY}| {WuxiaTheme.LIGHT_GOLD}[G 40]{WuxiaTheme.GRAY} jump | {WuxiaTheme.LIGHT_GOLD}[/text]{WuxiaTheme.GRAY} filter {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
+
+        lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_CORNER_BL}{WuxiaTheme.BORDER_HORIZ*64}{WuxiaTheme.BORDER_CORNER_BR}{WuxiaTheme.RESET}")
+        return lines
+
+    def navigate(self, choice: str) -> Optional[bool]:
+        """Apply a navigation command (n, p, g N, /text) - None when choice is not one"""
+        if choice in ("n", "p"):
+            if self.scroll(1 if choice == "n" else -1):
+                return True
+            print(WuxiaTheme.status_indicator("warning", "Already on the last page" if choice == "n"
+                                              else "Already on the first page"))
+            return False
+        if choice.startswith("/"):
+            self.filter(choice[1:])
+            return True
+        if choice[:1] == "g" and choice[1:].strip().isdigit():
+            if self.jump(int(choice[1:])):
+                return True
+            print(WuxiaTheme.status_indicator("error", f"No such entry. Pick between 1 and {len(self.items)}"))
+            return False
+        return None
+
 class UserInterface:
     """Handles all user interactions with wuxia theme"""
     
@@ -902,173 +3629,200 @@ class UserInterface:
                 raise
     
     @staticmethod
-    def select_from_list(items: List[Tuple[str, str]], title: str) -> int:
-        """Display list and let user select"""
-        print(WuxiaTheme.section_header(
-            "Cultivation Manuals Found",
-            title,
-            f"{len(items)} sacred scrolls discovered"
-        ))
-
-        print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_CORNER_TL}{WuxiaTheme.BORDER_HORIZ*64}{WuxiaTheme.BORDER_CORNER_TR}{WuxiaTheme.RESET}")
-        for i, (item_title, _) in enumerate(items, 1):
-            # Add visual separators every 5 items for readability
-            if i > 1 and (i - 1) % 5 == 0:
-                print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_L}{WuxiaTheme.BORDER_HORIZ*64}{WuxiaTheme.BORDER_R}{WuxiaTheme.RESET}")
-
-            # Strict truncation to prevent overflow
-            max_title_len = 52
-            if len(item_title) > max_title_len:
-                truncated_title = item_title[:max_title_len-3] + "..."
-            else:
-                truncated_title = item_title
+    def select_from_list(items: List[Tuple[str, str]], title: str, prefetch=None) -> int:
+        """Display list and let user select (prefetch(items) runs while they read)"""
+        # Small terminals lose the banner before the list shrinks below a few rows
+        banner_rows = len(WuxiaTheme.enhanced_banner().split("\n"))
+        header_rows = len(WuxiaTheme.section_header("", "", "").split("\n"))
+        show_banner = ListView.fits(banner_rows + header_rows)
+        view = ListView(items, UserInterface._manual_row,
+                        chrome=header_rows + (banner_rows if show_banner else 0))
 
-            print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET} {WuxiaTheme.SYMBOL_SCROLL} {WuxiaTheme.GOLD}{i:3d}.{WuxiaTheme.RESET} {WuxiaTheme.WHITE}{truncated_title:<52}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
-
-        print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_CORNER_BL}{WuxiaTheme.BORDER_HORIZ*64}{WuxiaTheme.BORDER_CORNER_BR}{WuxiaTheme.RESET}")
+        if prefetch:
+            prefetch(items)
 
+        redraw = True
         while True:
+            if redraw:
+                subtitle = f"{len(items)} sacred scrolls discovered"
+                if view.query:
+                    subtitle += f" - {len(view.matches)} matching '{view.query}'"
+                header = WuxiaTheme.section_header("Cultivation Manuals Found", title, subtitle)
+                banner = WuxiaTheme.enhanced_banner().split("\n") if show_banner else []
+                Screen.render(banner + header.split("\n") + view.lines())
             try:
                 choice = input(WuxiaTheme.prompt(f"Select manual [1-{len(items)}]")).strip()
                 if not choice:
                     print(WuxiaTheme.status_indicator("warning", "Please enter a number"))
+                    redraw = False
+                    continue
+
+                moved = view.navigate(choice.lower())
+                if moved is not None:
+                    redraw = moved
                     continue
 
+                redraw = False
                 idx = int(choice) - 1
                 if 0 <= idx < len(items):
+                    Screen.release()
                     print(WuxiaTheme.status_indicator("success", f"Selected: {items[idx][0][:50]}"))
                     return idx
                 else:
                     print(WuxiaTheme.status_indicator("error", f"Selection out of range (1-{len(items)})"))
             except ValueError:
-                print(WuxiaTheme.status_indicator("error", "Please enter a valid number"))
+                print(WuxiaTheme.status_indicator("error", "Please enter a number, n/p, g N or /filter"))
             except KeyboardInterrupt:
                 raise
     
+    @staticmethod
+    def _manual_row(i: int, item: Tuple[str, str]) -> str:
+        # Strict truncation to prevent overflow
+        max_title_len = 52
+        item_title = item[0]
+        if len(item_title) > max_title_len:
+            truncated_title = item_title[:max_title_len-3] + "..."
+        else:
+            truncated_title = item_title
+
+        return f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET} {WuxiaTheme.SYMBOL_SCROLL} {WuxiaTheme.GOLD}{i + 1:3d}.{WuxiaTheme.RESET} {WuxiaTheme.WHITE}{truncated_title:<52}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}"
+    
     @staticmethod
     def display_all_episodes(episodes: List[Tuple[str, str]], page: int = 1, per_page: int = 20) -> Tuple[int, int]:
         """Display ALL episodes with pagination"""
-        start_idx = (page - 1) * per_page
-        end_idx = min(start_idx + per_page, len(episodes))
-        total_pages = (len(episodes) + per_page - 1) // per_page
-
-        print(WuxiaTheme.section_header(
-            "Episode Manual",
-            "Cultivation Techniques",
-            f"Viewing {start_idx + 1}-{end_idx} of {len(episodes)} techniques"
-        ))
-
-        print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_CORNER_TL}{WuxiaTheme.BORDER_HORIZ*64}{WuxiaTheme.BORDER_CORNER_TR}{WuxiaTheme.RESET}")
-
-        # Show episodes for current page
-        for i in range(start_idx, end_idx):
-            # Add visual separator every 5 episodes
-            if i > start_idx and (i - start_idx) % 5 == 0:
-                print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_L}{WuxiaTheme.BORDER_HORIZ*64}{WuxiaTheme.BORDER_R}{WuxiaTheme.RESET}")
-
-            episode_sym = WuxiaTheme.SYMBOL_SCROLL
-            ep_num = Utils.extract_episode_number(episodes[i][0], episodes[i][1])
-            ep_label = f"Episode {ep_num}" if ep_num < 999999 else f"Episode {i + 1}"
-
-            print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET} {WuxiaTheme.SILVER}{i + 1:3d}.{WuxiaTheme.RESET} {episode_sym} {WuxiaTheme.WHITE}{ep_label:<50}{WuxiaTheme.RESET} {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
-
-        # Show pagination info
-        if total_pages > 1:
-            print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_L}{WuxiaTheme.BORDER_HORIZ*64}{WuxiaTheme.BORDER_R}{WuxiaTheme.RESET}")
-            progress = WuxiaTheme.progress_bar(page, total_pages, 20)
-            print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET} {WuxiaTheme.GRAY}Page {page}/{total_pages}{WuxiaTheme.RESET}  {progress}  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
-            print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET} {WuxiaTheme.GRAY}Navigation: {WuxiaTheme.LIGHT_GOLD}[N]ext {WuxiaTheme.GRAY}| {WuxiaTheme.LIGHT_GOLD}[P]revious{' '*28}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
-
-        print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_CORNER_BL}{WuxiaTheme.BORDER_HORIZ*64}{WuxiaTheme.BORDER_CORNER_BR}{WuxiaTheme.RESET}")
-
-        return total_pages, per_page
+        view = ListView(episodes, UserInterface._episode_row, per_page=per_page)
+        view.scroll(page - 1)
+        print("\n".join(UserInterface._episode_header(view) + view.lines()))
+        return view.pages, per_page
+    
+    @staticmethod
+    def _episode_row(i: int, episode: Tuple[str, str]) -> str:
+        episode_sym = WuxiaTheme.SYMBOL_SCROLL
+        ep_num = Utils.extract_episode_number(episode[0], episode[1])
+        ep_label = f"Episode {ep_num}" if ep_num < 999999 else f"Episode {i + 1}"
+        return f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET} {WuxiaTheme.SILVER}{i + 1:3d}.{WuxiaTheme.RESET} {episode_sym} {WuxiaTheme.WHITE}{ep_label:<50}{WuxiaTheme.RESET} {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}"
+    
+    @staticmethod
+    def _episode_key(i: int, episode: Tuple[str, str]) -> str:
+        # Title plus list position and parsed episode number, so "/12" finds episode 12 too
+        ep_num = Utils.extract_episode_number(episode[0], episode[1])
+        key = f"{episode[0].lower()} #{i + 1}"
+        return f"{key} #{ep_num}" if ep_num < 999999 else key  # 999999 = no number found
+    
+    @staticmethod
+    def _episode_header(view: ListView) -> List[str]:
+        shown = view.visible()
+        subtitle = f"Viewing {shown[0] + 1}-{shown[-1] + 1} of {len(view.items)} techniques" if shown else \
+            f"None of {len(view.items)} techniques"
+        if view.query:
+            subtitle += f" - {len(view.matches)} matching '{view.query}'"
+        return WuxiaTheme.section_header("Episode Manual", "Cultivation Techniques", subtitle).split("\n")
     
     @staticmethod
-    def select_episodes_interactive(episodes: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
-        """Interactive episode selection with ALL episodes visible via pagination"""
-        page = 1
-        per_page = 20
+    def select_episodes_interactive(episodes: List[Tuple[str, str]], prefetch=None) -> List[Tuple[str, str]]:
+        """Interactive episode selection - a window sized to the terminal over ALL episodes"""
+        # Chrome is measured, not guessed; small terminals drop the banner, then the options box
+        banner_rows = len(WuxiaTheme.enhanced_banner().split("\n"))
+        header_rows = len(WuxiaTheme.section_header("", "", "").split("\n"))
+        options_rows = len(UserInterface._selection_options(True).split("\n")) + 1
+        show_banner = ListView.fits(banner_rows + header_rows + options_rows)
+        show_options = show_banner or ListView.fits(header_rows + options_rows)
+        chrome = header_rows + (options_rows if show_options else 0) + (banner_rows if show_banner else 0)
+        view = ListView(episodes, UserInterface._episode_row, UserInterface._episode_key, chrome=chrome)
+        
+        # Network would idle while the user reads - resolve likely picks now
+        if prefetch:
+            prefetch(episodes)
         
+        redraw = True
         while True:
-            Utils.clear_screen()
-            UserInterface.show_banner()
-            total_pages, per_page = UserInterface.display_all_episodes(episodes, page, per_page)
-            
-            print()
-            print(WuxiaTheme.glow_text("Cultivation Selection Options", "gold"))
-            print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_CORNER_TL}{WuxiaTheme.BORDER_HORIZ*54}{WuxiaTheme.BORDER_CORNER_TR}{WuxiaTheme.RESET}")
-            print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[1-5,8,10-12]{WuxiaTheme.RESET}  {WuxiaTheme.GRAY}→{WuxiaTheme.RESET}  {WuxiaTheme.WHITE}Select specific techniques{' '*18}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
-            print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[all]{WuxiaTheme.RESET}         {WuxiaTheme.GRAY}→{WuxiaTheme.RESET}  {WuxiaTheme.WHITE}Select all techniques{' '*23}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
-            print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[1]{WuxiaTheme.RESET}           {WuxiaTheme.GRAY}→{WuxiaTheme.RESET}  {WuxiaTheme.WHITE}Select single technique{' '*21}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
-
-            if total_pages > 1:
-                print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_L}{WuxiaTheme.BORDER_HORIZ*54}{WuxiaTheme.BORDER_R}{WuxiaTheme.RESET}")
-                print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[n/p]{WuxiaTheme.RESET}         {WuxiaTheme.GRAY}→{WuxiaTheme.RESET}  {WuxiaTheme.WHITE}Navigate pages{' '*30}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
-
-            print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_CORNER_BL}{WuxiaTheme.BORDER_HORIZ*54}{WuxiaTheme.BORDER_CORNER_BR}{WuxiaTheme.RESET}")
+            if redraw:
+                banner = WuxiaTheme.enhanced_banner().split("\n") if show_banner else []
+                options = []
+                if show_options:
+                    options = [""] + WuxiaTheme.cached(
+                        ("selection_options", view.pages > 1 or bool(view.query)),
+                        lambda: UserInterface._selection_options(view.pages > 1 or bool(view.query))).split("\n")
+                Screen.render(banner + UserInterface._episode_header(view) + view.lines() + options)
             
             try:
                 choice = input(WuxiaTheme.prompt("Select techniques")).strip().lower()
                 
-                if choice == "n" and page < total_pages:
-                    page += 1
+                moved = view.navigate(choice)
+                if moved is not None:
+                    redraw = moved
                     continue
-                elif choice == "p" and page > 1:
-                    page -= 1
-                    continue
-                elif choice in ["", "all", "a"]:
-                    return episodes
+                redraw = False
+                if choice in ["", "all", "a"]:
+                    Screen.release()
+                    # With a filter active, "all" means everything that matched
+                    return [episodes[i] for i in view.matches] if view.query else episodes
                 else:
                     # Parse episode selection
-                    selected = []
                     try:
-                        for part in choice.split(","):
-                            part = part.strip()
-                            if "-" in part:
-                                start, end = map(int, part.split("-"))
-                                if start < 1 or end > len(episodes) or start > end:
-                                    raise IndexError
-                                selected.extend(episodes[start-1:end])
-                            else:
-                                num = int(part)
-                                if num < 1 or num > len(episodes):
-                                    raise IndexError
-                                selected.append(episodes[num-1])
+                        selected = Utils.parse_episode_selection(choice, episodes)
 
                         if selected:
+                            Screen.release()
                             print(WuxiaTheme.status_indicator("success", f"Selected {len(selected)} technique(s)"))
                             return selected
                         print(WuxiaTheme.status_indicator("error", "No techniques selected"))
-                        time.sleep(1)
                     except ValueError:
                         print(WuxiaTheme.status_indicator("error", "Please enter a valid number or range"))
-                        time.sleep(1)
                     except IndexError:
                         print(WuxiaTheme.status_indicator("error", f"Out of range. Pick between 1 and {len(episodes)}"))
-                        time.sleep(1)
             except KeyboardInterrupt:
                 raise
     
+    @staticmethod
+    def _selection_options(paged: bool) -> str:
+        lines = [WuxiaTheme.glow_text("Cultivation Selection Options", "gold")]
+        lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_CORNER_TL}{WuxiaTheme.BORDER_HORIZ*54}{WuxiaTheme.BORDER_CORNER_TR}{WuxiaTheme.RESET}")
+        lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[1-5,8,10-12]{WuxiaTheme.RESET}  {WuxiaTheme.GRAY}→{WuxiaTheme.RESET}  {WuxiaTheme.WHITE}Select specific techniques{' '*18}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
+        lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[all]{WuxiaTheme.RESET}         {WuxiaTheme.GRAY}→{WuxiaTheme.RESET}  {WuxiaTheme.WHITE}Select all techniques{' '*23}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
+        lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[1]{WuxiaTheme.RESET}           {WuxiaTheme.GRAY}→{WuxiaTheme.RESET}  {WuxiaTheme.WHITE}Select single technique{' '*21}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
+
+        if paged:
+            lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_L}{WuxiaTheme.BORDER_HORIZ*54}{WuxiaTheme.BORDER_R}{WuxiaTheme.RESET}")
+            lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[n/p]{WuxiaTheme.RESET}         {WuxiaTheme.GRAY}→{WuxiaTheme.RESET}  {WuxiaTheme.WHITE}Navigate pages{' '*30}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
+            lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[g 250]{WuxiaTheme.RESET}       {WuxiaTheme.GRAY}→{WuxiaTheme.RESET}  {WuxiaTheme.WHITE}Jump to technique 250{' '*23}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
+            lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[/text]{WuxiaTheme.RESET}       {WuxiaTheme.GRAY}→{WuxiaTheme.RESET}  {WuxiaTheme.WHITE}Filter by title or number (/ clears){' '*8}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
+
+        lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_CORNER_BL}{WuxiaTheme.BORDER_HORIZ*54}{WuxiaTheme.BORDER_CORNER_BR}{WuxiaTheme.RESET}")
+        return "\n".join(lines)
+    
     @staticmethod
     def show_playback_controls(title: str, current: int, total: int):
         """Show playback controls with martial arts theme"""
-        print(WuxiaTheme.now_playing(title, current, total))
-        print()
-        print(WuxiaTheme.glow_text("Playback Controls", "jade"))
-        print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_CORNER_TL}{WuxiaTheme.BORDER_HORIZ*54}{WuxiaTheme.BORDER_CORNER_TR}{WuxiaTheme.RESET}")
-        print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[D]{WuxiaTheme.RESET} Download this technique{' '*28}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
+        print("\n".join(UserInterface.playback_lines(title, current, total)))
+    
+    @staticmethod
+    def playback_lines(title: str, current: int, total: int) -> List[str]:
+        """Now-playing card plus the (cached) controls box, one entry per screen row"""
+        controls = WuxiaTheme.cached(("controls", current > 1, current < total),
+                                     lambda: UserInterface._controls_box(current > 1, current < total))
+        return f"{WuxiaTheme.now_playing(title, current, total)}\n\n{controls}".split("\n")
+    
+    @staticmethod
+    def _controls_box(has_prev: bool, has_next: bool) -> str:
+        lines = [WuxiaTheme.glow_text("Playback Controls", "jade")]
+        lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_CORNER_TL}{WuxiaTheme.BORDER_HORIZ*54}{WuxiaTheme.BORDER_CORNER_TR}{WuxiaTheme.RESET}")
+        lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[D]{WuxiaTheme.RESET} Download this technique{' '*28}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
 
-        prev_color = WuxiaTheme.LIGHT_GOLD if current > 1 else WuxiaTheme.GRAY
-        print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {prev_color}[P]{WuxiaTheme.RESET} Previous technique{' '*32}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
+        prev_color = WuxiaTheme.LIGHT_GOLD if has_prev else WuxiaTheme.GRAY
+        lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {prev_color}[P]{WuxiaTheme.RESET} Previous technique{' '*32}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
 
-        next_color = WuxiaTheme.LIGHT_GOLD if current < total else WuxiaTheme.GRAY
-        print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {next_color}[N]{WuxiaTheme.RESET} Next technique{' '*36}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
+        next_color = WuxiaTheme.LIGHT_GOLD if has_next else WuxiaTheme.GRAY
+        lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {next_color}[N]{WuxiaTheme.RESET} Next technique{' '*36}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
 
-        print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[S]{WuxiaTheme.RESET} Skip to specific technique{' '*25}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
-        print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[R]{WuxiaTheme.RESET} Restart cultivation{' '*31}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
-        print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[Q]{WuxiaTheme.RESET} Return to sect{' '*36}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
-        print(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_CORNER_BL}{WuxiaTheme.BORDER_HORIZ*54}{WuxiaTheme.BORDER_CORNER_BR}{WuxiaTheme.RESET}")
-        print(f"\n  {WuxiaTheme.GRAY}⚡ Close MPV window or enter command to continue...{WuxiaTheme.RESET}")
+        lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[S]{WuxiaTheme.RESET} Skip to specific technique{' '*25}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
+        lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[R]{WuxiaTheme.RESET} Restart cultivation{' '*31}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
+        lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[V]{WuxiaTheme.RESET} Change quality (no re-extraction){' '*17}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
+        lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}  {WuxiaTheme.LIGHT_GOLD}[Q]{WuxiaTheme.RESET} Return to sect{' '*36}{WuxiaTheme.JADE}{WuxiaTheme.BORDER_VERT}{WuxiaTheme.RESET}")
+        lines.append(f"  {WuxiaTheme.JADE}{WuxiaTheme.BORDER_CORNER_BL}{WuxiaTheme.BORDER_HORIZ*54}{WuxiaTheme.BORDER_CORNER_BR}{WuxiaTheme.RESET}")
+        lines.append("")
+        lines.append(f"  {WuxiaTheme.GRAY}⚡ Close MPV window or enter command to continue...{WuxiaTheme.RESET}")
+        return "\n".join(lines)
 
 # ============================================================================
 # MAIN APPLICATION (OPTIMIZED)
@@ -1080,7 +3834,8 @@ class DonghuaCLI:
         self.theme = WuxiaTheme
         self.ui = UserInterface
         self.player = None
-        self.preloader = InstantPreloader()
+        self.race_mirrors = False
+        self.prefetches = []  # Futures of speculative work started while the user reads
 
         # Create cache directory
         os.makedirs(Config.CACHE_DIR, exist_ok=True)
@@ -1145,31 +3900,86 @@ Examples:
   dhua "perfect world" -s ld      Search LuciferDonghua Realm
   dhua "btth" -q 1080             Cultivate at 1080p resolution
   dhua "martial peak" -d          Archive techniques (download)
+  dhua "btth" --json              Print search results as JSON
+  dhua "btth" --pick 1 --episodes 1-20 --resolve-only --json
+                                  Warm the stream cache (cron friendly)
+  dhua --serve --host 0.0.0.0     Share resolved streams with Kodi/VLC on the LAN
             """
         )
         
         parser.add_argument("query", nargs="?", help="Cultivation manual to search")
         parser.add_argument("-s", "--source", choices=["ld", "ax"], help="Cultivation realm to use")
         parser.add_argument("-q", "--quality", default=Config.DEFAULT_QUALITY, 
-                          help=f"Resolution quality (default: {Config.DEFAULT_QUALITY})")
+                          help=f"Resolution quality, or 'auto' to match measured link speed (default: {Config.DEFAULT_QUALITY})")
         parser.add_argument("-d", "--download", action="store_true", help="Archive mode (download)")
+        parser.add_argument("--race", action="store_true",
+                          help="Resolve each episode on both realms and play the fastest (default when searching both)")
+        parser.add_argument("--json", action="store_true",
+                          help="Print results as JSON and exit (no prompts)")
+        parser.add_argument("--pick", type=int, metavar="N",
+                          help="Pick search result N instead of prompting")
+        parser.add_argument("--episodes", metavar="RANGE",
+                          help="Select episodes like 1-20 or 1-5,8 instead of prompting")
+        parser.add_argument("--resolve-only", action="store_true",
+                          help="Resolve (and cache) stream URLs without playing, then exit")
+        parser.add_argument("--daemon", action="store_true",
+                          help="Keep caches and connections warm for other dhua runs (Unix socket)")
+        parser.add_argument("--no-daemon", action="store_true",
+                          help="Don't use a running daemon, work locally")
+        parser.add_argument("--serve", action="store_true",
+                          help="Serve search, episodes and streams over a local HTTP API")
+        parser.add_argument("--host", default=ApiServer.DEFAULT_HOST,
+                          help=f"HTTP API bind address (default: {ApiServer.DEFAULT_HOST})")
+        parser.add_argument("--port", type=int, default=ApiServer.DEFAULT_PORT,
+                          help=f"HTTP API port (default: {ApiServer.DEFAULT_PORT})")
+        parser.add_argument("--update-catalog", action="store_true",
+                          help="Crawl every realm's series list for instant local search")
         parser.add_argument("--log", help="Cultivation log file")
         parser.add_argument("--clear-cache", action="store_true", help="Clear stream cache")
         parser.add_argument("--features", action="store_true", help="Show features and capabilities")
         
         args = parser.parse_args()
+        if (args.json or args.resolve_only) and not args.query:
+            parser.error("--json and --resolve-only need a search query")
+        if (args.resolve_only or args.episodes) and args.pick is None:
+            parser.error("--resolve-only and --episodes need --pick N")
         
         # Show features if requested
         if args.features:
             self.show_features()
             return
+        
+        DaemonClient.disabled = args.no_daemon
+        if args.daemon:
+            HttpClient.prewarm()
+            self.daemon_mode()
+            return
+        if args.serve:
+            HttpClient.prewarm()
+            self.serve_mode(args)
+            return
+        
+        # Connections open while the banner draws and the user types
+        if not DaemonClient.available():
+            HttpClient.prewarm()
+            self.refresh_catalog_in_background()
 
         # Clear cache if requested
         if args.clear_cache:
             self.clear_cache()
+        
+        if args.update_catalog:
+            self.update_catalog()
+            if not args.query:
+                return
+        
+        self.race_mirrors = args.race
 
         try:
-            if args.query:
+            if args.json or args.resolve_only:
+                # Non-interactive scripting mode
+                sys.exit(self.script_mode(args))
+            elif args.query:
                 # Direct mode with arguments
                 self.direct_mode(args)
             else:
@@ -1185,6 +3995,65 @@ Examples:
             print(f"\n{self.theme.imperial_divider()}")
             print(self.theme.status_indicator("error", f"Cultivation Error: {e}"))
             sys.exit(1)
+        finally:
+            SourceHealth.save()
+            PrefetchPolicy.save()
+            NetworkMonitor.save()
+    
+    def daemon_mode(self):
+        """Serve warm search/episode/stream lookups to other dhua invocations"""
+        self.ui.show_banner()
+        if not hasattr(__import__("socket"), "AF_UNIX"):
+            print(self.theme.status_indicator("error", "Daemon mode needs Unix sockets (Linux, macOS, Termux)"))
+            return
+        print(self.theme.glow_text("Cultivation Daemon Awakened", "jade"))
+        print(self.theme.status_indicator("info", f"Listening on {Config.DAEMON_SOCKET}"))
+        print(self.theme.status_indicator("info", "Other dhua runs now share this warm state - Ctrl+C to stop"))
+        try:
+            DaemonServer().serve()
+        except KeyboardInterrupt:
+            print(f"\n{self.theme.status_indicator('success', 'Daemon stopped')}")
+        except RuntimeError as e:
+            print(self.theme.status_indicator("error", str(e)))
+    
+    def serve_mode(self, args):
+        """Resolve streams once for every player in the house"""
+        self.ui.show_banner()
+        print(self.theme.glow_text("Cultivation Pavilion Open", "jade"))
+        origin = f"http://{args.host}:{args.port}"
+        print(self.theme.status_indicator("info", f"{origin}/search?q=soul+land"))
+        print(self.theme.status_indicator("info", f"{origin}/series/<id>/episodes  |  /series/<id>/playlist.m3u"))
+        print(self.theme.status_indicator("info", f"{origin}/episodes/<id>/stream  (?redirect=1 for players)"))
+        print(self.theme.status_indicator("info", "Ctrl+C to stop"))
+        try:
+            ApiServer(args.quality).serve(args.host, args.port)
+        except KeyboardInterrupt:
+            print(f"\n{self.theme.status_indicator('success', 'Pavilion closed')}")
+        except OSError as e:
+            print(self.theme.status_indicator("error", f"Cannot listen on {origin}: {e}"))
+    
+    def refresh_catalog_in_background(self):
+        """Quietly re-crawl a stale catalog - only on unmetered links with battery to spare"""
+        if not PrefetchPolicy.allows_speculation():
+            return
+        for key in Config.SOURCES:
+            if Catalog.load().get(key) and Catalog.is_stale(key):
+                # A scheduler job, so the crawl yields to playback and counts against the data budget
+                ExtractionScheduler.submit(ExtractionScheduler.BULK, lambda key=key: Catalog.crawl(key),
+                                           SourceHealth.host(Config.SOURCES[key]["base_url"]), key=f"catalog:{key}")
+    
+    def update_catalog(self):
+        """Crawl (or refresh) the local series catalog of every realm"""
+        print(self.theme.status_indicator("loading", "Charting every realm's cultivation manuals..."))
+        for key, source in Config.SOURCES.items():
+            start = time.time()
+            added = Catalog.crawl(key)
+            total = len(Catalog.load().get(key, {}).get("series", []))
+            if total:
+                print(self.theme.status_indicator(
+                    "success", f"{source['name']}: {total} series ({added} new) in {time.time() - start:.1f}s"))
+            else:
+                print(self.theme.status_indicator("warning", f"{source['name']}: series list unavailable"))
     
     def clear_cache(self):
         """Clear all cached data"""
@@ -1196,6 +4065,10 @@ Examples:
                 print(self.theme.status_indicator("success", "Stream cache cleared successfully"))
             else:
                 print(self.theme.status_indicator("info", "No cache found to clear"))
+            if os.path.isdir(Config.HTTP_CACHE_DIR):
+                import shutil
+                shutil.rmtree(Config.HTTP_CACHE_DIR, ignore_errors=True)
+                print(self.theme.status_indicator("success", "Page cache cleared"))
         except Exception as e:
             print(self.theme.status_indicator("error", f"Failed to clear cache: {e}"))
     
@@ -1203,9 +4076,9 @@ Examples:
         """Run with command line arguments"""
         self.ui.show_banner()
         
-        # Select source if not specified
+        # Select source if not specified (--pick never prompts)
         if not args.source:
-            args.source = self.ui.select_source()
+            args.source = "both" if args.pick is not None else self.ui.select_source()
         
         # Search
         results = self.search_all(args.query, args.source)
@@ -1218,11 +4091,19 @@ Examples:
             return
 
         # Select series
-        idx = self.ui.select_from_list(results, "CULTIVATION MANUALS")
+        if args.pick is not None:
+            if not 1 <= args.pick <= len(results):
+                print(self.theme.status_indicator("error", f"--pick out of range (1-{len(results)})"))
+                return
+            idx = args.pick - 1
+        else:
+            idx = self.ui.select_from_list(results, "CULTIVATION MANUALS",
+                                           prefetch=lambda items: self.prefetch_series(items, args.source))
+            self.cancel_prefetches()
         series_title, series_url = results[idx]
 
         # Get ALL episodes
-        episodes = self.get_episodes(series_url, args.source)
+        episodes = self.get_episodes(series_url, args.source, series_title)
         if not episodes:
             print(self.theme.tip_box(
                 "No Episodes Found",
@@ -1232,7 +4113,16 @@ Examples:
             return
         
         # Select episodes (shows ALL episodes)
-        selected = self.ui.select_episodes_interactive(episodes)
+        if args.episodes:
+            try:
+                selected = Utils.parse_episode_selection(args.episodes, episodes)
+            except (ValueError, IndexError):
+                print(self.theme.status_indicator("error", f"Invalid --episodes (pick between 1 and {len(episodes)})"))
+                return
+        else:
+            selected = self.ui.select_episodes_interactive(
+                episodes, prefetch=lambda eps: self.prefetch_streams(eps, series_title))
+            self.cancel_prefetches()
         
         # Download or cultivate
         if args.download:
@@ -1240,6 +4130,87 @@ Examples:
         else:
             self.play_episodes(selected, series_title, args.quality)
     
+    def script_mode(self, args) -> int:
+        """Non-interactive run for scripts and cron jobs - returns the exit code"""
+        import contextlib
+        
+        source = args.source or "both"
+        report: Dict[str, Any] = {"query": args.query, "source": source}
+        
+        # Progress messages go to stderr so stdout stays machine-readable
+        with contextlib.redirect_stdout(sys.stderr):
+            self.build_report(args, source, report)
+        return self.emit_report(report, args.json)
+    
+    def build_report(self, args, source: str, report: Dict[str, Any]):
+        """Fill a script-mode report - failures are recorded under "error" """
+        results = self.search_all(args.query, source)
+        report["results"] = [{"index": i, "title": t, "url": u} for i, (t, u) in enumerate(results, 1)]
+        if not results:
+            report["error"] = "No results found"
+            return
+        if args.pick is None:
+            return
+        if not 1 <= args.pick <= len(results):
+            report["error"] = f"--pick out of range (1-{len(results)})"
+            return
+        series_title, series_url = results[args.pick - 1]
+        report["series"] = {"title": series_title, "url": series_url}
+        
+        # No title: a mirror-linking thread racing the report would make it nondeterministic
+        episodes = self.get_episodes(series_url, source)
+        numbered = list(enumerate(episodes, 1))
+        if args.episodes:
+            try:
+                wanted = set(Utils.parse_episode_selection(args.episodes, episodes))
+            except (ValueError, IndexError):
+                report["error"] = f"Invalid --episodes (pick between 1 and {len(episodes)})"
+                return
+            numbered = [(i, ep) for i, ep in numbered if ep in wanted]
+        report["episodes"] = [
+            {"index": i, "number": Utils.extract_episode_number(t, u), "title": t, "url": u}
+            for i, (t, u) in numbered
+        ]
+        
+        if args.resolve_only:
+            self.resolve_report_streams(report["episodes"])
+    
+    def resolve_report_streams(self, episodes: List[Dict[str, Any]]):
+        """Resolve every episode into the stream cache, recording the results"""
+        preloader = StreamExtractor.get_preloader()
+        print(self.theme.status_indicator("loading", f"Resolving {len(episodes)} stream(s)..."))
+        futures = [preloader.cache.get_entry(ep["url"]) or preloader.schedule(ep["url"], ExtractionScheduler.BULK)
+                   for ep in episodes]
+        for episode, future in zip(episodes, futures):
+            try:
+                entry = future if isinstance(future, dict) else future.result()
+            except Exception as e:
+                episode["stream"] = None
+                episode["variants"] = []
+                episode["error"] = str(e) or type(e).__name__
+                continue
+            episode["stream"] = entry["url"] if entry["url"] != episode["url"] else None
+            episode["variants"] = entry["variants"]
+    
+    @staticmethod
+    def emit_report(report: Dict[str, Any], as_json: bool) -> int:
+        """Print a script-mode report to stdout (JSON or tab-separated)"""
+        if as_json:
+            print(json.dumps(report, indent=2, ensure_ascii=False))
+        else:
+            for section in ("results", "episodes"):
+                for row in report.get(section, []):
+                    fields = [str(row["index"]), row["title"], row.get("stream") or row["url"]]
+                    print("\t".join(fields))
+            if "error" in report:
+                print(report["error"], file=sys.stderr)
+        
+        if "error" in report:
+            return 1
+        if any("stream" in ep and not ep["stream"] for ep in report.get("episodes", [])):
+            return 2  # Some episodes could not be resolved
+        return 0
+    
     def interactive_mode(self):
         """Fully interactive cultivation mode"""
         while True:
@@ -1273,11 +4244,13 @@ Examples:
                 continue
 
             # Select series
-            idx = self.ui.select_from_list(results, "CULTIVATION MANUALS")
+            idx = self.ui.select_from_list(results, "CULTIVATION MANUALS",
+                                           prefetch=lambda items: self.prefetch_series(items, source))
+            self.cancel_prefetches()
             series_title, series_url = results[idx]
 
             # Get ALL episodes
-            episodes = self.get_episodes(series_url, source)
+            episodes = self.get_episodes(series_url, source, series_title)
             if not episodes:
                 print()
                 print(self.theme.tip_box(
@@ -1289,7 +4262,9 @@ Examples:
                 continue
             
             # Select episodes (shows ALL episodes)
-            selected = self.ui.select_episodes_interactive(episodes)
+            selected = self.ui.select_episodes_interactive(
+                episodes, prefetch=lambda eps: self.prefetch_streams(eps, series_title))
+            self.cancel_prefetches()
             
             # Play or download choice
             print(self.theme.imperial_divider())
@@ -1329,9 +4304,14 @@ Examples:
 
         if source == "both":
             print(self.theme.status_indicator("info", "Scanning both LuciferDonghua and AnimeXin realms"))
-            scraper_ld = Scraper("ld")
-            scraper_ax = Scraper("ax")
-            results = scraper_ld.search(query) + scraper_ax.search(query)
+            # Healthiest realm first; realms with an open circuit are skipped
+            results = []
+            for key in Scraper.sources_by_health():
+                host = SourceHealth.host(Config.SOURCES[key]["base_url"])
+                if not SourceHealth.allow(host):
+                    print(self.theme.status_indicator("warning", f"{Config.SOURCES[key]['name']} is unreachable, skipping for now"))
+                    continue
+                results += Scraper(key).search(query)
         else:
             realm_name = "LuciferDonghua" if source == "ld" else "AnimeXin"
             print(self.theme.status_indicator("info", f"Scanning {realm_name} realm"))
@@ -1354,31 +4334,75 @@ Examples:
 
         return unique_results[:20]  # Limit to 20 results for speed
     
-    def get_episodes(self, url: str, source: str) -> List[Tuple[str, str]]:
+    def get_episodes(self, url: str, source: str, title: Optional[str] = None) -> List[Tuple[str, str]]:
         """Get ALL episodes from manual"""
         print(self.theme.imperial_divider())
         print(self.theme.status_indicator("loading", "Reading cultivation manual..."))
 
         if source == "both":
             # Determine source from URL
-            if "luciferdonghua" in url:
-                scraper = Scraper("ld")
+            if Scraper.source_for_url(url) == "ld":
+                scraper = Scraper.shared("ld")
                 print(self.theme.status_indicator("info", "Source: LuciferDonghua Realm"))
             else:
-                scraper = Scraper("ax")
+                scraper = Scraper.shared("ax")
                 print(self.theme.status_indicator("info", "Source: AnimeXin Sect"))
         else:
-            scraper = Scraper(source)
+            scraper = Scraper.shared(source)
 
-        episodes = scraper.get_episodes(url)
+        # Joins (and promotes) a prefetch of this list if one is running
+        episodes = ExtractionScheduler.run_foreground(lambda: scraper.get_episodes(url), key=url)
 
         if episodes:
             print(self.theme.status_indicator("success", f"Found {len(episodes)} cultivation technique(s)"))
+            if title and (self.race_mirrors or source == "both"):
+                # Match the other realm while the user picks episodes
+                print(self.theme.status_indicator("info", "Seeking mirror realm for fastest playback"))
+                threading.Thread(
+                    target=MirrorRacer.link_series,
+                    args=(title, url, episodes),
+                    daemon=True
+                ).start()
         else:
             print(self.theme.status_indicator("warning", "No episodes found in this manual"))
 
         return episodes
     
+    PREFETCH_SERIES = 3  # Top search results whose episode lists are fetched speculatively
+    
+    def cancel_prefetches(self):
+        """Drop speculative work that hasn't started - the user has chosen"""
+        for future in self.prefetches:
+            future.cancel()
+        self.prefetches = []
+    
+    def prefetch_series(self, results: List[Tuple[str, str]], source: str):
+        """Fetch episode lists of the top results while the user reads the list"""
+        if PrefetchPolicy.mode() == PrefetchPolicy.OFF:
+            return
+        for _, url in results[:self.PREFETCH_SERIES]:
+            scraper = Scraper.shared(Scraper.source_for_url(url) if source == "both" else source)
+            if url not in scraper.episode_cache:
+                self.prefetches.append(ExtractionScheduler.submit(
+                    ExtractionScheduler.SPECULATIVE, lambda s=scraper, u=url: s.get_episodes(u),
+                    SourceHealth.host(url), key=url))
+    
+    def prefetch_streams(self, episodes: List[Tuple[str, str]], series_title: str):
+        """Resolve the most likely picks: next after last watched, first and latest"""
+        if not PrefetchPolicy.allows_speculation():
+            return
+        likely = []
+        last = WatchHistory.last(series_title)
+        urls = [url for _, url in episodes]
+        if last in urls and urls.index(last) + 1 < len(urls):
+            likely.append(urls[urls.index(last) + 1])
+        likely += [urls[0], urls[-1]]
+        
+        preloader = StreamExtractor.get_preloader()
+        for url in dict.fromkeys(likely):
+            if not preloader.cache.get(url):
+                self.prefetches.append(preloader.schedule(url, ExtractionScheduler.SPECULATIVE))
+    
     def play_episodes(self, episodes: List[Tuple[str, str]], series_title: str, quality: str):
         """Cultivate (play) episodes sequentially - OPTIMIZED FOR SPEED"""
         self.player = Player(quality)
@@ -1391,13 +4415,15 @@ Examples:
         while current_idx < len(episodes):
             title, url = episodes[current_idx]
 
-            Utils.clear_screen()
-            self.ui.show_banner()
-            self.ui.show_playback_controls(title, current_idx + 1, len(episodes))
+            # Between episodes only the changed rows (title, counters) are repainted
+            Screen.render(self.theme.enhanced_banner().split("\n") + [""] +
+                          self.ui.playback_lines(title, current_idx + 1, len(episodes)))
 
             # Start playback with preloaded stream (INSTANT)
             if not self.player.play(url, episodes, current_idx, log_file=None):
+                Screen.release()
                 return
+            WatchHistory.record(series_title, url)
 
             # Monitor player in background so we can notify when it finishes
             player_finished = threading.Event()
@@ -1414,9 +4440,10 @@ Examples:
             action = None
             while action is None:
                 try:
-                    choice = input(self.theme.prompt("Command [N/P/S/R/D/Q]")).strip().lower()
+                    choice = input(self.theme.prompt("Command [N/P/S/R/V/D/Q]")).strip().lower()
                 except KeyboardInterrupt:
                     self.player.stop()
+                    Screen.release()
                     print(f"\n{self.theme.glow_text('Cultivation Session Complete', 'jade')}")
                     print(self.theme.status_indicator("success", "All techniques mastered!"))
                     return
@@ -1450,6 +4477,15 @@ Examples:
                         print(self.theme.status_indicator("error", "Please enter a valid number"))
                     except KeyboardInterrupt:
                         pass
+                elif choice == 'v':
+                    new_quality = input(self.theme.prompt(f"Quality [current: {self.player.quality}]")).strip().lower().rstrip("p")
+                    if new_quality.isdigit() or new_quality == "auto":
+                        self.player.quality = new_quality
+                        action = 'replay'
+                        label = "auto" if new_quality == "auto" else f"{new_quality}p"
+                        print(self.theme.status_indicator("success", f"Switching to {label}"))
+                    else:
+                        print(self.theme.status_indicator("error", "Please enter a height like 480, or auto"))
                 elif choice == 'd':
                     print(self.theme.status_indicator("loading", "Downloading current technique..."))
                     Downloader.download_episode(url, series_title, title, quality)
@@ -1457,7 +4493,7 @@ Examples:
                     action = 'quit'
                     print(self.theme.status_indicator("info", "Returning to sect"))
                 else:
-                    print(f"{self.theme.GRAY}  Commands: {self.theme.LIGHT_GOLD}[N]ext [P]rev [S]kip [R]eplay [D]ownload [Q]uit{self.theme.RESET}")
+                    print(f"{self.theme.GRAY}  Commands: {self.theme.LIGHT_GOLD}[N]ext [P]rev [S]kip [R]eplay [V]ariant [D]ownload [Q]uit{self.theme.RESET}")
 
             # Stop current playback
             self.player.stop()
@@ -1476,6 +4512,7 @@ Examples:
             elif isinstance(action, tuple) and action[0] == 'skip':
                 current_idx = action[1]
 
+        Screen.release()
         print(f"\n{self.theme.glow_text('Cultivation Session Complete', 'jade')}")
         print(self.theme.status_indicator("success", "All techniques mastered! Your cultivation has improved."))
     
@@ -1523,7 +4560,10 @@ Examples:
         """Cleanup cultivation resources"""
         if self.player:
             self.player.stop()
-        self.preloader.stop()
+        StreamExtractor.stop_preloading()
+        SourceHealth.save()
+        PrefetchPolicy.save()
+        NetworkMonitor.save()
 
 # ============================================================================
 # ENTRY POINT
@@ -2,133 +2,120 @@
 """
 武侠动画 - TERMUX CULTIVATION REALM
 Android/Termux Donghua Streaming Client
-Default Quality: 360p (optimized for mobile data)
+Default Quality: auto (measured per network, 360p until measured)
 """
-import os, re, sys, time, subprocess, requests, json
-from bs4 import BeautifulSoup
+import os, re
+from dhua import (VariantSelector, HttpClient, NetworkMonitor, YtdlpWorker, StreamExtractor,
+                  ExtractionScheduler, SourceHealth, PlayerBackend, Screen, Scraper as CoreScraper)
 
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
-DEFAULT_QUALITY = "360"  # 360p for mobile data saving
+DEFAULT_QUALITY = "auto"  # Highest variant the measured link sustains
+FALLBACK_QUALITY = "360"  # 360p for mobile data saving until the network is measured
+
+def current_quality():
+    """Resolve DEFAULT_QUALITY to a height using the measured link speed"""
+    return NetworkMonitor.resolve_quality(DEFAULT_QUALITY, FALLBACK_QUALITY)
 
 class WuxiaTheme:
     JADE = "\033[38;5;79m"; GOLD = "\033[38;5;220m"
     SILVER = "\033[38;5;252m"; WHITE = "\033[38;5;255m"
     RED = "\033[38;5;196m"; RESET = "\033[0m"
     
+    _frames = {}  # Banner per quality label, built once
+    WIDTH = 64    # Widest screen line in cells - phones narrower than this get plain redraws
+
     @classmethod
     def banner(cls):
-        os.system('clear')
-        return f"""{cls.JADE}┌────────────────────────────────────────────────────────┐
+        Screen.clear()
+        return cls.header()
+
+    @classmethod
+    def header(cls):
+        """Banner text without clearing - the top rows of every rendered screen"""
+        quality = f"{current_quality()}p ({DEFAULT_QUALITY})"
+        if quality not in cls._frames:
+            cls._frames[quality] = f"""{cls.JADE}┌────────────────────────────────────────────────────────┐
 │  ⚔️  {cls.GOLD}武 侠 动 画 : TERMUX CULTIVATION REALM {cls.JADE} ⚔️  │
-│  {cls.SILVER}Quality: {DEFAULT_QUALITY}p{cls.JADE}                                          │
+│  {cls.SILVER}Quality: {quality:<45}{cls.JADE}│
 └────────────────────────────────────────────────────────┘{cls.RESET}"""
+        return cls._frames[quality]
 
 class Config:
-    BASE_DIR = '/sdcard/Documents/DonghuaCultivation'
-    CACHE_DIR = os.path.join(BASE_DIR, 'cache')
+    # Caches live in dhua's Config.CACHE_DIR, shared with the desktop client
     HEADERS = {
         "User-Agent": "Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.5",
     }
 
-    @staticmethod
-    def setup():
-        if not os.path.exists(Config.CACHE_DIR):
-            try:
-                os.makedirs(Config.CACHE_DIR, exist_ok=True)
-            except PermissionError:
-                print(f"{WuxiaTheme.RED}⚠ Cannot create cache dir. Using Termux home{WuxiaTheme.RESET}")
-                Config.BASE_DIR = os.path.expanduser("~/DonghuaCultivation")
-                Config.CACHE_DIR = os.path.join(Config.BASE_DIR, 'cache')
-                os.makedirs(Config.CACHE_DIR, exist_ok=True)
-
 # ============================================================================
-# CORE ENGINE
+# CORE ENGINE (shared with dhua.py: scraping, extraction, caches, preloading)
 # ============================================================================
 class CultivationEngine:
+    player = None   # PlayerBackend for this device, chosen on first cast
+    link_jobs = {}  # Episode URL -> Future of its playable link, resolved ahead by preload_next
+
+    @staticmethod
+    def say(text, quiet=False):
+        """Progress line - background link jobs stay silent so they don't print over the prompt"""
+        if not quiet:
+            print(text)
+
     @staticmethod
     def get_direct_link(url):
-        """Extracts actual video stream from iframe-embedded players"""
-        print(f"{WuxiaTheme.JADE}  🔍 Deep scanning for {DEFAULT_QUALITY}p stream...{WuxiaTheme.RESET}")
+        """Resolve an episode to a URL an external player can open"""
+        print(f"{WuxiaTheme.JADE}  🔍 Deep scanning for {current_quality()}p stream...{WuxiaTheme.RESET}")
+        
+        # A preload job still queued is dropped; one already digging is joined
+        job = CultivationEngine.link_jobs.pop(url, None)
+        if job and not job.cancel():
+            try:
+                link = ExtractionScheduler.run_foreground(job.result, key=f"link:{url}")
+                if link != url and CultivationEngine.is_ready(url):
+                    print(f"{WuxiaTheme.JADE}  ✓ Preloaded stream{WuxiaTheme.RESET}")
+                    return link
+            except Exception:
+                pass
         
         try:
-            # Step 1: Fetch the episode page
-            r = requests.get(url, headers=Config.HEADERS, timeout=15)
-            html = r.text
-            print(f"{WuxiaTheme.JADE}  📄 Fetched episode page ({len(html)} bytes){WuxiaTheme.RESET}")
-            
-            # Step 2: Look for Dailymotion embeds first
-            dm_patterns = [
-                r'geo\.dailymotion\.com/player/([^.]+)\.js["\'][^>]*data-video=["\']([^"\']+)["\']',
-                r'geo\.dailymotion\.com/player/([^.]+)\.html\?video=([^"\'&\s]+)',
-                r'dailymotion\.com/(?:video|embed)/([a-zA-Z0-9]+)'
-            ]
-            
-            for pattern in dm_patterns:
-                match = re.search(pattern, html)
-                if match:
-                    video_id = match.groups()[-1]  # Get video ID
-                    print(f"{WuxiaTheme.JADE}  📺 Found Dailymotion video: {video_id}{WuxiaTheme.RESET}")
-                    return CultivationEngine.extract_dailymotion_stream(video_id, url)
-            
-            # Step 3: Look for iframe embeds
-            iframe_pattern = r'<iframe[^>]+src=["\']([^"\']+)["\'][^>]*>'
-            iframe_match = re.search(iframe_pattern, html)
-            if iframe_match:
-                iframe_src = iframe_match.group(1)
-                # Skip decoy iframes
-                if any(skip in iframe_src.lower() for skip in ['bitcoin', 'crypto', 'ads', 'blogspot']):
-                    print(f"{WuxiaTheme.RED}  ⚠ Skipping decoy iframe{WuxiaTheme.RESET}")
-                else:
-                    print(f"{WuxiaTheme.JADE}  🎬 Found iframe: {iframe_src[:50]}...{WuxiaTheme.RESET}")
-                    return CultivationEngine.extract_from_iframe(iframe_src, url)
-            
-            # Step 4: Fallback to yt-dlp
-            print(f"{WuxiaTheme.RED}  ⚠ No embeds found, trying yt-dlp fallback...{WuxiaTheme.RESET}")
-            return CultivationEngine.fallback_ytdlp(url)
-            
+            # Shared stream cache, all server mirrors ranked by latency
+            return CultivationEngine.resolve_link(url, StreamExtractor.get_preloader().get_entry(url))
         except Exception as e:
             print(f"{WuxiaTheme.RED}  ⚠ Error: {e}{WuxiaTheme.RESET}")
             return url
 
     @staticmethod
-    def extract_dailymotion_stream(video_id, referer):
-        """Extract Dailymotion stream URL with 360p preference"""
-        try:
-            metadata_url = f"https://www.dailymotion.com/player/metadata/video/{video_id}"
-            headers = {"Referer": referer, **Config.HEADERS}
-            meta = requests.get(metadata_url, headers=headers, timeout=15).json()
-            
-            qualities = meta.get("qualities", {})
-            # Try 360p first, then fall back to other qualities
-            preferred_order = ["380", "360", "480", "240", "auto"]
-            
-            for q in preferred_order:
-                if q in qualities:
-                    for item in qualities[q]:
-                        if item.get("type") == "application/x-mpegURL":
-                            print(f"{WuxiaTheme.JADE}  ✓ Found {q}p Dailymotion stream{WuxiaTheme.RESET}")
-                            return item.get("url")
-            
-            # Ultimate fallback to auto
-            if "auto" in qualities:
-                for item in qualities["auto"]:
-                    if item.get("type") == "application/x-mpegURL":
-                        print(f"{WuxiaTheme.JADE}  ✓ Found auto Dailymotion stream{WuxiaTheme.RESET}")
-                        return item.get("url")
-            
-            print(f"{WuxiaTheme.RED}  ⚠ No Dailymotion stream found{WuxiaTheme.RESET}")
-            return referer
-            
-        except Exception as e:
-            print(f"{WuxiaTheme.RED}  ⚠ Dailymotion extraction failed: {e}{WuxiaTheme.RESET}")
-            return referer
+    def resolve_link(url, entry, quiet=False):
+        """First playable link among an entry's mirrors, else whatever yt-dlp finds"""
+        for candidate in [entry] + entry.get("fallbacks", []):
+            link = CultivationEngine.playable_link(candidate, url, quiet)
+            if link:
+                return link
+        
+        CultivationEngine.say(f"{WuxiaTheme.RED}  ⚠ No playable mirror, trying yt-dlp fallback...{WuxiaTheme.RESET}", quiet)
+        return CultivationEngine.fallback_ytdlp(url, quiet)
 
     @staticmethod
-    def extract_from_iframe(iframe_src, referer_url):
+    def playable_link(entry, referer, quiet=False):
+        """Direct media URL for one mirror - Android players can't open embed pages"""
+        variant = VariantSelector.pick(entry["variants"], DEFAULT_QUALITY, FALLBACK_QUALITY)
+        if variant:
+            label = f"{variant['height']}p" if variant["height"] else "auto"
+            CultivationEngine.say(f"{WuxiaTheme.JADE}  ✓ Found {label} stream{WuxiaTheme.RESET}", quiet)
+            return variant["url"]
+        if entry["url"].split("?")[0].endswith((".m3u8", ".mp4", ".mkv")):
+            return entry["url"]
+        if entry["url"] == referer:
+            return None
+        
+        CultivationEngine.say(f"{WuxiaTheme.JADE}  🎬 Digging into embed: {entry['url'][:50]}...{WuxiaTheme.RESET}", quiet)
+        link = CultivationEngine.extract_from_iframe(entry["url"], referer, quiet)
+        return link if link != referer else None
+
+    @staticmethod
+    def extract_from_iframe(iframe_src, referer_url, quiet=False):
         """Extract stream URL from iframe page"""
         try:
             # Make absolute URL if needed
@@ -138,7 +125,7 @@ class CultivationEngine:
             
             # Fetch iframe content
             headers = {"Referer": referer_url, **Config.HEADERS}
-            r = requests.get(iframe_src, headers=headers, timeout=10)
+            r = HttpClient.get(iframe_src, headers=headers, timeout=10)
             iframe_html = r.text
             
             # Look for stream URLs in JavaScript
@@ -154,206 +141,71 @@ class CultivationEngine:
                 matches = re.findall(pattern, iframe_html, re.IGNORECASE)
                 for match in matches:
                     if match.startswith("http") and len(match) > 20:
-                        print(f"{WuxiaTheme.JADE}  ✓ Found stream in iframe{WuxiaTheme.RESET}")
-                        return match
-            
-            # Check for Dailymotion in iframe
-            dm_patterns = [
-                r'geo\.dailymotion\.com/player/([^.]+)\.js["\'][^>]*data-video=["\']([^"\']+)["\']',
-                r'geo\.dailymotion\.com/player/([^.]+)\.html\?video=([^"\'&\s]+)',
-                r'dailymotion\.com/(?:video|embed)/([a-zA-Z0-9]+)'
-            ]
-            
-            for pattern in dm_patterns:
-                match = re.search(pattern, iframe_html)
-                if match:
-                    video_id = match.groups()[-1]
-                    print(f"{WuxiaTheme.JADE}  📺 Found Dailymotion in iframe: {video_id}{WuxiaTheme.RESET}")
-                    return CultivationEngine.extract_dailymotion_stream(video_id, iframe_src)
+                        CultivationEngine.say(f"{WuxiaTheme.JADE}  ✓ Found stream in iframe{WuxiaTheme.RESET}", quiet)
+                        variants = VariantSelector.resolve(match, iframe_src)
+                        variant = VariantSelector.pick(variants, DEFAULT_QUALITY, FALLBACK_QUALITY)
+                        return variant["url"] if variant else match
             
-            print(f"{WuxiaTheme.RED}  ⚠ No stream found in iframe{WuxiaTheme.RESET}")
+            CultivationEngine.say(f"{WuxiaTheme.RED}  ⚠ No stream found in iframe{WuxiaTheme.RESET}", quiet)
             return referer_url
             
         except Exception as e:
-            print(f"{WuxiaTheme.RED}  ⚠ Iframe extraction failed: {e}{WuxiaTheme.RESET}")
+            CultivationEngine.say(f"{WuxiaTheme.RED}  ⚠ Iframe extraction failed: {e}{WuxiaTheme.RESET}", quiet)
             return referer_url
 
     @staticmethod
-    def fallback_ytdlp(url):
-        """Fallback to yt-dlp extraction"""
-        try:
-            cmd = [
-                "yt-dlp", "-g", 
-                "-f", f"best[height<={DEFAULT_QUALITY}]/worst",
-                "--no-check-certificate", 
-                "--socket-timeout", "15", 
-                "--user-agent", Config.HEADERS["User-Agent"], 
-                url
-            ]
-            result = subprocess.run(
-                cmd,
-                capture_output=True, 
-                text=True, 
-                timeout=30
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                streams = result.stdout.strip().split('\n')
-                for stream in streams:
-                    if stream and ('m3u8' in stream or 'mp4' in stream):
-                        print(f"{WuxiaTheme.JADE}  ✓ yt-dlp found stream{WuxiaTheme.RESET}")
-                        return stream
-                if streams:
-                    print(f"{WuxiaTheme.JADE}  ✓ yt-dlp fallback{WuxiaTheme.RESET}")
-                    return streams[0]
-            
-            print(f"{WuxiaTheme.RED}  ⚠ yt-dlp failed completely{WuxiaTheme.RESET}")
-            return url
-            
-        except Exception as e:
-            print(f"{WuxiaTheme.RED}  ⚠ yt-dlp fallback failed: {e}{WuxiaTheme.RESET}")
-            return url
+    def fallback_ytdlp(url, quiet=False):
+        """Fallback to yt-dlp extraction (kept loaded in-process when installed)"""
+        streams = YtdlpWorker.get_urls(url, fmt=f"best[height<={current_quality()}]/worst", timeout=15)
+        for stream in streams:
+            if 'm3u8' in stream or 'mp4' in stream:
+                CultivationEngine.say(f"{WuxiaTheme.JADE}  ✓ yt-dlp found stream{WuxiaTheme.RESET}", quiet)
+                return stream
+        if streams:
+            CultivationEngine.say(f"{WuxiaTheme.JADE}  ✓ yt-dlp fallback{WuxiaTheme.RESET}", quiet)
+            return streams[0]
+        
+        CultivationEngine.say(f"{WuxiaTheme.RED}  ⚠ yt-dlp failed completely{WuxiaTheme.RESET}", quiet)
+        return url
 
     @staticmethod
-    def fallback_extract(url):
-        """Fallback extraction for Dailymotion embeds with 360p preference"""
-        try:
-            r = requests.get(url, headers=Config.HEADERS, timeout=15)
-            html = r.text
-            
-            dm_match = re.search(r'data-video=["\']([^"\']+)["\']', html)
-            if dm_match:
-                video_id = dm_match.group(1)
-                print(f"{WuxiaTheme.JADE}  📺 Found Dailymotion: {video_id}{WuxiaTheme.RESET}")
-                
-                meta_url = f"https://www.dailymotion.com/player/metadata/video/{video_id}"
-                meta = requests.get(meta_url, headers=Config.HEADERS, timeout=15).json()
-                
-                qualities = meta.get("qualities", {})
-                
-                # Try 360p first, then fall back to other qualities
-                preferred_order = ["380", "360", "480", "240", "auto"]
-                for q in preferred_order:
-                    if q in qualities:
-                        for item in qualities[q]:
-                            if item.get("type") == "application/x-mpegURL":
-                                print(f"{WuxiaTheme.JADE}  ✓ Using {q}p stream{WuxiaTheme.RESET}")
-                                return item.get("url", url)
-                
-                # Ultimate fallback
-                if "auto" in qualities:
-                    for item in qualities["auto"]:
-                        if item.get("type") == "application/x-mpegURL":
-                            return item.get("url", url)
-            return url
-        except:
-            return url
+    def preload_next(episodes, current_idx):
+        """Resolve the next episodes in the background while the phone's player is up
+        
+        The next episode's playable link is dug out too, so pressing n only hands it to the player.
+        """
+        if current_idx >= len(episodes) - 1:
+            return
+        preloader = StreamExtractor.get_preloader()
+        preloader.preload_episodes(episodes, current_idx)
+        
+        next_url = episodes[current_idx + 1][1]
+        for url in [u for u in CultivationEngine.link_jobs if u != next_url]:
+            CultivationEngine.link_jobs.pop(url).cancel()
+        if next_url not in CultivationEngine.link_jobs:
+            def job():
+                entry = preloader.flight.do(next_url, lambda: preloader.fetch_entry(next_url))
+                return CultivationEngine.resolve_link(next_url, entry, quiet=True)
+            CultivationEngine.link_jobs[next_url] = ExtractionScheduler.submit(
+                ExtractionScheduler.NEXT, job, SourceHealth.host(next_url), key=f"link:{next_url}")
 
     @staticmethod
-    def detect_os():
-        """Detect operating system (ani-cli style)"""
-        import platform
-        uname = platform.uname()
-        system_info = f"{uname.system} {uname.release}".lower()
-        
-        if "android" in system_info or os.path.exists("/data/data/com.termux"):
-            return "android"
-        elif "ish" in system_info or os.path.exists("/proc/ish"):
-            return "ish"  # iOS iSH
-        else:
-            return "linux"
+    def is_ready(url):
+        """Is this episode already resolved (cached and not expired)?"""
+        return StreamExtractor.get_preloader().cache.get(url) is not None
 
     @staticmethod
     def cast_intent(video_url, title="Donghua", referer=None):
-        """Launch video in player (ani-cli style)"""
-        os_type = CultivationEngine.detect_os()
-        sanitized_url = video_url.replace(" ", "%20")
-        
-        if os_type == "android":
-            print(f"{WuxiaTheme.GOLD}  ⚡ Launching Android Player...{WuxiaTheme.RESET}")
-            
-            # ani-cli style: Try MPV first, then VLC, then MX Player, then generic
-            players = [
-                # MPV for Android (ani-cli default)
-                f"am start --user 0 -a android.intent.action.VIEW -d '{sanitized_url}' -n is.xyz.mpv/.MPVActivity",
-                # VLC for Android (with title extra)
-                f"am start --user 0 -a android.intent.action.VIEW -d '{sanitized_url}' -n org.videolan.vlc/org.videolan.vlc.gui.video.VideoPlayerActivity -e 'title' '{title}'",
-                # MX Player
-                f"am start --user 0 -a android.intent.action.VIEW -d '{sanitized_url}' -n com.mxtech.videoplayer.ad/com.mxtech.videoplayer.ActivityScreen -e 'title' '{title}'",
-                # MX Player Pro
-                f"am start --user 0 -a android.intent.action.VIEW -d '{sanitized_url}' -n com.mxtech.videoplayer.pro/com.mxtech.videoplayer.ActivityScreen -e 'title' '{title}'",
-                # Generic intent (fallback)
-                f"am start --user 0 -a android.intent.action.VIEW -d '{sanitized_url}' -t 'video/*'",
-            ]
-            
-            for cmd in players:
-                result = subprocess.run(cmd, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                if result.returncode == 0:
-                    print(f"{WuxiaTheme.JADE}  ✓ Player launched!{WuxiaTheme.RESET}")
-                    return True
-            
-            # Ultimate fallback: termux-open-url
-            print(f"{WuxiaTheme.SILVER}  🔄 Trying termux-open-url...{WuxiaTheme.RESET}")
-            subprocess.run(f"termux-open-url '{sanitized_url}'", shell=True)
-            return True
-            
-        elif os_type == "ish":
-            # iOS iSH: Print clickable VLC link (ani-cli style)
-            print(f"{WuxiaTheme.GOLD}  📱 iOS Detected - Tap the link below:{WuxiaTheme.RESET}")
-            print(f"\033]8;;vlc://{sanitized_url}\a")
-            print(f"{WuxiaTheme.JADE}~~~~~~~~~~~~~~~~~~~~{WuxiaTheme.RESET}")
-            print(f"{WuxiaTheme.GOLD}~ Tap to open VLC ~{WuxiaTheme.RESET}")
-            print(f"{WuxiaTheme.JADE}~~~~~~~~~~~~~~~~~~~~{WuxiaTheme.RESET}")
-            print(f"\033]8;;\a")
-            time.sleep(3)
-            return True
-            
-        else:
-            # Linux: Use mpv or vlc
-            print(f"{WuxiaTheme.GOLD}  ⚡ Launching Desktop Player...{WuxiaTheme.RESET}")
-            
-            # Try mpv first
-            try:
-                subprocess.Popen(
-                    ["mpv", f"--force-media-title={title}", video_url],
-                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-                )
-                print(f"{WuxiaTheme.JADE}  ✓ MPV launched!{WuxiaTheme.RESET}")
-                return True
-            except FileNotFoundError:
-                pass
-            
-            # Try VLC
-            try:
-                refr_arg = f"--http-referrer={referer}" if referer else ""
-                subprocess.Popen(
-                    ["vlc", video_url, refr_arg, "--play-and-exit", f"--meta-title={title}"],
-                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-                )
-                print(f"{WuxiaTheme.JADE}  ✓ VLC launched!{WuxiaTheme.RESET}")
-                return True
-            except FileNotFoundError:
-                print(f"{WuxiaTheme.RED}  ✗ No player found! Install mpv or vlc{WuxiaTheme.RESET}")
-                print(f"{WuxiaTheme.SILVER}  Stream URL: {video_url}{WuxiaTheme.RESET}")
-                return False
+        """Launch video in this device's player (Android intent, iSH VLC link, mpv)"""
+        if CultivationEngine.player is None:
+            CultivationEngine.player = PlayerBackend.for_platform()
+        return CultivationEngine.player.launch(video_url, title=title, referer=referer)
 
 class Scraper:
     @staticmethod
     def search(query):
-        search_url = f"https://luciferdonghua.in/?s={query.replace(' ', '+')}"
         try:
-            r = requests.get(search_url, headers=Config.HEADERS, timeout=15)
-            soup = BeautifulSoup(r.text, 'html.parser')
-            results = []
-            
-            seen = set()
-            for article in soup.select("article.bs, div.bsx, div.bs"):
-                a = article.find("a")
-                if a and a.get('href') and a.get('href') not in seen:
-                    seen.add(a.get('href'))
-                    title = a.get('title') or a.text.strip()
-                    results.append((title, a.get('href')))
-            
-            return results[:15]
+            return Scraper.realm().search(query)
         except Exception as e:
             print(f"{WuxiaTheme.RED}✗ Search failed: {e}{WuxiaTheme.RESET}")
             return []
@@ -361,40 +213,29 @@ class Scraper:
     @staticmethod
     def get_all_episodes(series_url):
         try:
-            r = requests.get(series_url, headers=Config.HEADERS, timeout=15)
-            soup = BeautifulSoup(r.text, 'html.parser')
-            episodes = []
-            
-            for li in soup.select(".eplister ul li, .episodelist ul li"):
-                a = li.find("a")
-                if not a:
-                    continue
-                    
-                num_el = li.find(class_="epl-num") or li.find("span", class_="num")
-                title_el = li.find(class_="epl-title") or li.find("span", class_="title")
-                
-                num = num_el.text.strip() if num_el else ""
-                title = title_el.text.strip() if title_el else ""
-                
-                display_name = f"Episode {num}" if num else "Episode"
-                if title:
-                    display_name += f" - {title}"
-                
-                episodes.append((display_name, a.get('href')))
-            
-            if episodes:
-                episodes.reverse()
-            
-            return episodes
+            return Scraper.realm().get_episodes(series_url)
         except Exception as e:
             print(f"{WuxiaTheme.RED}✗ Failed to fetch episodes: {e}{WuxiaTheme.RESET}")
             return []
 
+    @staticmethod
+    def realm():
+        """Desktop scraper for LuciferDonghua - catalog search, episode dedup and caching included"""
+        return CoreScraper.shared("ld")
+
 # ============================================================================
 # MAIN INTERFACE
 # ============================================================================
+def episode_page_size(chrome_rows):
+    """Episodes per page that fit below chrome_rows of header (20 when not a terminal)"""
+    try:
+        rows = os.get_terminal_size().lines
+    except OSError:
+        return 20
+    return max(5, rows - chrome_rows - Screen.PROMPT_ROWS)
+
 def main():
-    Config.setup()
+    HttpClient.prewarm()  # Sources are on hot connections by the time a query is typed
     print(WuxiaTheme.banner())
     
     query = input(f"{WuxiaTheme.GOLD}📜 Enter Series Name: {WuxiaTheme.RESET}").strip()
@@ -409,9 +250,10 @@ def main():
         print(f"{WuxiaTheme.RED}✗ No results found.{WuxiaTheme.RESET}")
         return
 
-    print(f"\n{WuxiaTheme.GOLD}━━━ SEARCH RESULTS ━━━{WuxiaTheme.RESET}")
-    for i, (title, _) in enumerate(results, 1):
-        print(f"  {WuxiaTheme.JADE}{i:2}.{WuxiaTheme.WHITE} {title[:55]}{'...' if len(title) > 55 else ''}")
+    Screen.render(WuxiaTheme.header().split("\n") + ["", f"{WuxiaTheme.GOLD}━━━ SEARCH RESULTS ━━━{WuxiaTheme.RESET}"] + [
+        f"  {WuxiaTheme.JADE}{i:2}.{WuxiaTheme.WHITE} {title[:55]}{'...' if len(title) > 55 else ''}{WuxiaTheme.RESET}"
+        for i, (title, _) in enumerate(results, 1)
+    ], width=WuxiaTheme.WIDTH)
 
     try:
         choice = input(f"\n{WuxiaTheme.GOLD}Select [1-{len(results)}]: {WuxiaTheme.RESET}").strip()
@@ -425,6 +267,7 @@ def main():
             
         series_name, series_url = results[choice]
         
+        Screen.release()
         print(f"\n{WuxiaTheme.JADE}  📜 Loading episodes...{WuxiaTheme.RESET}")
         episodes = Scraper.get_all_episodes(series_url)
 
@@ -432,33 +275,39 @@ def main():
             print(f"{WuxiaTheme.RED}✗ No episodes found.{WuxiaTheme.RESET}")
             return
 
-        print(f"\n{WuxiaTheme.GOLD}━━━ {series_name[:40]} ━━━{WuxiaTheme.RESET}")
-        print(f"{WuxiaTheme.SILVER}  Total: {len(episodes)} episodes | Quality: {DEFAULT_QUALITY}p{WuxiaTheme.RESET}\n")
-        
-        page_size = 20
+        chrome = WuxiaTheme.header().split("\n") + [
+            "",
+            f"{WuxiaTheme.GOLD}━━━ {series_name[:40]} ━━━{WuxiaTheme.RESET}",
+            f"{WuxiaTheme.SILVER}  Total: {len(episodes)} episodes | Quality: {current_quality()}p{WuxiaTheme.RESET}",
+            "",
+        ]
+        page_size = episode_page_size(len(chrome) + 2)
         total_pages = (len(episodes) + page_size - 1) // page_size
         current_page = 0
         
+        redraw = True
         while True:
-            start = current_page * page_size
-            end = min(start + page_size, len(episodes))
-            
-            for i in range(start, end):
-                name = episodes[i][0].split(" - ")[0]
-                print(f"  {WuxiaTheme.SILVER}{i+1:03d}.{WuxiaTheme.RESET} {name}")
-            
-            if total_pages > 1:
-                print(f"\n{WuxiaTheme.JADE}  Page {current_page + 1}/{total_pages} [n=next, p=prev]{WuxiaTheme.RESET}")
+            if redraw:
+                start = current_page * page_size
+                end = min(start + page_size, len(episodes))
+                lines = chrome + [f"  {WuxiaTheme.SILVER}{i+1:03d}.{WuxiaTheme.RESET} {episodes[i][0].split(' - ')[0][:55]}"
+                                  for i in range(start, end)]
+                if total_pages > 1:
+                    lines += ["", f"{WuxiaTheme.JADE}  Page {current_page + 1}/{total_pages} [n=next, p=prev]{WuxiaTheme.RESET}"]
+                Screen.render(lines, width=WuxiaTheme.WIDTH)
+            redraw = False
             
             ep_input = input(f"\n{WuxiaTheme.GOLD}Episode # (q=quit): {WuxiaTheme.RESET}").strip().lower()
             
             if ep_input == 'q':
                 return
-            elif ep_input == 'n' and current_page < total_pages - 1:
-                current_page += 1
-                continue
-            elif ep_input == 'p' and current_page > 0:
-                current_page -= 1
+            elif ep_input in ('n', 'p'):
+                step = 1 if ep_input == 'n' else -1
+                if 0 <= current_page + step < total_pages:
+                    current_page += step
+                    redraw = True
+                else:
+                    print(f"{WuxiaTheme.RED}✗ Already on the {'last' if step > 0 else 'first'} page.{WuxiaTheme.RESET}")
                 continue
             
             try:
@@ -469,21 +318,25 @@ def main():
             except ValueError:
                 print(f"{WuxiaTheme.RED}✗ Enter a number.{WuxiaTheme.RESET}")
         
+        Screen.release()
         ep_title = f"{series_name} - {episodes[ep_choice][0]}"
-        print(f"\n{WuxiaTheme.JADE}  ⚔️ Loading {DEFAULT_QUALITY}p stream...{WuxiaTheme.RESET}")
+        print(f"\n{WuxiaTheme.JADE}  ⚔️ Loading {current_quality()}p stream...{WuxiaTheme.RESET}")
         direct_link = CultivationEngine.get_direct_link(episodes[ep_choice][1])
-        CultivationEngine.cast_intent(direct_link, title=ep_title)
+        CultivationEngine.cast_intent(direct_link, title=ep_title, referer=episodes[ep_choice][1])
+        CultivationEngine.preload_next(episodes, ep_choice)
         
         while True:
             next_input = input(f"\n{WuxiaTheme.GOLD}[n]ext, [r]eplay, [q]uit: {WuxiaTheme.RESET}").strip().lower()
             if next_input == 'n' and ep_choice < len(episodes) - 1:
                 ep_choice += 1
                 ep_title = f"{series_name} - {episodes[ep_choice][0]}"
-                print(f"\n{WuxiaTheme.JADE}  ⚔️ Next: {episodes[ep_choice][0]}{WuxiaTheme.RESET}")
+                ready = " (preloaded)" if CultivationEngine.is_ready(episodes[ep_choice][1]) else ""
+                print(f"\n{WuxiaTheme.JADE}  ⚔️ Next: {episodes[ep_choice][0]}{ready}{WuxiaTheme.RESET}")
                 direct_link = CultivationEngine.get_direct_link(episodes[ep_choice][1])
-                CultivationEngine.cast_intent(direct_link, title=ep_title)
+                CultivationEngine.cast_intent(direct_link, title=ep_title, referer=episodes[ep_choice][1])
+                CultivationEngine.preload_next(episodes, ep_choice)
             elif next_input == 'r':
-                CultivationEngine.cast_intent(direct_link, title=ep_title)
+                CultivationEngine.cast_intent(direct_link, title=ep_title, referer=episodes[ep_choice][1])
             elif next_input == 'q':
                 break
 
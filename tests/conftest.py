@@ -0,0 +1,22 @@
+"""Shared fixtures - every test gets its own cache directory and fresh class-level state"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dhua  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Point every cache file at tmp_path and reset the state classes keep between calls"""
+    monkeypatch.setattr(dhua.Config, "CACHE_DIR", str(tmp_path))
+    for name in ("STREAM_CACHE_FILE", "NETWORK_PROFILE_FILE", "SOURCE_HEALTH_FILE",
+                 "CATALOG_FILE", "DATA_USAGE_FILE"):
+        monkeypatch.setattr(dhua.Config, name, str(tmp_path / os.path.basename(getattr(dhua.Config, name))))
+    monkeypatch.setattr(dhua.NetworkMonitor, "_profiles", None)
+    monkeypatch.setattr(dhua.NetworkMonitor, "_network", "test-net")
+    monkeypatch.setattr(dhua.NetworkMonitor, "_last_save", 0.0)
+    return tmp_path
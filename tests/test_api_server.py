@@ -0,0 +1,84 @@
+import json
+import socket
+import threading
+import time
+import urllib.request
+
+import pytest
+
+from dhua import ApiServer, DaemonClient
+
+SERIES = "https://luciferdonghua.in/anime/re:zero/"
+SLASHED = "https://luciferdonghua.in/anime/fate%2Fstay-night/"
+EPISODES = [
+    ("Episode 1", "https://luciferdonghua.in/re-zero-episode-1/"),
+    ("Episode 2", "https://luciferdonghua.in/?p=1234&ep=2"),
+    ("Episode 3", "https://mirror.example.net/watch/re:zero/3"),
+]
+
+
+class FakeBackend:
+    def __init__(self):
+        self.requests = []
+
+    def handle(self, request):
+        self.requests.append(request)
+        if request["op"] == "episodes":
+            return EPISODES
+        return []
+
+    class preloader:
+        @staticmethod
+        def stop():
+            pass
+
+
+@pytest.fixture
+def api():
+    server = ApiServer.__new__(ApiServer)
+    server.backend = FakeBackend()
+    server.quality = "auto"
+    return server
+
+
+@pytest.mark.parametrize("url", [SERIES, SLASHED] + [url for _, url in EPISODES])
+def test_ids_round_trip_to_the_exact_url(url):
+    item_id = ApiServer.item_id(url)
+    assert "/" not in item_id
+    assert ApiServer.url_for(item_id)[1] == url
+
+
+def test_unknown_ids_are_rejected():
+    with pytest.raises(KeyError):
+        ApiServer.url_for("xx:anything")
+    with pytest.raises(KeyError):
+        ApiServer.url_for("ld:")
+
+
+@pytest.fixture
+def served(api, monkeypatch):
+    monkeypatch.setattr(DaemonClient, "disabled", False)
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    threading.Thread(target=api.serve, args=("127.0.0.1", port), daemon=True).start()
+    origin = f"http://127.0.0.1:{port}"
+    for _ in range(50):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.02)
+    return origin
+
+
+@pytest.mark.parametrize("series_url", [SERIES, SLASHED])
+def test_series_ids_survive_the_episodes_route(api, served, series_url):
+    with urllib.request.urlopen(f"{served}/series/{ApiServer.item_id(series_url)}/episodes", timeout=5) as resp:
+        episodes = json.load(resp)
+
+    assert api.backend.requests[-1] == {"op": "episodes", "source": "ld", "url": series_url}
+    assert [episode["url"] for episode in episodes] == [url for _, url in EPISODES]
+    for episode in episodes:
+        assert episode["stream"] == f"/episodes/{episode['id']}/stream"
+        assert ApiServer.url_for(episode["id"])[1] == episode["url"]
@@ -0,0 +1,33 @@
+import json
+import os
+
+import pytest
+
+from dhua import Config, PrefetchPolicy, Utils
+
+
+def test_write_replaces_the_file_without_leaving_temp_files(tmp_path):
+    path = str(tmp_path / "state" / "data.json")
+    Utils.atomic_write_json(path, {"bytes": 1})
+    Utils.atomic_write_json(path, {"bytes": 2})
+    with open(path) as f:
+        assert json.load(f) == {"bytes": 2}
+    assert os.listdir(tmp_path / "state") == ["data.json"]
+
+
+def test_failed_write_keeps_the_previous_state(tmp_path):
+    path = str(tmp_path / "data.json")
+    Utils.atomic_write_json(path, {"bytes": 1})
+    with pytest.raises(TypeError):
+        Utils.atomic_write_json(path, {"bytes": object()})
+    with open(path) as f:
+        assert json.load(f) == {"bytes": 1}
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_state_files_are_written_atomically(monkeypatch):
+    written = []
+    monkeypatch.setattr(Utils, "atomic_write_json", staticmethod(lambda path, obj: written.append(path)))
+    monkeypatch.setattr(PrefetchPolicy, "_usage", {"date": "2000-01-01", "bytes": 0})
+    PrefetchPolicy.save()
+    assert written == [Config.DATA_USAGE_FILE]
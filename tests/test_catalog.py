@@ -0,0 +1,72 @@
+import time
+
+import pytest
+
+from dhua import Catalog, DaemonClient, Scraper
+
+SERIES = [
+    ["Battle Through the Heavens", "https://luciferdonghua.in/anime/btth/", []],
+    ["Soul Land 2: The Peerless Tang Sect", "https://luciferdonghua.in/anime/soul-land-2/", ["Douluo Dalu 2"]],
+    ["Renegade Immortal", "https://luciferdonghua.in/anime/renegade-immortal/", []],
+]
+
+
+@pytest.fixture(autouse=True)
+def catalog(monkeypatch):
+    monkeypatch.setattr(Catalog, "_data", {"ld": {"updated": time.time(), "series": SERIES}})
+    monkeypatch.setattr(Catalog, "_index", None)
+    monkeypatch.setattr(DaemonClient, "disabled", True)
+
+
+def titles(results):
+    return [title for title, _ in results]
+
+
+def test_exact_and_acronym_hits_score_highest():
+    assert Catalog.scored("battle through the heavens")[0][0] == 1.0
+    assert titles(Catalog.search("btth")) == ["Battle Through the Heavens"]
+
+
+def test_prefix_and_word_prefix_hits():
+    assert Catalog.scored("soul land")[0][0] == Catalog.PREFIX_SCORE
+    assert titles(Catalog.search("immortal"))[0] == "Renegade Immortal"
+
+
+def test_alternative_titles_are_searched():
+    assert titles(Catalog.search("douluo dalu")) == ["Soul Land 2: The Peerless Tang Sect"]
+
+
+def test_typos_still_match_by_trigrams():
+    score, title, _ = Catalog.scored("renegad immortl")[0]
+    assert title == "Renegade Immortal"
+    assert Catalog.MIN_SCORE <= score < Catalog.PREFIX_SCORE
+
+
+def test_unrelated_queries_find_nothing():
+    assert Catalog.search("qwxz") == []
+    assert Catalog.search("   ") == []
+
+
+def test_source_filter():
+    assert Catalog.search("btth", "ax") == []
+
+
+def test_scraper_trusts_only_exact_or_prefix_hits(monkeypatch):
+    scraper = Scraper("ld")
+    live = [("New Series", "https://luciferdonghua.in/anime/new-series/")]
+    calls = []
+    monkeypatch.setattr(scraper, "search_live", lambda query: calls.append(query) or live)
+
+    assert titles(scraper.search("btth")) == ["Battle Through the Heavens"]
+    assert calls == []
+
+    # A fuzzy hit alone may hide a newer series - the site is asked too, and both are kept
+    assert titles(scraper.search("renegad immortl")) == ["New Series", "Renegade Immortal"]
+    assert calls == ["renegad immortl"]
+
+
+def test_scraper_searches_live_when_catalog_is_stale(monkeypatch):
+    Catalog._data["ld"]["updated"] = 0
+    scraper = Scraper("ld")
+    monkeypatch.setattr(scraper, "search_live", lambda query: [])
+    assert titles(scraper.search("btth")) == ["Battle Through the Heavens"]
@@ -0,0 +1,51 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from dhua import DnsCache, HttpClient
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(DnsCache, "_entries", {})
+    monkeypatch.setattr(HttpClient, "_session", None)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_cached_address_is_dialled_but_host_is_kept(server):
+    DnsCache._entries[("cached.test", server)] = (time.monotonic(), ["127.0.0.1"])
+    resp = HttpClient.session().get(f"http://cached.test:{server}/", timeout=5)
+    assert resp.text == "ok"
+
+
+def test_refused_address_falls_through_to_the_next(server):
+    # Nothing listens on 127.0.0.2, so the first address refuses the connection
+    DnsCache._entries[("cached.test", server)] = (time.monotonic(), ["127.0.0.2", "127.0.0.1"])
+    resp = HttpClient.session().get(f"http://cached.test:{server}/", timeout=5)
+    assert resp.text == "ok"
+    # The dead address moves behind the live one for later connections
+    assert DnsCache._entries[("cached.test", server)][1] == ["127.0.0.1", "127.0.0.2"]
+
+
+def test_connection_fails_only_after_every_address(server):
+    import requests
+    DnsCache._entries[("cached.test", server)] = (time.monotonic(), ["127.0.0.2", "127.0.0.3"])
+    with pytest.raises(requests.exceptions.ConnectionError):
+        HttpClient.session().get(f"http://cached.test:{server}/", timeout=5)
@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+from dhua import Config, ExtractionScheduler
+
+HOST = "ld.example"
+
+
+@pytest.fixture(autouse=True)
+def scheduler(monkeypatch):
+    # Fresh queue and a single worker, so the run order is deterministic
+    monkeypatch.setattr(ExtractionScheduler, "_cond", threading.Condition())
+    monkeypatch.setattr(ExtractionScheduler, "_queue", [])
+    monkeypatch.setattr(ExtractionScheduler, "_workers", 0)
+    monkeypatch.setattr(ExtractionScheduler, "_foreground", 0)
+    monkeypatch.setattr(ExtractionScheduler, "_host_active", {})
+    monkeypatch.setattr(ExtractionScheduler, "_running", {})
+    monkeypatch.setattr(ExtractionScheduler, "PREEMPT_WAIT", 5)
+    monkeypatch.setattr(Config, "EXTRACTION_WORKERS", 1)
+
+
+def blocker():
+    """Submit a BULK job that holds the only worker until the returned event is set"""
+    started, release = threading.Event(), threading.Event()
+
+    def job():
+        started.set()
+        release.wait(5)
+    future = ExtractionScheduler.submit(ExtractionScheduler.BULK, job, HOST, key="blocker")
+    assert started.wait(5)
+    return release, future
+
+
+def test_higher_lanes_run_first():
+    release, _ = blocker()
+    order = []
+    bulk = ExtractionScheduler.submit(ExtractionScheduler.BULK, lambda: order.append("bulk"), HOST)
+    following = ExtractionScheduler.submit(ExtractionScheduler.NEXT, lambda: order.append("next"), HOST)
+    release.set()
+    bulk.result(5)
+    following.result(5)
+    assert order == ["next", "bulk"]
+
+
+def test_promoted_bulk_job_runs_ahead_of_queued_bulk_work():
+    started, release, order = threading.Event(), threading.Event(), []
+
+    def series_job():
+        started.set()
+        release.wait(5)
+        ExtractionScheduler.checkpoint()  # Would pause PREEMPT_WAIT (5s) if not promoted
+        order.append("promoted")
+
+    promoted = ExtractionScheduler.submit(ExtractionScheduler.BULK, series_job, HOST, key="series")
+    assert started.wait(5)
+    queued = ExtractionScheduler.submit(ExtractionScheduler.BULK, lambda: order.append("queued"), HOST)
+
+    def wait_for_series():
+        release.set()
+        promoted.result(4)
+        return list(order)
+
+    assert ExtractionScheduler.run_foreground(wait_for_series, key="series") == ["promoted"]
+    queued.result(5)
+    assert order == ["promoted", "queued"]
+
+
+def test_unpromoted_job_pauses_at_checkpoint(monkeypatch):
+    monkeypatch.setattr(ExtractionScheduler, "PREEMPT_WAIT", 0.3)
+    ready, paused = threading.Event(), []
+
+    def job():
+        ready.set()
+        time.sleep(0.1)  # Foreground call below starts meanwhile
+        start = time.monotonic()
+        ExtractionScheduler.checkpoint()
+        paused.append(time.monotonic() - start)
+
+    future = ExtractionScheduler.submit(ExtractionScheduler.BULK, job, HOST, key="other")
+    assert ready.wait(5)
+    ExtractionScheduler.run_foreground(lambda: time.sleep(0.6), key="series")
+    future.result(5)
+    assert paused[0] >= 0.25
+
+
+def test_checkpoint_is_a_noop_outside_a_job(monkeypatch):
+    monkeypatch.setattr(ExtractionScheduler, "_foreground", 1)
+    start = time.monotonic()
+    ExtractionScheduler.checkpoint()
+    assert time.monotonic() - start < 0.1
+    assert ExtractionScheduler.current() is None
+
+
+def test_bind_carries_the_job_into_other_threads():
+    seen = []
+
+    def job():
+        child = threading.Thread(target=ExtractionScheduler.bind(lambda: seen.append(ExtractionScheduler.current())))
+        child.start()
+        child.join()
+        return ExtractionScheduler.current()
+
+    job_context = ExtractionScheduler.submit(ExtractionScheduler.NEXT, job, HOST, key="ep1").result(5)
+    assert job_context["key"] == "ep1"
+    assert seen == [job_context]
+    assert ExtractionScheduler.bind(len) is len  # Nothing to carry outside a job
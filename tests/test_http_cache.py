@@ -0,0 +1,38 @@
+import pytest
+
+from dhua import HttpCache
+
+EPISODE = "https://luciferdonghua.in/soul-land-2-episode-12/"   # No floor
+SERIES = "https://luciferdonghua.in/anime/soul-land-2/"          # 300s floor
+SEARCH = "https://luciferdonghua.in/?s=soul+land"                # 600s floor
+
+DATE = "Sun, 18 Oct 2026 12:00:00 GMT"
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({"Cache-Control": "max-age=120"}, (120.0, True)),
+    ({"Cache-Control": "public, s-maxage=900, max-age=60"}, (900.0, True)),
+    ({"Cache-Control": 'max-age="45"'}, (45.0, True)),
+    ({"Cache-Control": "s-maxage=, max-age=30"}, (30.0, True)),
+    ({"Cache-Control": "s-maxage="}, (0.0, True)),
+    ({"Cache-Control": "max-age=soon"}, (0.0, True)),
+    ({"Cache-Control": "no-cache, max-age=120"}, (0.0, True)),
+    ({"Cache-Control": "no-store"}, (0.0, False)),
+    ({"Expires": "Sun, 18 Oct 2026 12:10:00 GMT", "Date": DATE}, (600.0, True)),
+    ({"Expires": "0", "Date": DATE}, (0.0, True)),
+    ({"Last-Modified": "Sun, 18 Oct 2026 02:00:00 GMT", "Date": DATE}, (3600.0, True)),
+    ({"Last-Modified": "Sun, 01 Jan 2023 00:00:00 GMT", "Date": DATE}, (HttpCache.HEURISTIC_MAX, True)),
+    ({}, (0.0, True)),
+])
+def test_lifetime_from_headers(headers, expected):
+    assert HttpCache.lifetime(EPISODE, headers) == expected
+
+
+@pytest.mark.parametrize("url, headers, expected", [
+    (SERIES, {"Cache-Control": "no-store"}, (300, True)),
+    (SERIES, {"Cache-Control": "max-age=60"}, (300, True)),
+    (SERIES, {"Cache-Control": "max-age=7200"}, (7200.0, True)),
+    (SEARCH, {"Cache-Control": "no-cache"}, (600, True)),
+])
+def test_policy_floor_clamps_uncacheable_pages(url, headers, expected):
+    assert HttpCache.lifetime(url, headers) == expected
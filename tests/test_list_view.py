@@ -0,0 +1,126 @@
+import os
+
+import pytest
+
+from dhua import ListView, Screen, UserInterface
+
+EPISODES = [(f"Episode {n}", f"https://example.com/episode-{n}/") for n in range(1, 46)]
+
+
+def make_view(items=EPISODES, per_page=10, key=None):
+    return ListView(items, lambda i, item: item[0], key=key, per_page=per_page)
+
+
+def terminal(monkeypatch, lines):
+    monkeypatch.setattr(os, "get_terminal_size", lambda *args: os.terminal_size((80, lines)))
+
+
+def test_pages_and_visible_rows():
+    view = make_view()
+    assert view.pages == 5
+    assert view.page == 1
+    assert view.visible() == list(range(10))
+    assert make_view(items=[]).pages == 1
+
+
+def test_scroll_stops_at_either_end():
+    view = make_view()
+    assert not view.scroll(-1)
+    assert view.scroll(4)
+    assert view.page == 5
+    assert view.visible() == list(range(40, 45))
+    assert not view.scroll(1)
+    assert view.page == 5
+
+
+def test_navigate_warns_at_the_ends(capsys):
+    view = make_view()
+    assert view.navigate("p") is False
+    assert "first page" in capsys.readouterr().out
+    assert view.navigate("n") is True
+    view.scroll(3)
+    assert view.navigate("n") is False
+    assert "last page" in capsys.readouterr().out
+
+
+def test_navigate_ignores_other_input():
+    view = make_view()
+    assert view.navigate("12") is None
+    assert view.navigate("go") is None
+
+
+def test_jump_shows_the_page_holding_the_item(capsys):
+    view = make_view()
+    assert view.navigate("g 23") is True
+    assert view.page == 3
+    assert 22 in view.visible()
+    assert view.navigate("g 46") is False
+    assert "between 1 and 45" in capsys.readouterr().out
+
+
+def test_jump_drops_a_filter_that_hides_the_item():
+    view = make_view()
+    view.filter("episode 4")
+    assert view.jump(41)
+    assert view.query == "episode 4"
+    assert 40 in view.visible()
+    assert view.jump(12)
+    assert view.query == ""
+    assert view.page == 2
+    assert 11 in view.visible()
+
+
+def test_filter_narrows_incrementally_and_clears():
+    seen = []
+
+    def key(i, item):
+        seen.append(i)
+        return item[0].lower()
+
+    view = make_view(key=key)
+    view.navigate("/episode 1")
+    assert view.matches == [0] + list(range(9, 19))
+    assert view.top == 0
+
+    seen.clear()
+    view.navigate("/episode 12")
+    assert view.matches == [11]
+    assert seen == [0] + list(range(9, 19))  # Only the previous matches are searched
+
+    view.navigate("/")
+    assert view.matches == range(45)
+
+
+def test_filter_without_matches_shows_a_hint():
+    view = make_view()
+    view.filter("movie")
+    assert view.visible() == []
+    assert any("Nothing matches" in line for line in view.lines())
+
+
+def test_episode_key_includes_parsed_number_only_when_found():
+    assert UserInterface._episode_key(4, ("Episode 12", "https://example.com/episode-12/")).endswith("#5 #12")
+    assert UserInterface._episode_key(0, ("Special", "https://example.com/special/")) == "special #1"
+
+
+def test_window_rows_fill_the_terminal(monkeypatch):
+    terminal(monkeypatch, 40)
+    free = 40 - 10 - ListView.BOX_ROWS - Screen.PROMPT_ROWS
+    rows = ListView.window_rows(10)
+    # Every row plus one separator per five rows fits in the free space
+    assert rows + (rows - 1) // 5 <= free
+    assert ListView(EPISODES, lambda i, item: item[0], chrome=10).per_page == rows
+
+
+def test_fits_and_minimum_size_on_small_terminals(monkeypatch):
+    terminal(monkeypatch, 24)
+    assert not ListView.fits(20)
+    assert ListView(EPISODES, lambda i, item: item[0], chrome=20).per_page == ListView.MIN_ROWS
+
+
+def test_default_rows_without_a_terminal(monkeypatch):
+    def no_terminal(*args):
+        raise OSError
+
+    monkeypatch.setattr(os, "get_terminal_size", no_terminal)
+    assert ListView.window_rows(10) == ListView.DEFAULT_ROWS
@@ -0,0 +1,22 @@
+from dhua import MirrorRacer, StreamExtractor, VariantSelector
+
+DM = "https://www.dailymotion.com/video/x8abc"
+HLS = "https://cdn.example.com/ep1/master.m3u8"
+DEAD = "https://dead.example.com/ep1/master.m3u8"
+OK_RU = "https://ok.ru/videoembed/123"
+YOUTUBE = "https://www.youtube.com/embed/xyz"
+
+LATENCIES = {DM: 0.4, HLS: 0.1, DEAD: None}
+
+
+def test_unprobed_embeds_follow_ranked_mirrors_in_page_order(monkeypatch):
+    def resolve(url, referer):
+        return [{"url": url + "/720.m3u8", "height": 720, "bandwidth": 1}] if url == DM else []
+
+    monkeypatch.setattr(VariantSelector, "resolve", staticmethod(resolve))
+    monkeypatch.setattr(MirrorRacer, "probe_latency",
+                        staticmethod(lambda entry, referer: LATENCIES.get(entry["url"])))
+
+    ranked = StreamExtractor.rank_embeds([YOUTUBE, DM, DEAD, OK_RU, HLS], "https://example.com/ep1/")
+    assert [entry["url"] for entry in ranked] == [HLS, DM, YOUTUBE, OK_RU]
+    assert [entry.get("latency") for entry in ranked] == [0.1, 0.4, None, None]
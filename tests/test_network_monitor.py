@@ -0,0 +1,47 @@
+import json
+
+from dhua import Config, NetworkMonitor
+
+
+def test_first_sample_sets_throughput():
+    NetworkMonitor.record(1_000_000, 2.0)
+    assert NetworkMonitor.throughput() == 500_000
+
+
+def test_samples_blend_by_ewma():
+    NetworkMonitor.record(1_000_000, 1.0)
+    NetworkMonitor.record(2_000_000, 1.0)
+    alpha = NetworkMonitor.EWMA_ALPHA
+    assert NetworkMonitor.throughput() == alpha * 2_000_000 + (1 - alpha) * 1_000_000
+
+
+def test_small_or_instant_transfers_are_ignored():
+    NetworkMonitor.record(NetworkMonitor.MIN_SAMPLE_BYTES - 1, 0.1)
+    NetworkMonitor.record(1_000_000, 0)
+    assert NetworkMonitor.throughput() is None
+
+
+def test_profiles_are_kept_per_network(monkeypatch):
+    NetworkMonitor.record(1_000_000, 1.0)
+    monkeypatch.setattr(NetworkMonitor, "_network", "other-net")
+    assert NetworkMonitor.throughput() is None
+
+
+def test_saves_are_debounced_and_flushed_by_save(monkeypatch):
+    NetworkMonitor.record(1_000_000, 1.0)
+    with open(Config.NETWORK_PROFILE_FILE) as f:
+        assert json.load(f)["test-net"]["bps"] == 1_000_000
+
+    NetworkMonitor.record(2_000_000, 1.0)  # Within SAVE_INTERVAL - not written yet
+    with open(Config.NETWORK_PROFILE_FILE) as f:
+        assert json.load(f)["test-net"]["bps"] == 1_000_000
+
+    NetworkMonitor.save()
+    with open(Config.NETWORK_PROFILE_FILE) as f:
+        assert json.load(f)["test-net"]["bps"] == NetworkMonitor.throughput()
+
+
+def test_estimate_height_follows_throughput():
+    assert NetworkMonitor.estimate_height("480") == "480"
+    NetworkMonitor.record(1_000_000, 1.0)  # 8 Mbit/s carries 1080p's 5 Mbit/s with headroom
+    assert NetworkMonitor.estimate_height() == "1080"
@@ -0,0 +1,27 @@
+import subprocess
+
+from dhua import Config, MpvBackend, Player
+
+EPISODE = "https://example.com/soul-land-2-episode-12/"
+HLS = {"url": "https://cdn.example.com/ep12/index.m3u8", "variants": []}
+EMBED = {"url": "https://ok.ru/videoembed/123", "variants": []}
+
+
+def test_direct_targets_carry_referrer_and_user_agent():
+    cmd = Player("720").build_command(HLS, referer=EPISODE)
+    assert cmd[:3] == ["mpv", HLS["url"], "--no-ytdl"]
+    assert f"--referrer={EPISODE}" in cmd
+    assert f"--user-agent={Config.HEADERS['User-Agent']}" in cmd
+
+
+def test_embeds_are_left_to_the_ytdl_hook():
+    cmd = Player("720").build_command(EMBED, referer=EPISODE)
+    assert "--no-ytdl" not in cmd
+    assert not any(arg.startswith(("--referrer", "--user-agent")) for arg in cmd)
+
+
+def test_mpv_backend_passes_the_referer(monkeypatch):
+    launched = []
+    monkeypatch.setattr(subprocess, "Popen", lambda cmd, **kwargs: launched.append(cmd))
+    assert MpvBackend().launch(HLS["url"], title="Episode 12", referer=EPISODE)
+    assert f"--referrer={EPISODE}" in launched[0]
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from dhua import Config, ExtractionScheduler, HttpClient, PrefetchPolicy
+
+MB = 1024 * 1024
+
+
+@pytest.fixture(autouse=True)
+def policy(monkeypatch):
+    monkeypatch.setattr(PrefetchPolicy, "_usage", None)
+    monkeypatch.setattr(PrefetchPolicy, "_metered", True)
+    monkeypatch.setattr(PrefetchPolicy, "_mode", PrefetchPolicy.FRUGAL)
+    monkeypatch.setattr(PrefetchPolicy, "_last_save", 0.0)
+    monkeypatch.setattr(Config, "DAILY_DATA_BUDGET_MB", 1)
+
+
+class FakeResponse:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        return iter(self.chunks)
+
+
+def test_background_bytes_are_counted_against_the_budget():
+    PrefetchPolicy.record_background(1000)
+    PrefetchPolicy.record_background(24)
+    assert PrefetchPolicy.budget_left() == MB - 1024
+
+
+def test_unmetered_links_are_not_counted(monkeypatch):
+    monkeypatch.setattr(PrefetchPolicy, "_metered", False)
+    PrefetchPolicy.record_background(1000)
+    assert PrefetchPolicy.budget_left() == MB
+
+
+def test_exhausted_budget_turns_prefetching_off():
+    PrefetchPolicy.record_background(MB - 1)
+    assert PrefetchPolicy._mode == PrefetchPolicy.FRUGAL
+    PrefetchPolicy.record_background(1)
+    assert PrefetchPolicy._mode == PrefetchPolicy.OFF
+    assert PrefetchPolicy.budget_left() == 0
+
+
+def test_saves_are_debounced_and_flushed_by_save():
+    PrefetchPolicy.record_background(100)
+    PrefetchPolicy.record_background(200)
+    with open(Config.DATA_USAGE_FILE) as f:
+        assert json.load(f)["bytes"] == 100
+
+    PrefetchPolicy.save()
+    with open(Config.DATA_USAGE_FILE) as f:
+        assert json.load(f)["bytes"] == 300
+
+
+def test_usage_resets_on_a_new_day():
+    with open(Config.DATA_USAGE_FILE, 'w') as f:
+        json.dump({"date": "2000-01-01", "bytes": MB}, f)
+    assert PrefetchPolicy.budget_left() == MB
+
+
+def test_saved_usage_is_reloaded_for_today():
+    PrefetchPolicy.record_background(500)
+    PrefetchPolicy._usage = None
+    assert PrefetchPolicy.budget_left() == MB - 500
+
+
+def test_iter_body_charges_only_background_jobs():
+    chunks = [b"x" * 300, b"y" * 200]
+    assert list(HttpClient.iter_body(FakeResponse(chunks), 512)) == chunks
+    assert PrefetchPolicy.budget_left() == MB
+
+    token = ExtractionScheduler._job.set({"key": "preload"})
+    try:
+        assert list(HttpClient.iter_body(FakeResponse(chunks), 512)) == chunks
+        list(HttpClient.iter_body(FakeResponse(["é"]), 512, decode_unicode=True))
+    finally:
+        ExtractionScheduler._job.reset(token)
+    assert PrefetchPolicy.budget_left() == MB - 502
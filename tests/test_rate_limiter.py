@@ -0,0 +1,57 @@
+import pytest
+
+import dhua
+from dhua import Config, RateLimiter
+
+
+class FakeClock:
+    """monotonic()/sleep() pair - sleeping advances the clock instead of waiting"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(dhua.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(dhua.time, "sleep", fake.sleep)
+    monkeypatch.setattr(RateLimiter, "_buckets", {})
+    monkeypatch.setattr(Config, "RATE_LIMITS", {"paced.example": (2.0, 3)})
+    return fake
+
+
+def test_limits_match_subdomains_only(monkeypatch):
+    monkeypatch.setitem(Config.RATE_LIMITS, "paced.example", (1.0, 1))
+    assert RateLimiter.limit_for("cdn.paced.example") == (1.0, 1)
+    assert RateLimiter.limit_for("notpaced.example") is None
+
+
+def test_unlisted_hosts_are_not_paced(clock):
+    for _ in range(10):
+        assert RateLimiter.acquire("free.example") == 0.0
+    assert clock.slept == []
+
+
+def test_burst_then_waits_at_the_rate(clock):
+    for _ in range(3):
+        assert RateLimiter.acquire("paced.example") == 0.0
+    assert RateLimiter.acquire("paced.example") == pytest.approx(0.5)
+    assert RateLimiter.acquire("paced.example") == pytest.approx(0.5)
+
+
+def test_idle_time_refills_up_to_the_burst(clock):
+    for _ in range(3):
+        RateLimiter.acquire("paced.example")
+    clock.now += 60
+    for _ in range(3):
+        assert RateLimiter.acquire("paced.example") == 0.0
+    assert RateLimiter.acquire("paced.example") > 0
@@ -0,0 +1,21 @@
+from dhua import BeautifulSoup, Scraper
+
+EPISODE_LIST = """
+<div class="eplister"><ul>
+  <li><a href="https://example.com/soul-land-2-episode-12/">
+    <div class="epl-num">12</div><div class="epl-title">The Peerless Tang Sect</div>
+    <div class="epl-sub"><span>Sub</span></div><div class="epl-date">May 1, 2026</div>
+  </a></li>
+  <li><a href="https://example.com/soul-land-2-episode-11/"><div class="epl-num">11</div></a></li>
+  <li><a href="https://example.com/soul-land-2-episode-10/">Episode 10</a></li>
+</ul></div>
+"""
+
+
+def test_episode_titles_come_from_number_and_title_spans():
+    links = BeautifulSoup(EPISODE_LIST).select(".eplister a")
+    assert [Scraper.episode_title(a) for a in links] == [
+        "Episode 12 - The Peerless Tang Sect",
+        "Episode 11",
+        "Episode 10",
+    ]
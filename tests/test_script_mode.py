@@ -0,0 +1,72 @@
+import argparse
+import json
+from concurrent.futures import Future
+
+import pytest
+
+from dhua import Config, DonghuaCLI, StreamExtractor
+
+RESULTS = [("Soul Land 2", "https://example.com/anime/soul-land-2/")]
+EPISODES = [(f"Episode {n}", f"https://example.com/soul-land-2-episode-{n}/") for n in (1, 2, 3)]
+
+
+class FakePreloader:
+    class cache:
+        @staticmethod
+        def get_entry(url):
+            return None
+
+    @staticmethod
+    def schedule(url, lane):
+        future = Future()
+        if url.endswith("-2/"):
+            future.set_exception(RuntimeError("embed gone"))
+        else:
+            future.set_result({"url": url + "master.m3u8", "variants": []})
+        return future
+
+
+@pytest.fixture
+def cli(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "DOWNLOAD_DIR", str(tmp_path / "downloads"))
+    monkeypatch.setattr(StreamExtractor, "get_preloader", classmethod(lambda cls: FakePreloader))
+    app = DonghuaCLI()
+    monkeypatch.setattr(app, "search_all", lambda query, source: RESULTS)
+    monkeypatch.setattr(app, "get_episodes", lambda url, source, title=None: EPISODES)
+    return app
+
+
+def run(cli, capsys, pick=1, episodes=None, resolve_only=False):
+    args = argparse.Namespace(query="soul land", source=None, pick=pick, episodes=episodes,
+                              json=True, resolve_only=resolve_only)
+    code = cli.script_mode(args)
+    return code, json.loads(capsys.readouterr().out)
+
+
+def test_report_goes_to_stdout(cli, capsys):
+    code, report = run(cli, capsys, episodes="1-2")
+    assert code == 0
+    assert report["series"]["title"] == "Soul Land 2"
+    assert [ep["index"] for ep in report["episodes"]] == [1, 2]
+
+
+def test_pick_out_of_range_is_reported_on_stdout(cli, capsys):
+    code, report = run(cli, capsys, pick=5)
+    assert code == 1
+    assert report["error"] == "--pick out of range (1-1)"
+    assert "episodes" not in report
+
+
+def test_invalid_episodes_is_reported_on_stdout(cli, capsys):
+    code, report = run(cli, capsys, episodes="9")
+    assert code == 1
+    assert report["error"].startswith("Invalid --episodes")
+
+
+def test_failed_resolve_is_recorded_per_episode(cli, capsys):
+    code, report = run(cli, capsys, resolve_only=True)
+    assert code == 2
+    first, second, third = report["episodes"]
+    assert first["stream"].endswith("master.m3u8") and "error" not in first
+    assert second["stream"] is None and second["error"] == "embed gone"
+    assert third["stream"].endswith("master.m3u8")
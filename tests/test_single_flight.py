@@ -0,0 +1,81 @@
+import threading
+import time
+
+import pytest
+
+from dhua import SingleFlight
+
+
+def run_concurrently(flight, key, fn, callers=5):
+    """Start a leader and followers on one key; results and errors fill in as they finish"""
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return {"url": "https://cdn.example.com/ep1.m3u8"}
+
+    threads, results, errors = run_concurrently(flight, "ep1", fetch)
+    time.sleep(0.1)  # Let every follower join the leader's call
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [1]
+    assert len(results) == 5 and not errors
+    assert all(result is results[0] for result in results)
+
+
+def test_leader_error_reaches_every_follower():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        raise ConnectionError("host down")
+
+    threads, results, errors = run_concurrently(flight, "ep1", fetch)
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert not results
+    assert len(errors) == 5
+    assert all(error is errors[0] for error in errors)
+
+
+def test_key_is_cleared_after_completion():
+    flight = SingleFlight()
+    assert flight.do("ep1", lambda: 1) == 1
+    assert flight.calls == {}
+    # A later call runs again instead of reusing the finished result
+    assert flight.do("ep1", lambda: 2) == 2
+
+    with pytest.raises(ValueError):
+        flight.do("ep1", lambda: int("x"))
+    assert flight.calls == {}
+    assert flight.do("ep1", lambda: 3) == 3
+
+
+def test_different_keys_run_independently():
+    flight = SingleFlight()
+    inner = flight.do("series", lambda: flight.do("episode", lambda: "ok"))
+    assert inner == "ok"
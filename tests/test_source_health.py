@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+from dhua import HttpClient, SourceHealth, SourceUnavailable
+
+HOST = "flaky.example"
+
+
+@pytest.fixture(autouse=True)
+def fresh_health(monkeypatch):
+    monkeypatch.setattr(SourceHealth, "_hosts", None)
+    monkeypatch.setattr(SourceHealth, "_last_save", 0.0)
+
+
+def test_unknown_host_is_allowed():
+    assert SourceHealth.allow(HOST)
+    assert SourceHealth.score(HOST) == 0.0
+
+
+def test_consecutive_failures_open_the_circuit():
+    for _ in range(SourceHealth.TRIP_CONSECUTIVE - 1):
+        SourceHealth.record(HOST, False)
+    assert SourceHealth.allow(HOST)
+    SourceHealth.record(HOST, False)
+    assert not SourceHealth.allow(HOST)
+    assert SourceHealth.score(HOST) == float("inf")
+
+
+def test_error_rate_opens_the_circuit():
+    # Alternating outcomes never reach three failures in a row, but the rate hits 50%
+    for ok in (True, False, True, False):
+        SourceHealth.record(HOST, ok)
+    assert SourceHealth.error_rate(HOST) == 0.5
+    assert not SourceHealth.allow(HOST)
+
+
+def test_circuit_half_opens_after_cooldown(monkeypatch):
+    for _ in range(SourceHealth.TRIP_CONSECUTIVE):
+        SourceHealth.record(HOST, False)
+    later = time.time() + SourceHealth.COOLDOWN + 1
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert SourceHealth.allow(HOST)
+
+
+def test_success_closes_the_circuit():
+    for _ in range(SourceHealth.TRIP_CONSECUTIVE):
+        SourceHealth.record(HOST, False)
+    SourceHealth.record(HOST, True, 0.2)
+    assert SourceHealth.allow(HOST)
+
+
+def test_latency_drives_p90_and_timeout():
+    for latency in (0.1, 0.2, 0.3, 0.4, 2.0):
+        SourceHealth.record(HOST, True, latency)
+    assert SourceHealth.p90_latency(HOST) == 0.4
+    # Fast hosts get shorter timeouts, never below 4 seconds
+    assert 4.0 <= SourceHealth.timeout_for(HOST, 8) < 8
+    assert SourceHealth.timeout_for("unknown.example", 8) == 8
+
+
+def test_state_survives_a_restart(monkeypatch):
+    for _ in range(SourceHealth.TRIP_CONSECUTIVE):
+        SourceHealth.record(HOST, False)
+    SourceHealth.save()
+    monkeypatch.setattr(SourceHealth, "_hosts", None)
+    assert not SourceHealth.allow(HOST)
+
+
+def test_open_circuit_raises_the_imported_class():
+    import requests
+    for _ in range(SourceHealth.TRIP_CONSECUTIVE):
+        SourceHealth.record(HOST, False)
+    for _ in range(2):
+        with pytest.raises(SourceUnavailable) as raised:
+            HttpClient.get(f"https://{HOST}/series/")
+        # Handlers written against requests still see a failed connection
+        assert isinstance(raised.value, requests.exceptions.ConnectionError)
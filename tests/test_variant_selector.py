@@ -0,0 +1,49 @@
+from dhua import NetworkMonitor, VariantSelector
+
+MASTER = """#EXTM3U
+#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360
+360/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=2800000,RESOLUTION=1280x720
+720/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=2800000,RESOLUTION=1280x720
+https://cdn2.example.com/720/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=5000000,RESOLUTION=1920x1080
+1080/index.m3u8
+"""
+
+
+def variants():
+    return VariantSelector.parse_hls_master(MASTER, "https://cdn.example.com/master.m3u8")
+
+
+def test_parse_master_resolves_urls_and_drops_cdn_duplicates():
+    parsed = variants()
+    assert [v["height"] for v in parsed] == [360, 720, 1080]
+    assert parsed[0]["url"] == "https://cdn.example.com/360/index.m3u8"
+    assert parsed[1]["bandwidth"] == 2800000
+
+
+def test_pick_explicit_height_takes_best_not_above_it():
+    assert VariantSelector.pick(variants(), "720")["height"] == 720
+    assert VariantSelector.pick(variants(), "480p")["height"] == 360
+
+
+def test_pick_below_every_variant_takes_the_smallest():
+    assert VariantSelector.pick(variants(), "240")["height"] == 360
+
+
+def test_pick_without_heights_takes_the_first():
+    unsized = [{"url": "a", "height": 0, "bandwidth": 0}, {"url": "b", "height": 0, "bandwidth": 0}]
+    assert VariantSelector.pick(unsized, "720")["url"] == "a"
+    assert VariantSelector.pick([], "720") is None
+
+
+def test_pick_auto_uses_fallback_until_measured():
+    assert NetworkMonitor.throughput() is None
+    assert VariantSelector.pick(variants(), "auto", fallback="360")["height"] == 360
+
+
+def test_pick_auto_takes_highest_sustainable_variant():
+    # 600 KB/s = 4.8 Mbit/s: 2.8 Mbit/s * 1.5 headroom fits, 5 Mbit/s does not
+    NetworkMonitor.record(600_000, 1.0)
+    assert VariantSelector.pick(variants(), "auto")["height"] == 720